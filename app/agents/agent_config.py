@@ -4,6 +4,7 @@ import google.auth.transport.requests
 from vertexai.generative_models import HarmBlockThreshold, HarmCategory
 from typing import Dict, Any, List
 from ..core.config.environment import Environment
+from .llm_transport import LLMTransportPool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,8 +16,9 @@ class ModelConfig:
     def get_openai_config() -> Dict[str, Any]:
         """Get OpenAI configuration"""
         env_vars = Environment.get_required_vars()
-        config_list = [{
-            "model": os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini"),
+        model = os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini")
+        config = {
+            "model": model,
             "api_key": env_vars.get("OPENAI_API_KEY"),
             "api_type": "openai",
             "temperature": 0.0,
@@ -24,9 +26,14 @@ class ModelConfig:
             "top_p": 1.0,
             "presence_penalty": 0.0,
             "frequency_penalty": 0.0,
-            "stream": False
-        }]
-        return {"config_list": config_list}
+            "stream": False,
+            # Shared keep-alive pool with per-provider/per-model in-flight limits
+            "http_client": LLMTransportPool.get_client("openai", model)
+        }
+        # Any OpenAI-compatible endpoint (proxy, local fake server)
+        if os.getenv("OPENAI_BASE_URL"):
+            config["base_url"] = os.getenv("OPENAI_BASE_URL")
+        return {"config_list": [config]}
 
     @staticmethod
     def get_gemini_config() -> Dict[str, Any]:
@@ -48,7 +55,6 @@ class ModelConfig:
                 "project_id": project_id,
                 "location": os.getenv("GOOGLE_MODEL_REGION", "us-central1"),
                 "google_application_credentials": credentials_path,
-                "api_rate_limit": 1,
                 "safety_settings": ModelConfig.get_safety_settings(),
                 "temperature": 0.0,
                 "max_tokens": 7000,
@@ -70,11 +76,8 @@ class ModelConfig:
         return {"config_list": config_list}
 
     @staticmethod
-    def get_default_config() -> Dict[str, Any]:
-        """Get default LLM configuration based on environment setting"""
-        provider = os.getenv("LLM_PROVIDER", "openai").lower()
-        logger.info(f"Getting default config with provider: {provider}")
-        
+    def get_provider_config(provider: str) -> Dict[str, Any]:
+        """Get the configuration for a single provider"""
         if provider == "google":
             logger.info("Using Google Gemini configuration")
             return ModelConfig.get_gemini_config()
@@ -85,6 +88,49 @@ class ModelConfig:
             logger.info(f"Using OpenAI configuration (provider was: {provider})")
             return ModelConfig.get_openai_config()
 
+    @staticmethod
+    def get_default_config() -> Dict[str, Any]:
+        """
+        Get default LLM configuration based on environment setting
+
+        LLM_PROVIDERS (comma separated, e.g. "openai,google") combines several
+        providers into one config_list for latency-aware routing; otherwise
+        LLM_PROVIDER selects a single provider.
+        """
+        providers = [
+            name.strip().lower() for name in os.getenv("LLM_PROVIDERS", "").split(",") if name.strip()
+        ]
+        if len(providers) > 1:
+            logger.info(f"Getting routed config with providers: {providers}")
+            config_list = []
+            for name in providers:
+                config_list.extend(ModelConfig.get_provider_config(name)["config_list"])
+            return {"config_list": config_list}
+
+        provider = providers[0] if providers else os.getenv("LLM_PROVIDER", "openai").lower()
+        logger.info(f"Getting default config with provider: {provider}")
+        return ModelConfig.get_provider_config(provider)
+
+    @staticmethod
+    def get_provider(llm_config: Dict[str, Any]) -> str:
+        """Get the provider (api_type) from a config_list or flat LLM configuration"""
+        config = (llm_config or {}).get("config_list", [llm_config or {}])[0]
+        return config.get("api_type", os.getenv("LLM_PROVIDER", "openai")).lower()
+
+    @staticmethod
+    def get_context_token_budget(provider: str) -> int:
+        """Get the chat history token budget for a provider"""
+        default_budgets = {
+            "openai": 6000,
+            "google": 12000,
+            "anthropic": 12000,
+        }
+        budget = os.getenv(
+            f"{provider.upper()}_CONTEXT_TOKEN_BUDGET",
+            os.getenv("CONTEXT_TOKEN_BUDGET", default_budgets.get(provider, 6000))
+        )
+        return int(budget)
+
     @staticmethod
     def get_safety_settings() -> Dict[str, Any]:
         """Get safety settings for the model (only used by Gemini)"""
@@ -113,7 +159,6 @@ class ModelConfig:
             "project_id": project_id,
             "location": "us-central1",
             "google_application_credentials": os.getenv("GOOGLE_APPLICATION_CREDENTIALS"),
-            "api_rate_limit": 1,
             "safety_settings": ModelConfig.get_safety_settings(),
             "temperature": 0.0,
             "max_tokens": 7000
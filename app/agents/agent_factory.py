@@ -1,8 +1,17 @@
+import os
 import autogen
 from typing import Dict, Any, List
 from .agent_config import ModelConfig
 from .base_agent import BaseAgent, SQLAgent, JobAgent, ReviewerAgent
-from ..tools.dq_tools import run_dq_job, get_job_status, run_sql_statement
+from .llm_cache import get_response_cache
+from .llm_scheduler import schedule_client
+from .llm_router import route_client
+from .prompt_cache import enable_prompt_caching
+from .tool_executor import enable_parallel_tool_calls
+from ..core.metrics import instrument_llm_client
+from ..tools.dq_tools import run_dq_job, run_dq_jobs, get_job_status, run_sql_statement
+from ..tools.dq_async import a_run_dq_job, a_run_dq_jobs, a_get_job_status
+from ..tools.decorators import register_tool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,9 +33,9 @@ def create_job_assistant(llm_config: Dict[str, Any]) -> autogen.AssistantAgent:
         name="Job_Assistant",
         llm_config=llm_config,
         system_message="""Job Assistant. You are able to run dq jobs and check dq job results/status. 
-        You use the run_dq_job function to run dq jobs. You use the get_job_status function to check the results, one time each time you're asked.
+        You use the run_dq_job function to run dq jobs. For several tables, use run_dq_jobs once with all of them instead of run_dq_job per table. You use the get_job_status function to check the results, one time each time you're asked. It answers from a status table refreshed in the background, so mention the time it is as of.
         Because these dq job functions trigger an API call, the user will want current (up to date) results, you should execute the functions rather than rely on the historical context. 
-        Even if job was recently run, you can run it one more time if the user requests this. 
+        A job identical to one submitted in the last few minutes is not sent again. Even if a job was recently run, you can run it one more time if the user requests this: pass rerun=true (for run_dq_jobs, per job). 
         Example: run a dq job for tables w/ 'xyz' in the name (run dq jobs, you need a connection_name, dataset, query, schema)
         Example: whats the status of the dq jobs (check dq job results/status, no arguments needed)
         Include the word 'TERMINATE' and summarize the answer, if you can answer the question from the context, rather than asking for more tasks."""
@@ -79,6 +88,20 @@ def create_reviewer_assistant(llm_config: Dict[str, Any]) -> autogen.AssistantAg
         llm_config=llm_config,
     )
 
+def configure_llm_client(client: Any, agent_name: str) -> None:
+    """
+    Wrap an agent's OpenAIWrapper with the shared LLM call layers
+
+    Provider calls are measured per agent, admitted through the process-wide
+    rate-limit scheduler, report prompt cache usage (marking cacheable
+    prefixes where the provider needs it), and multi-provider configs are
+    routed to the fastest healthy endpoint.
+    """
+    instrument_llm_client(client, agent_name)
+    schedule_client(client)
+    enable_prompt_caching(client)
+    route_client(client)
+
 def create_agents(llm_config: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Create and return all agent instances needed for the application.
@@ -95,12 +118,23 @@ def create_agents(llm_config: Dict[str, Any] = None) -> Dict[str, Any]:
     job_assistant = create_job_assistant(llm_config)
     sql_assistant = create_sql_assistant(llm_config)
     
-    # Register tools
+    # Register tools, several calls in one message (e.g. a job per table) run concurrently
     register_agent_tools(executor, sql_assistant, job_assistant)
+    enable_parallel_tool_calls(executor)
     
     # Create remaining agents
     user_proxy = create_user_proxy(llm_config)
     reviewer_assistant = create_reviewer_assistant(llm_config)
+
+    # Share the LLM response cache across agents and sessions
+    response_cache = get_response_cache()
+    if response_cache is not None:
+        for agent in [executor, job_assistant, sql_assistant, reviewer_assistant]:
+            agent.client_cache = response_cache
+
+    # Shared LLM call layers (rate-limit scheduler, prompt caching, routing)
+    for agent in [executor, job_assistant, sql_assistant, reviewer_assistant]:
+        configure_llm_client(agent.client, agent.name)
     
     return {
         "user_proxy": user_proxy,
@@ -151,31 +185,52 @@ def create_group_chat_agents() -> List[BaseAgent]:
 
 def register_agent_tools(executor: Any, sql_assistant: Any, job_assistant: Any):
     """Register tools with appropriate agents"""
-    
-    # Register DQ job tools
-    executor.register_for_execution()(run_dq_job)
-    executor.register_for_llm(description="Execute a DQ job with given parameters")(run_dq_job)
-    job_assistant.register_for_llm(
+    # Every tool goes through register_tool, which records timings, sizes and errors.
+    # DQ_ASYNC_TOOLS switches the DQ tools to the httpx variants, run on a shared event loop.
+    dq_job_tool, dq_jobs_tool, job_status_tool = run_dq_job, run_dq_jobs, get_job_status
+    if os.getenv("DQ_ASYNC_TOOLS", "false").lower() == "true":
+        dq_job_tool, dq_jobs_tool, job_status_tool = a_run_dq_job, a_run_dq_jobs, a_get_job_status
+
+    register_tool(
+        executor=executor,
+        assistant=job_assistant,
+        executor_description="Execute a DQ job with given parameters",
         description="""Submits a DQ Job to run a DQ check.
         IMPORTANT: This requires a connection_name, dataset, query.
         DATASET: Use the table name as the dataset name (e.g. not schema.table, just table.)
         QUERY: The query should use schema.table format and have a limit 10000 to always limit results.
-        SCHEMA: Use the schema name as the schema name (e.g. not schema.table, just schema.)"""
-    )(run_dq_job)
+        SCHEMA: Use the schema name as the schema name (e.g. not schema.table, just schema.)""",
+        name="run_dq_job"
+    )(dq_job_tool)
+    
+    # Register batch DQ job tool, one call validates and submits many tables
+    register_tool(
+        executor=executor,
+        assistant=job_assistant,
+        executor_description="Execute DQ jobs for several tables",
+        description="""Submits DQ Jobs for several tables in one call, use it instead of run_dq_job when there is more than one table.
+        Each job needs a connection_name, dataset, query and schema_name, following the same rules as run_dq_job:
+        DATASET: table name only, QUERY: schema.table format with limit 10000, SCHEMA: schema name only.
+        Returns a status table with one row per job.""",
+        name="run_dq_jobs"
+    )(dq_jobs_tool)
     
     # Register job status tool
-    executor.register_for_execution()(get_job_status)
-    executor.register_for_llm(description="Check the status of DQ jobs")(get_job_status)
-    job_assistant.register_for_llm(
-        description="Check the status of DQ jobs"
-    )(get_job_status)
+    register_tool(
+        executor=executor,
+        assistant=job_assistant,
+        executor_description="Check the status of DQ jobs",
+        description="""Check the status of DQ jobs, newest first.
+        Use dataset_prefix to narrow to datasets starting with it (jobs run from here start with AI_),
+        and limit for how many jobs to show (default 5), e.g. the size of a batch just submitted.""",
+        name="get_job_status"
+    )(job_status_tool)
     
     # Register SQL tool
-    executor.register_for_execution()(run_sql_statement)
-    executor.register_for_llm(
-        description="Execute a SQL query on the metadata table"
-    )(run_sql_statement)
-    sql_assistant.register_for_llm(
+    register_tool(
+        executor=executor,
+        assistant=sql_assistant,
+        executor_description="Execute a SQL query on the metadata table",
         description="""Runs A SELECT statement on 'metadata' table. 
         Available columns: connection_name, schema_name, table_name"""
     )(run_sql_statement) 
\ No newline at end of file
@@ -0,0 +1,245 @@
+import os
+import json
+import math
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import diskcache
+except ImportError:  # Disk tier is optional
+    diskcache = None
+
+logger = logging.getLogger(__name__)
+
+# Tools whose results change between calls, completions around them are never cached
+NON_DETERMINISTIC_TOOLS = {"get_job_status"}
+
+
+class ResponseCache:
+    """
+    Exact and semantic cache for LLM completions
+
+    Implements the autogen cache protocol (get/set/close and context manager),
+    so it can be assigned to an agent's client_cache or passed to initiate_chat.
+    autogen keys the cache on the JSON-serialized create params (model,
+    messages, tools, temperature, ...), which is hashed here.
+    """
+
+    def __init__(self, max_entries: int = 1024, cache_dir: Optional[str] = None,
+                 embed_fn: Optional[Callable[[str], List[float]]] = None,
+                 similarity_threshold: float = 0.97,
+                 bypass_tools: Optional[set] = None):
+        """
+        Initialize the response cache
+
+        Args:
+            max_entries: Maximum entries held in memory (LRU)
+            cache_dir: Optional directory for a persistent disk tier
+            embed_fn: Optional embedding function enabling the semantic tier
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            bypass_tools: Tool names that disable caching when involved
+        """
+        self.max_entries = max_entries
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self.bypass_tools = NON_DETERMINISTIC_TOOLS if bypass_tools is None else bypass_tools
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        # Semantic tier: context signature -> [(embedding, exact key)]
+        self._semantic: Dict[str, List[Tuple[List[float], str]]] = {}
+        self._lock = threading.Lock()
+        self._disk = None
+        if cache_dir:
+            if diskcache is None:
+                logger.warning("diskcache is not installed, LLM cache will be memory only")
+            else:
+                self._disk = diskcache.Cache(cache_dir)
+
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # Shared across agents and turns, nothing to release per call
+        return None
+
+    def close(self) -> None:
+        """Close the disk tier"""
+        if self._disk is not None:
+            self._disk.close()
+
+    @staticmethod
+    def _hash(value: str) -> str:
+        return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _parse_params(key: str) -> Optional[Dict[str, Any]]:
+        try:
+            params = json.loads(key)
+            return params if isinstance(params, dict) else None
+        except (TypeError, ValueError):
+            return None
+
+    def _is_cacheable(self, params: Optional[Dict[str, Any]]) -> bool:
+        """Only deterministic requests that don't involve non-deterministic tools"""
+        if params is None:
+            return True
+        if params.get("temperature", 0) not in (0, 0.0):
+            return False
+        for message in params.get("messages") or []:
+            for call in message.get("tool_calls") or []:
+                if call.get("function", {}).get("name") in self.bypass_tools:
+                    return False
+        return True
+
+    def _calls_bypass_tool(self, value: Any) -> bool:
+        """Check whether a completion requests a non-deterministic tool"""
+        for choice in getattr(value, "choices", None) or []:
+            message = getattr(choice, "message", None)
+            for call in getattr(message, "tool_calls", None) or []:
+                if getattr(getattr(call, "function", None), "name", None) in self.bypass_tools:
+                    return True
+        return False
+
+    @staticmethod
+    def _semantic_parts(params: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Split params into a context signature and the final message text"""
+        messages = params.get("messages") or []
+        if not messages or not isinstance(messages[-1].get("content"), str):
+            return None
+        context = dict(params, messages=messages[:-1] + [{"role": messages[-1].get("role")}])
+        return json.dumps(context, sort_keys=True), messages[-1]["content"]
+
+    @staticmethod
+    def _cosine(a: List[float], b: List[float]) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
+
+    def _lookup(self, hashed: str) -> Any:
+        with self._lock:
+            if hashed in self._memory:
+                self._memory.move_to_end(hashed)
+                return self._memory[hashed]
+        if self._disk is not None:
+            value = self._disk.get(hashed)
+            if value is not None:
+                self._store_memory(hashed, value)
+                return value
+        return None
+
+    def _store_memory(self, hashed: str, value: Any) -> None:
+        with self._lock:
+            self._memory[hashed] = value
+            self._memory.move_to_end(hashed)
+            while len(self._memory) > self.max_entries:
+                evicted, _ = self._memory.popitem(last=False)
+                for entries in self._semantic.values():
+                    entries[:] = [entry for entry in entries if entry[1] != evicted]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a cached completion by exact key, then by semantic similarity"""
+        params = self._parse_params(key)
+        if not self._is_cacheable(params):
+            self.bypassed += 1
+            return default
+
+        value = self._lookup(self._hash(key))
+        if value is not None:
+            self.hits += 1
+            return value
+
+        if self.embed_fn is not None and params is not None:
+            parts = self._semantic_parts(params)
+            if parts is not None:
+                signature, text = parts
+                try:
+                    embedding = self.embed_fn(text)
+                except Exception as e:
+                    logger.warning(f"Semantic cache embedding failed: {str(e)}")
+                    embedding = None
+                if embedding is not None:
+                    with self._lock:
+                        candidates = list(self._semantic.get(self._hash(signature), []))
+                    for cached_embedding, hashed in candidates:
+                        if self._cosine(embedding, cached_embedding) >= self.similarity_threshold:
+                            value = self._lookup(hashed)
+                            if value is not None:
+                                self.semantic_hits += 1
+                                return value
+
+        self.misses += 1
+        return default
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a completion unless it involves a non-deterministic tool"""
+        params = self._parse_params(key)
+        if not self._is_cacheable(params) or self._calls_bypass_tool(value):
+            return
+
+        hashed = self._hash(key)
+        self._store_memory(hashed, value)
+        if self._disk is not None:
+            try:
+                self._disk.set(hashed, value)
+            except Exception as e:
+                logger.warning(f"Could not write LLM response to disk cache: {str(e)}")
+
+        if self.embed_fn is not None and params is not None:
+            parts = self._semantic_parts(params)
+            if parts is None:
+                return
+            signature, text = parts
+            try:
+                embedding = self.embed_fn(text)
+            except Exception as e:
+                logger.warning(f"Semantic cache embedding failed: {str(e)}")
+                return
+            with self._lock:
+                self._semantic.setdefault(self._hash(signature), []).append((embedding, hashed))
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters"""
+        return {
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "entries": len(self._memory),
+        }
+
+
+def _openai_embedding(text: str) -> List[float]:
+    """Embed text with the same model used for the actions lookup"""
+    from openai import OpenAI
+    return OpenAI(max_retries=2).embeddings.create(
+        input=[text.replace("\n", " ")],
+        model=os.getenv("LLM_CACHE_EMBEDDING_MODEL", "text-embedding-ada-002")
+    ).data[0].embedding
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the process-wide LLM response cache, or None if disabled"""
+    global _response_cache
+    if os.getenv("LLM_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            semantic = os.getenv("LLM_CACHE_SEMANTIC", "false").lower() == "true"
+            _response_cache = ResponseCache(
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+                cache_dir=os.getenv("LLM_CACHE_DIR") or None,
+                embed_fn=_openai_embedding if semantic else None,
+                similarity_threshold=float(os.getenv("LLM_CACHE_SIMILARITY", "0.97")),
+            )
+            logger.info(f"LLM response cache enabled (semantic tier: {semantic})")
+        return _response_cache
@@ -0,0 +1,242 @@
+import os
+import time
+import logging
+import threading
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# autogen keeps these config keys out of the create params
+_NON_PARAM_KEYS = {
+    "api_type", "api_version", "tags", "price", "cache_seed", "filter_func",
+    "allow_format_str_template", "context", "model_client_cls",
+}
+
+
+class EndpointStats:
+    """Latency and error EWMAs for one provider/model endpoint"""
+
+    def __init__(self, name: str, alpha: float = 0.2, cooldown: float = 30.0):
+        self.name = name
+        self.alpha = alpha
+        self.cooldown = cooldown
+        self.latency: Optional[float] = None
+        self.deviation = 0.0
+        self.error_rate = 0.0
+        self.unhealthy_until = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.hedges_won = 0
+        self._lock = threading.Lock()
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self.calls += 1
+            if self.latency is None:
+                self.latency = latency
+                self.deviation = latency / 2
+            else:
+                self.deviation += self.alpha * (abs(latency - self.latency) - self.deviation)
+                self.latency += self.alpha * (latency - self.latency)
+            self.error_rate *= 1 - self.alpha
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+            self.error_rate += self.alpha * (1 - self.error_rate)
+            self.unhealthy_until = time.monotonic() + self.cooldown
+
+    def is_healthy(self) -> bool:
+        return self.unhealthy_until <= time.monotonic()
+
+    def score(self) -> float:
+        """Expected latency penalized by errors, unmeasured endpoints are tried first"""
+        return (self.latency or 0.0) * (1 + 4 * self.error_rate)
+
+    def hedge_delay(self, default: float, minimum: float) -> float:
+        """Approximate p95 latency (mean plus two mean deviations)"""
+        if self.latency is None:
+            return default
+        return max(minimum, self.latency + 2 * self.deviation)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "latency_ewma": round(self.latency, 3) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "healthy": self.is_healthy(),
+            "calls": self.calls,
+            "failures": self.failures,
+            "hedges_won": self.hedges_won,
+        }
+
+
+_endpoint_stats: Dict[str, EndpointStats] = {}
+_endpoint_stats_lock = threading.Lock()
+
+def _get_endpoint_stats(name: str) -> EndpointStats:
+    """Stats are shared by every agent calling the same endpoint"""
+    with _endpoint_stats_lock:
+        if name not in _endpoint_stats:
+            _endpoint_stats[name] = EndpointStats(
+                name, cooldown=float(os.getenv("LLM_ROUTER_COOLDOWN", "30"))
+            )
+        return _endpoint_stats[name]
+
+def get_router_stats() -> Dict[str, Dict[str, Any]]:
+    """Get per-endpoint routing stats"""
+    with _endpoint_stats_lock:
+        return {name: stats.to_dict() for name, stats in _endpoint_stats.items()}
+
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_executor_lock = threading.Lock()
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("LLM_ROUTER_MAX_WORKERS", "16")),
+                thread_name_prefix="llm-hedge"
+            )
+        return _hedge_executor
+
+
+class _Endpoint:
+    """One config_list entry: its provider client's create() and the params it expects"""
+
+    def __init__(self, create: Callable[[Dict[str, Any]], Any], config: Dict[str, Any]):
+        self.create = create
+        self.params = {key: value for key, value in config.items() if key not in _NON_PARAM_KEYS}
+        self.stats = _get_endpoint_stats(f"{config.get('api_type', 'openai')}/{config.get('model', '')}")
+
+    def build_params(self, params: Dict[str, Any], primary: "_Endpoint") -> Dict[str, Any]:
+        """Swap the primary endpoint's config for this endpoint's, keeping the call params"""
+        call_params = {key: value for key, value in params.items() if key not in primary.params}
+        return {**call_params, **self.params}
+
+
+class LLMRouter:
+    """
+    Route each model call of a multi-endpoint config_list to the fastest healthy endpoint
+
+    Endpoints are ranked by latency EWMA penalized by error rate; failed
+    endpoints cool down before being preferred again. With hedging on, a
+    second request goes to the next endpoint once the first exceeds its p95
+    latency, and whichever answers first wins.
+    """
+
+    def __init__(self, endpoints: List[_Endpoint], hedge: bool = False,
+                 hedge_delay: float = 8.0, hedge_min_delay: float = 1.0):
+        """
+        Initialize the router
+
+        Args:
+            endpoints: Endpoints in config_list order (the first is the primary)
+            hedge: Whether to hedge slow requests
+            hedge_delay: Hedge deadline (seconds) before an endpoint has been measured
+            hedge_min_delay: Lower bound for the p95-based hedge deadline
+        """
+        self.endpoints = endpoints
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.hedge_min_delay = hedge_min_delay
+
+    def _rank(self) -> List[_Endpoint]:
+        return sorted(
+            self.endpoints,
+            key=lambda endpoint: (not endpoint.stats.is_healthy(), endpoint.stats.score())
+        )
+
+    def _call(self, endpoint: _Endpoint, params: Dict[str, Any]) -> Any:
+        started = time.monotonic()
+        try:
+            response = endpoint.create(endpoint.build_params(params, self.endpoints[0]))
+        except Exception:
+            endpoint.stats.record_failure()
+            raise
+        endpoint.stats.record_success(time.monotonic() - started)
+        return response
+
+    def _call_hedged(self, primary: _Endpoint, backup: _Endpoint, params: Dict[str, Any]) -> Any:
+        executor = _get_hedge_executor()
+        # Copy the context so the scheduler priority follows the call into the pool
+        futures: Dict[Future, _Endpoint] = {
+            executor.submit(contextvars.copy_context().run, self._call, primary, params): primary
+        }
+        done, _ = wait(list(futures), timeout=primary.stats.hedge_delay(self.hedge_delay, self.hedge_min_delay))
+        if not done:
+            logger.info(f"Hedging LLM call from {primary.stats.name} to {backup.stats.name}")
+            futures[executor.submit(contextvars.copy_context().run, self._call, backup, params)] = backup
+        elif next(iter(done)).exception() is not None:
+            # The primary failed before the hedge deadline, the backup is the failover
+            logger.warning(
+                f"LLM endpoint {primary.stats.name} failed, failing over to {backup.stats.name}: "
+                f"{str(next(iter(done)).exception())}"
+            )
+            return self._call(backup, params)
+
+        last_error: Optional[Exception] = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if futures[future] is backup:
+                        backup.stats.hedges_won += 1
+                    # The slower request finishes in the background and is discarded
+                    return future.result()
+                last_error = future.exception()
+        raise last_error
+
+    def create(self, params: Dict[str, Any]) -> Any:
+        """Call the best endpoint, failing over (and hedging) in rank order"""
+        ranked = self._rank()
+        tried: List[_Endpoint] = []
+        last_error: Optional[Exception] = None
+        for endpoint in ranked:
+            if endpoint in tried:
+                continue
+            untried = [candidate for candidate in ranked if candidate is not endpoint and candidate not in tried]
+            backup = untried[0] if self.hedge and untried else None
+            tried.append(endpoint)
+            try:
+                if backup is None:
+                    return self._call(endpoint, params)
+                tried.append(backup)
+                return self._call_hedged(endpoint, backup, params)
+            except Exception as e:
+                last_error = e
+                logger.warning(f"LLM endpoint {endpoint.stats.name} failed, failing over: {str(e)}")
+        raise last_error
+
+
+def route_client(client: Any) -> None:
+    """
+    Route an autogen OpenAIWrapper with several config_list entries through an LLMRouter
+
+    autogen always tries the first provider client first, so its create() is
+    replaced by the router, which calls the original create() of whichever
+    endpoint ranks best. Call after schedule_client so each endpoint is still
+    admitted on its own rate-limit lane.
+
+    Args:
+        client: The agent's OpenAIWrapper (agent.client)
+    """
+    if client is None or len(client._clients) < 2 or getattr(client._clients[0], "_llm_routed", False):
+        return
+    endpoints = [
+        _Endpoint(model_client.create, config)
+        for model_client, config in zip(client._clients, client._config_list)
+    ]
+    router = LLMRouter(
+        endpoints,
+        hedge=os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true",
+        hedge_delay=float(os.getenv("LLM_HEDGE_DELAY", "8")),
+        hedge_min_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY", "1")),
+    )
+    client._clients[0].create = router.create
+    client._clients[0]._llm_routed = True
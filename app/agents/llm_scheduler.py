@@ -0,0 +1,348 @@
+import os
+import re
+import json
+import time
+import heapq
+import logging
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """LLM call priority, lower values are admitted first"""
+    INTERACTIVE = 0
+    BATCH = 10
+    BACKGROUND = 20
+
+
+_current_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.BATCH)
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """
+    Run LLM calls made in this context (and threads started from it) at a priority
+
+    Args:
+        priority: Priority for calls made inside the block
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+# Provider defaults, overridable with <PROVIDER>_REQUESTS_PER_SECOND / <PROVIDER>_TOKENS_PER_MINUTE
+_DEFAULT_QUOTAS = {
+    "openai": (10.0, 200000),
+    "google": (5.0, 1000000),
+    "anthropic": (1.0, 40000),
+}
+
+# "1s", "6m0s", "250ms" as sent in x-ratelimit-reset-* headers
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After or rate-limit reset header into seconds"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PATTERN.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    try:
+        return float(headers[name]) if headers.get(name) is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate (not thread-safe, guarded by the lane)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until amount is available, requests larger than the bucket wait for a full bucket"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Take amount from the bucket, negative amounts refund over-estimates"""
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+    def limit_to(self, remaining: float) -> None:
+        """Never report more than the provider says is remaining"""
+        self._refill()
+        self.level = min(self.level, remaining)
+
+    def set_rate(self, rate: float, capacity: float) -> None:
+        self._refill()
+        self.rate = rate
+        self.capacity = capacity
+        self.level = min(self.level, capacity)
+
+
+class _Lane:
+    """Request and token buckets plus the priority queue for one provider/model"""
+
+    def __init__(self, requests_per_second: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_second, max(1.0, requests_per_second))
+        self.tokens = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute)
+        self.condition = threading.Condition()
+        self.waiters: List[Tuple[int, int]] = []
+        self.paused_until = 0.0
+        self.admitted = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def wait_time(self, tokens: float) -> float:
+        return max(
+            self.paused_until - time.monotonic(),
+            self.requests.time_until(1),
+            self.tokens.time_until(tokens),
+        )
+
+
+class LLMScheduler:
+    """
+    Process-wide admission control for LLM calls
+
+    Each provider/model gets a requests-per-second and a tokens-per-minute
+    bucket shared by every agent and session. Waiting calls are admitted in
+    priority order, so interactive chat turns go ahead of batch work. Provider
+    rate-limit headers and 429 responses tighten the buckets or pause the lane.
+    """
+
+    def __init__(self):
+        self._lanes: Dict[Tuple[str, str], _Lane] = {}
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    @staticmethod
+    def _get_quota(provider: str) -> Tuple[float, float]:
+        default_rps, default_tpm = _DEFAULT_QUOTAS.get(provider, _DEFAULT_QUOTAS["openai"])
+        requests_per_second = os.getenv(
+            f"{provider.upper()}_REQUESTS_PER_SECOND", os.getenv("LLM_REQUESTS_PER_SECOND", default_rps)
+        )
+        tokens_per_minute = os.getenv(
+            f"{provider.upper()}_TOKENS_PER_MINUTE", os.getenv("LLM_TOKENS_PER_MINUTE", default_tpm)
+        )
+        return float(requests_per_second), float(tokens_per_minute)
+
+    def _get_lane(self, provider: str, model: str) -> _Lane:
+        key = (provider, model)
+        with self._lock:
+            if key not in self._lanes:
+                requests_per_second, tokens_per_minute = self._get_quota(provider)
+                self._lanes[key] = _Lane(requests_per_second, tokens_per_minute)
+                logger.info(
+                    f"LLM scheduler lane {provider}/{model}: "
+                    f"{requests_per_second} req/s, {tokens_per_minute:.0f} tokens/min"
+                )
+            return self._lanes[key]
+
+    def acquire(self, provider: str, model: str, tokens: int,
+                priority: Optional[Priority] = None) -> float:
+        """
+        Block until a call fits the provider quota and no higher priority call is waiting
+
+        Args:
+            provider: Provider name (api_type)
+            model: Model name
+            tokens: Estimated tokens for the call (prompt and completion)
+            priority: Call priority, defaults to the priority of the current context
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        lane = self._get_lane(provider, model)
+        priority = _current_priority.get() if priority is None else priority
+        entry = (int(priority), next(self._sequence))
+        started = time.monotonic()
+        with lane.condition:
+            heapq.heappush(lane.waiters, entry)
+            try:
+                while True:
+                    timeout = None
+                    if lane.waiters[0] == entry:
+                        timeout = lane.wait_time(tokens)
+                        if timeout <= 0:
+                            lane.requests.consume(1)
+                            lane.tokens.consume(tokens)
+                            break
+                    # Non-head waiters sleep until the head changes
+                    lane.condition.wait(timeout=timeout)
+            finally:
+                lane.waiters.remove(entry)
+                heapq.heapify(lane.waiters)
+                lane.condition.notify_all()
+
+            waited = time.monotonic() - started
+            lane.admitted += 1
+            lane.wait_seconds += waited
+        if waited > 1.0:
+            logger.info(f"LLM call to {provider}/{model} waited {waited:.2f}s for quota (priority {priority.name})")
+        return waited
+
+    def reconcile(self, provider: str, model: str, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once the provider reports actual usage"""
+        lane = self._get_lane(provider, model)
+        with lane.condition:
+            lane.tokens.consume(actual_tokens - estimated_tokens)
+            lane.condition.notify_all()
+
+    def observe(self, provider: str, model: str, status_code: int, headers: Mapping[str, str]) -> None:
+        """
+        Adapt to provider rate-limit feedback
+
+        Args:
+            provider: Provider name (api_type)
+            model: Model name
+            status_code: HTTP status of the provider response
+            headers: Response headers (x-ratelimit-*, retry-after)
+        """
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+        lane = self._get_lane(provider, model)
+        with lane.condition:
+            now = time.monotonic()
+
+            # Provider limits lower than configured take precedence
+            limit_requests = _header_float(headers, "x-ratelimit-limit-requests")
+            if limit_requests and limit_requests / 60.0 < lane.requests.rate:
+                lane.requests.set_rate(limit_requests / 60.0, max(1.0, limit_requests / 60.0))
+            limit_tokens = _header_float(headers, "x-ratelimit-limit-tokens")
+            if limit_tokens and limit_tokens < lane.tokens.capacity:
+                lane.tokens.set_rate(limit_tokens / 60.0, limit_tokens)
+
+            remaining_tokens = _header_float(headers, "x-ratelimit-remaining-tokens")
+            if remaining_tokens is not None:
+                lane.tokens.limit_to(remaining_tokens)
+            if _header_float(headers, "x-ratelimit-remaining-requests") == 0:
+                reset = _parse_duration(headers.get("x-ratelimit-reset-requests")) or 1.0
+                lane.paused_until = max(lane.paused_until, now + reset)
+
+            if status_code == 429:
+                retry_after = (
+                    _parse_duration(headers.get("retry-after"))
+                    or _parse_duration(headers.get("x-ratelimit-reset-tokens"))
+                    or _parse_duration(headers.get("x-ratelimit-reset-requests"))
+                    or 1.0
+                )
+                lane.paused_until = max(lane.paused_until, now + retry_after)
+                lane.throttled += 1
+                logger.warning(f"LLM provider {provider}/{model} throttled, pausing for {retry_after:.2f}s")
+            lane.condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-lane admission counters"""
+        with self._lock:
+            lanes = dict(self._lanes)
+        return {
+            f"{provider}/{model}": {
+                "admitted": lane.admitted,
+                "throttled": lane.throttled,
+                "waiting": len(lane.waiters),
+                "wait_seconds": round(lane.wait_seconds, 3),
+            }
+            for (provider, model), lane in lanes.items()
+        }
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get the process-wide LLM scheduler"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+        return _scheduler
+
+
+def estimate_tokens(params: Dict[str, Any]) -> int:
+    """Estimate prompt plus completion tokens for create params (about 4 characters per token)"""
+    prompt = json.dumps(params.get("messages") or [], default=str)
+    if params.get("tools"):
+        prompt += json.dumps(params["tools"], default=str)
+    max_completion = int(os.getenv("LLM_COMPLETION_TOKEN_ESTIMATE", "1024"))
+    return len(prompt) // 4 + min(params.get("max_tokens") or max_completion, max_completion)
+
+
+def _get_status_and_headers(error: Exception) -> Tuple[Optional[int], Mapping[str, str]]:
+    """Extract the HTTP status and headers from an SDK exception"""
+    response = getattr(error, "response", None)
+    status_code = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status_code is None and getattr(error, "code", None) == 429:  # google.api_core ResourceExhausted
+        status_code = 429
+    headers = getattr(response, "headers", None) or {}
+    return status_code, headers
+
+
+def schedule_client(client: Any) -> None:
+    """
+    Route every model call of an autogen OpenAIWrapper through the scheduler
+
+    The provider clients' create() is wrapped per instance, after autogen's
+    cache lookup, so cache hits don't spend quota.
+
+    Args:
+        client: The agent's OpenAIWrapper (agent.client)
+    """
+    if client is None:
+        return
+    scheduler = get_llm_scheduler()
+    for model_client, config in zip(client._clients, client._config_list):
+        if getattr(model_client, "_llm_scheduled", False):
+            continue
+        provider = config.get("api_type", "openai")
+        default_model = config.get("model", "")
+        create = model_client.create
+
+        def scheduled_create(params: Dict[str, Any], create=create, provider=provider,
+                             default_model=default_model) -> Any:
+            model = params.get("model") or default_model
+            estimated = estimate_tokens(params)
+            scheduler.acquire(provider, model, estimated)
+            try:
+                response = create(params)
+            except Exception as e:
+                status_code, headers = _get_status_and_headers(e)
+                if status_code == 429:
+                    scheduler.observe(provider, model, status_code, headers)
+                raise
+            usage = getattr(response, "usage", None)
+            if getattr(usage, "total_tokens", None):
+                scheduler.reconcile(provider, model, estimated, usage.total_tokens)
+            return response
+
+        model_client.create = scheduled_create
+        model_client._llm_scheduled = True
@@ -0,0 +1,122 @@
+import os
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+import httpx
+from .llm_scheduler import get_llm_scheduler
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class _LimitedTransport(httpx.BaseTransport):
+    """Transport that bounds in-flight requests per provider and per model over a shared pool"""
+
+    def __init__(self, pool: httpx.BaseTransport, provider_semaphore: threading.BoundedSemaphore,
+                 model_semaphore: threading.BoundedSemaphore, provider: str, model: str):
+        self._pool = pool
+        self._provider = provider
+        self._model = model
+        self._provider_semaphore = provider_semaphore
+        self._model_semaphore = model_semaphore
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with self._provider_semaphore, self._model_semaphore:
+            response = self._pool.handle_request(request)
+            # Read the body while holding the slot, the SDK does so right away anyway
+            response.read()
+        # Feed rate-limit headers back to the scheduler. A 429 reaches scheduled_create as
+        # an SDK error, which pauses the lane for every provider, so it isn't counted here
+        if response.status_code != 429:
+            get_llm_scheduler().observe(self._provider, self._model, response.status_code, response.headers)
+        return response
+
+    def close(self) -> None:
+        # The pool is shared, it is closed by LLMTransportPool.close()
+        pass
+
+
+class SharedHTTPClient(httpx.Client):
+    """httpx client shared by every agent, autogen deep-copies llm_config so copies return self"""
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def close(self) -> None:
+        # Owned by LLMTransportPool, agents and SDK clients must not close it
+        pass
+
+
+class LLMTransportPool:
+    """Process-wide keep-alive HTTP pools and concurrency limits for LLM providers"""
+
+    _lock = threading.Lock()
+    _pools: Dict[str, httpx.HTTPTransport] = {}
+    _provider_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+    _model_semaphores: Dict[Tuple[str, str], threading.BoundedSemaphore] = {}
+    _clients: Dict[Tuple[str, str], SharedHTTPClient] = {}
+
+    @staticmethod
+    def _get_limit(name: str, provider: str, default: int) -> int:
+        return int(os.getenv(f"{provider.upper()}_{name}", os.getenv(f"LLM_{name}", default)))
+
+    @classmethod
+    def _get_pool(cls, provider: str) -> httpx.HTTPTransport:
+        if provider not in cls._pools:
+            max_connections = cls._get_limit("MAX_CONNECTIONS", provider, 100)
+            cls._pools[provider] = httpx.HTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60")),
+                ),
+            )
+            cls._provider_semaphores[provider] = threading.BoundedSemaphore(
+                cls._get_limit("MAX_IN_FLIGHT", provider, 32)
+            )
+            logger.info(f"Created shared LLM transport for {provider} (http2: {HTTP2_AVAILABLE})")
+        return cls._pools[provider]
+
+    @classmethod
+    def get_client(cls, provider: str, model: str) -> SharedHTTPClient:
+        """
+        Get the shared HTTP client for a provider and model
+
+        Args:
+            provider: Provider name (api_type)
+            model: Model name, limited separately from the provider
+
+        Returns:
+            SharedHTTPClient: Client to inject into the provider SDK
+        """
+        key = (provider, model)
+        with cls._lock:
+            if key not in cls._clients:
+                pool = cls._get_pool(provider)
+                cls._model_semaphores[key] = threading.BoundedSemaphore(
+                    cls._get_limit("MODEL_MAX_IN_FLIGHT", provider, 16)
+                )
+                cls._clients[key] = SharedHTTPClient(
+                    transport=_LimitedTransport(
+                        pool, cls._provider_semaphores[provider], cls._model_semaphores[key], provider, model
+                    ),
+                    timeout=httpx.Timeout(float(os.getenv("LLM_REQUEST_TIMEOUT", "120")), connect=10.0),
+                )
+            return cls._clients[key]
+
+    @classmethod
+    def close(cls) -> None:
+        """Close all shared pools"""
+        with cls._lock:
+            for pool in cls._pools.values():
+                pool.close()
+            cls._pools.clear()
+            cls._clients.clear()
+            cls._provider_semaphores.clear()
+            cls._model_semaphores.clear()
@@ -0,0 +1,160 @@
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+class PromptCacheStats:
+    """Cached vs uncached prompt token counters across all LLM calls"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.cache_write_tokens = 0
+
+    def record(self, provider: str, model: str, prompt_tokens: int, cached_tokens: int,
+               cache_write_tokens: int = 0) -> None:
+        """
+        Record prompt token usage for one call
+
+        Args:
+            provider: Provider name (api_type)
+            model: Model name
+            prompt_tokens: Total prompt tokens, cached ones included
+            cached_tokens: Prompt tokens read from the provider's prompt cache
+            cache_write_tokens: Prompt tokens written to the cache (Anthropic)
+        """
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.cached_tokens += cached_tokens
+            self.cache_write_tokens += cache_write_tokens
+        # Per call detail, get_stats() and the metrics endpoint carry the totals
+        logger.debug(
+            "LLM call %s/%s: %d prompt tokens, %d cached, %d uncached",
+            provider, model, prompt_tokens, cached_tokens, prompt_tokens - cached_tokens
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "uncached_tokens": self.prompt_tokens - self.cached_tokens,
+                "cache_write_tokens": self.cache_write_tokens,
+                "cached_ratio": round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else 0.0,
+            }
+
+
+prompt_cache_stats = PromptCacheStats()
+
+
+def _get(value: Any, name: str) -> Any:
+    """Read a field from an SDK object or a plain dict"""
+    if isinstance(value, dict):
+        return value.get(name)
+    return getattr(value, name, None)
+
+
+def _mark_block(content: Any) -> Any:
+    """Add a cache breakpoint to the last block of message or system content"""
+    if isinstance(content, str):
+        return [{"type": "text", "text": content, "cache_control": _CACHE_CONTROL}]
+    if isinstance(content, list) and content and isinstance(content[-1], dict):
+        return content[:-1] + [dict(content[-1], cache_control=_CACHE_CONTROL)]
+    return content
+
+
+def mark_anthropic_prefix(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Mark the static prefix of an Anthropic messages request as cacheable
+
+    Breakpoints go on the system prompt, the last tool schema and the first
+    message (the GroupChat introductions message in group chats), which
+    together form the prefix that is identical on every round.
+
+    Args:
+        params: Keyword arguments for anthropic messages.create
+
+    Returns:
+        Dict[str, Any]: Params with cache_control breakpoints
+    """
+    params = dict(params)
+    if params.get("system"):
+        params["system"] = _mark_block(params["system"])
+    tools: Optional[List[Dict[str, Any]]] = params.get("tools")
+    if tools:
+        params["tools"] = tools[:-1] + [dict(tools[-1], cache_control=_CACHE_CONTROL)]
+    messages = params.get("messages")
+    if messages:
+        params["messages"] = [dict(messages[0], content=_mark_block(messages[0].get("content")))] + list(messages[1:])
+    return params
+
+
+def _record_openai_usage(provider: str, model: str, response: Any) -> None:
+    usage = getattr(response, "usage", None)
+    if usage is None or _get(usage, "prompt_tokens") is None:
+        return
+    details = _get(usage, "prompt_tokens_details")
+    cached = (_get(details, "cached_tokens") if details is not None else None) or 0
+    prompt_cache_stats.record(provider, model, _get(usage, "prompt_tokens"), cached)
+
+
+def _enable_anthropic_caching(model_client: Any, model: str) -> None:
+    """Patch the Anthropic SDK call made by autogen's AnthropicClient"""
+    messages_api = getattr(getattr(model_client, "_client", None), "messages", None)
+    if messages_api is None:
+        logger.warning("Anthropic client not found, prompt caching not enabled")
+        return
+    create = messages_api.create
+
+    def cached_create(**kwargs: Any) -> Any:
+        response = create(**mark_anthropic_prefix(kwargs))
+        # autogen drops the cache fields when converting the response, so read them here
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+            cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+            # input_tokens excludes tokens read from or written to the cache
+            prompt_tokens = (usage.input_tokens or 0) + cache_read + cache_write
+            prompt_cache_stats.record("anthropic", kwargs.get("model", model), prompt_tokens, cache_read, cache_write)
+        return response
+
+    messages_api.create = cached_create
+
+
+def enable_prompt_caching(client: Any) -> None:
+    """
+    Mark cacheable prefixes and report cached prompt tokens for an autogen OpenAIWrapper
+
+    OpenAI caches stable prefixes automatically, so only usage is reported.
+    Anthropic requests get explicit cache_control breakpoints.
+
+    Args:
+        client: The agent's OpenAIWrapper (agent.client)
+    """
+    if client is None:
+        return
+    for model_client, config in zip(client._clients, client._config_list):
+        if getattr(model_client, "_prompt_caching", False):
+            continue
+        provider = config.get("api_type", "openai")
+        model = config.get("model", "")
+        if provider == "anthropic":
+            _enable_anthropic_caching(model_client, model)
+        else:
+            create = model_client.create
+
+            def reported_create(params: Dict[str, Any], create=create, provider=provider, model=model) -> Any:
+                response = create(params)
+                _record_openai_usage(provider, params.get("model") or model, response)
+                return response
+
+            model_client.create = reported_create
+        model_client._prompt_caching = True
@@ -0,0 +1,150 @@
+import os
+import asyncio
+import inspect
+import logging
+import threading
+import contextvars
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import autogen
+from ..core.background_loop import get_background_loop
+
+logger = logging.getLogger(__name__)
+
+_tool_pool: Optional[ThreadPoolExecutor] = None
+_tool_pool_lock = threading.Lock()
+_tool_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+# asyncio semaphores belong to one event loop, the background loop can be restarted
+_async_tool_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _get_tool_pool() -> ThreadPoolExecutor:
+    global _tool_pool
+    with _tool_pool_lock:
+        if _tool_pool is None:
+            _tool_pool = ThreadPoolExecutor(
+                max_workers=int(os.getenv("TOOL_MAX_WORKERS", "16")),
+                thread_name_prefix="tool-call",
+            )
+        return _tool_pool
+
+
+def _tool_limit(tool_name: str) -> int:
+    """Per-tool concurrency cap, TOOL_MAX_CONCURRENCY (default 4) or TOOL_<NAME>_MAX_CONCURRENCY"""
+    limit = os.getenv(f"TOOL_{tool_name.upper()}_MAX_CONCURRENCY", os.getenv("TOOL_MAX_CONCURRENCY", "4"))
+    return max(1, int(limit))
+
+
+def _get_tool_semaphore(tool_name: str) -> threading.BoundedSemaphore:
+    with _tool_pool_lock:
+        if tool_name not in _tool_semaphores:
+            _tool_semaphores[tool_name] = threading.BoundedSemaphore(_tool_limit(tool_name))
+        return _tool_semaphores[tool_name]
+
+
+def _get_async_tool_semaphore(tool_name: str) -> asyncio.Semaphore:
+    """Same cap as _get_tool_semaphore for async tools, call on the loop running them"""
+    semaphores = _async_tool_semaphores.setdefault(asyncio.get_running_loop(), {})
+    if tool_name not in semaphores:
+        semaphores[tool_name] = asyncio.Semaphore(_tool_limit(tool_name))
+    return semaphores[tool_name]
+
+
+def _tool_response(tool_call_id: Optional[str], func_return: Dict[str, Any]) -> Dict[str, Any]:
+    response = {"role": "tool", "content": func_return.get("content") or ""}
+    if tool_call_id is not None:
+        response["tool_call_id"] = tool_call_id
+    return response
+
+
+def _execute(agent: autogen.ConversableAgent, function_call: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one tool call under its tool's concurrency cap"""
+    with _get_tool_semaphore(function_call.get("name") or ""):
+        # execute_function reports tool exceptions in the returned content
+        _, func_return = agent.execute_function(function_call)
+    return func_return
+
+
+async def _a_execute(agent: autogen.ConversableAgent, function_call: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one async tool call (e.g. the httpx DQ tools) on the background loop, under its tool's cap"""
+    async with _get_async_tool_semaphore(function_call.get("name") or ""):
+        _, func_return = await agent.a_execute_function(function_call)
+    return func_return
+
+
+def parallel_tool_calls_reply(
+    agent: autogen.ConversableAgent,
+    messages: Optional[List[Dict[str, Any]]] = None,
+    sender: Optional[autogen.Agent] = None,
+    config: Optional[Any] = None,
+) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    Reply to a message with tool calls, running the calls concurrently
+
+    Sync tools run on a thread pool, async tools on the shared background
+    event loop, so autogen doesn't start a new loop per call. Responses keep
+    the order of the tool calls in the message. Each call runs in a copy of
+    the caller's context, so the LLM priority and the per-turn tool timings
+    carry over.
+
+    Args:
+        agent: The executing agent
+        messages: Conversation messages, the last one holds the tool calls
+        sender: Agent that sent the message
+        config: Unused, kept for the reply function signature
+
+    Returns:
+        Tuple[bool, Optional[Dict[str, Any]]]: Whether a reply was generated, and the reply
+    """
+    if messages is None:
+        messages = agent._oai_messages[sender]
+    tool_calls = messages[-1].get("tool_calls") or []
+    if not tool_calls:
+        return False, None
+
+    function_map = agent.function_map
+    is_async = [
+        inspect.iscoroutinefunction(function_map.get(call.get("function", {}).get("name")))
+        for call in tool_calls
+    ]
+    if len(tool_calls) == 1 and not is_async[0]:
+        # Nothing to overlap
+        return autogen.ConversableAgent.generate_tool_calls_reply(agent, messages, sender, config)
+
+    logger.info("Running %d tool calls concurrently", len(tool_calls))
+    pool = _get_tool_pool()
+    futures = [
+        get_background_loop().submit(_a_execute(agent, call.get("function", {}))) if call_is_async
+        else pool.submit(contextvars.copy_context().run, _execute, agent, call.get("function", {}))
+        for call, call_is_async in zip(tool_calls, is_async)
+    ]
+    tool_returns = [
+        _tool_response(call.get("id"), future.result())
+        for call, future in zip(tool_calls, futures)
+    ]
+    return True, {
+        "role": "tool",
+        "tool_responses": tool_returns,
+        "content": "\n\n".join(agent._str_for_tool_response(tool_return) for tool_return in tool_returns),
+    }
+
+
+def enable_parallel_tool_calls(agent: autogen.ConversableAgent) -> None:
+    """
+    Make an executing agent run the tool calls of one message concurrently
+
+    Args:
+        agent: Agent the tools are registered for execution with
+    """
+    agent.replace_reply_func(autogen.ConversableAgent.generate_tool_calls_reply, parallel_tool_calls_reply)
+
+
+def shutdown_tool_pool() -> None:
+    """Stop the tool call threads (application shutdown)"""
+    global _tool_pool
+    with _tool_pool_lock:
+        if _tool_pool is not None:
+            _tool_pool.shutdown(wait=False)
+            _tool_pool = None
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Header, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, Any, Optional
+import asyncio
 import logging
 from ..models.chat import (
     ChatRequest, 
@@ -12,37 +13,58 @@ from ..models.chat import (
 )
 from ..core.session import SessionManager
 from ..services.chat_service import ChatService
+from ..services.request_coalescer import RequestCoalescer
+from ..core.serialization import FastJSONResponse, build_chat_payload, dumps, select_messages
+from ..core.metrics import INFLIGHT_CHAT_REQUESTS
+from ..tools.dq_async import get_async_dq_client
+from ..tools.dq_tools import job_status_params, refresh_catalog
+from ..tools.dq_watcher import get_job_watcher
+from ..tools.dq_resilience import get_breaker_stats
 import traceback
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 chat_service = ChatService()
+request_coalescer = RequestCoalescer()
+INFLIGHT_CHAT_REQUESTS.set_function(lambda: request_coalescer.get_stats()["in_flight"])
 
 @router.get("/hello")
 async def hello_world():
     return JSONResponse(content={"message": "Hello, World!"})
 
 @router.post("/api/v1/chat")
-async def chat(request: ChatRequest) -> ChatResponse:
+async def chat(
+    request: ChatRequest,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key")
+) -> ChatResponse:
     try:
-        logger.info(f"Received chat request: {request}")
+        logger.info("Received chat request for session %s (%d chars)", request.session_id, len(request.message))
         
-        # Get response from service
-        response = await chat_service.process_chat(
-            message=request.message,
+        # Get response from service, duplicates attach to the in-flight request
+        response = await request_coalescer.run(
             session_id=request.session_id,
-            metadata=request.metadata
+            message=request.message,
+            factory=lambda: chat_service.process_chat(
+                message=request.message,
+                session_id=request.session_id,
+                metadata=request.metadata
+            ),
+            idempotency_key=idempotency_key
         )
         
         logger.info("Successfully processed chat request")
-        logger.debug(f"Response: {response}")
-        
-        # The response is already a validated dict from model_dump()
-        return response
+
+        # Messages the client hasn't seen yet, as of this result's turn
+        # (a replayed or coalesced result must not pick up later turns)
+        messages = select_messages(response, request.last_seen_id)
+
+        # Serialized once, FastAPI doesn't re-validate a returned Response
+        return FastJSONResponse(
+            content=build_chat_payload(response, messages, request.response_mode, request.last_seen_id)
+        )
         
     except Exception as e:
-        logger.error(f"Error processing chat request: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("Error processing chat request: %s", e)
         
         # Create error response using models
         empty_chat_history = []
@@ -90,6 +112,61 @@ async def clear_session(request: ClearRequest) -> ClearResponse:
             message=f"Error clearing session: {str(e)}"
         )
 
+@router.get("/api/v1/dq/jobs")
+async def dq_jobs(limit: int = 5):
+    """Recent DQ jobs, fetched on the event loop without holding a worker thread"""
+    try:
+        params, headers = job_status_params()
+        params['limit'] = str(limit)
+        response = await get_async_dq_client().job_status(params, headers)
+    except Exception as e:
+        logger.error("Error fetching DQ jobs: %s", e)
+        raise HTTPException(status_code=502, detail=f"DQ API error: {str(e)}")
+    if response.status_code != 200:
+        raise HTTPException(status_code=502, detail=f"DQ API returned status code {response.status_code}")
+    return FastJSONResponse(content={"jobs": (response.json() or {}).get("data") or []})
+
+@router.get("/api/v1/dq/jobs/events")
+async def dq_job_events(request: Request):
+    """Server-sent events: the job watcher's status table, then every status change"""
+    watcher = get_job_watcher()
+    if not watcher.running:
+        raise HTTPException(status_code=503, detail="DQ job watcher is not running")
+
+    async def stream():
+        queue = watcher.subscribe()
+        try:
+            yield b"event: snapshot\ndata: " + dumps(watcher.snapshot()) + b"\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle stream
+                    yield b": keep-alive\n\n"
+                    continue
+                yield b"event: status\ndata: " + dumps(event) + b"\n\n"
+        finally:
+            watcher.unsubscribe(queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/api/v1/dq/catalog/refresh")
+async def dq_catalog_refresh():
+    """Rebuild the metadata catalog from the DQ API (see DQ_CATALOG_CONNECTIONS)"""
+    try:
+        tables = await asyncio.to_thread(refresh_catalog)
+    except Exception as e:
+        logger.error("Error refreshing DQ catalog: %s", e)
+        raise HTTPException(status_code=502, detail=f"DQ catalog refresh failed: {str(e)}")
+    return JSONResponse(content={"tables": tables})
+
 @router.get("/health")
 async def health_check():
-    return JSONResponse(content={"status": "healthy"}) 
\ No newline at end of file
+    # An open DQ circuit degrades the service without making it unhealthy
+    dq_circuits = get_breaker_stats()
+    degraded = any(stats["state"] != "closed" for stats in dq_circuits.values())
+    return JSONResponse(content={"status": "degraded" if degraded else "healthy", "dq_circuits": dq_circuits}) 
\ No newline at end of file
@@ -1,10 +1,19 @@
 import autogen
-import copy
-from typing import Tuple, Dict, Any, List
-from dataclasses import dataclass
+import asyncio
+from typing import Tuple, Dict, Any, List, Optional
+from dataclasses import dataclass, field
 import logging
 from ..preprocessing.message_redact import MessageRedact
-from ..agents.agent_factory import create_agents
+from ..preprocessing.context_builder import ContextBuilder
+from .fast_path import CatalogFastPath
+from .speaker_selection import RuleBasedSpeakerSelector
+from ..agents.agent_config import ModelConfig
+from ..agents.llm_cache import get_response_cache
+from ..agents.llm_scheduler import Priority, llm_priority
+from ..agents.agent_factory import create_agents, configure_llm_client
+from ..core.logging import log_payload, truncate
+from ..core.metrics import CHAT_ROUNDS_PER_TURN, observe_chat_turn
+from ..tools.decorators import track_tool_calls, summarize_tool_calls
 from datetime import datetime
 import traceback
 import json
@@ -17,14 +26,16 @@ class ChatResult:
     participants: List[str]
     chat_history: List[Dict[str, Any]]
     metadata: Dict[str, Any] = None
+    # Transcript as of the end of this turn, for last_seen_id filtering
+    transcript: List[Dict[str, Any]] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert ChatResult to dictionary"""
         try:
-            logger.info("Converting ChatResult to dictionary")
-            logger.info(f"Response structure: {self.response}")
-            logger.info(f"Number of participants: {len(self.participants)}")
-            logger.info(f"Number of chat history messages: {len(self.chat_history)}")
+            logger.debug(
+                "Converting ChatResult to dictionary (%d participants, %d messages)",
+                len(self.participants), len(self.chat_history)
+            )
             
             return {
                 "response": self.response,
@@ -52,6 +63,28 @@ class ChatManager:
         """Initialize the chat manager with LLM configuration"""
         self.llm_config = llm_config
         self.history = []
+        self._turn_lock = asyncio.Lock()
+        self.clean_transform = MessageRedact()
+
+        # Formatted messages with stable, increasing ids across turns
+        self._transcript: List[Dict[str, Any]] = []
+        self._next_message_id = 1
+        self._max_transcript_messages = 500
+
+        # The history window as the agents produced it. The group chat holds
+        # transformed, truncated copies after resume(), so each turn builds its
+        # context from these originals and the transform memo hits across turns.
+        self._raw_messages: List[Dict[str, Any]] = []
+        self._turn_start = 0
+
+        # Token-budgeted history window with a rolling summary of older messages
+        provider = ModelConfig.get_provider(llm_config)
+        self.context_builder = ContextBuilder(
+            token_budget=ModelConfig.get_context_token_budget(provider)
+        )
+
+        # Deterministic answers for common catalog questions
+        self.fast_path = CatalogFastPath()
         
         # Create all agents
         self.agents = create_agents(llm_config)
@@ -72,6 +105,13 @@ class ChatManager:
             self.reviewer_assistant: [self.user_proxy],
         }
         
+        # Resolve the next speaker from the graph, asking the LLM only when ambiguous
+        self.speaker_selector = RuleBasedSpeakerSelector(
+            allowed_transitions=allowed_transitions,
+            executor=self.executor,
+            reviewer=self.reviewer_assistant
+        )
+        
         # Create the group chat with specified transitions
         self.groupchat = autogen.GroupChat(
             agents=[
@@ -85,6 +125,7 @@ class ChatManager:
             max_round=5,
             speaker_transitions_type="allowed",
             allowed_or_disallowed_speaker_transitions=allowed_transitions,
+            speaker_selection_method=self.speaker_selector,
             send_introductions=True
         )
         
@@ -94,51 +135,55 @@ class ChatManager:
             llm_config=self.llm_config,
             is_termination_msg=lambda x: "TERMINATE" in x.get("content", "")
         )
+        configure_llm_client(self.manager.client, self.manager.name)
 
     async def group_chat(self, message: str, agents: List[Any], preprocessing: Any) -> ChatResult:
         """Run a group chat session"""
         try:
-            logger.info(f"Starting group chat with message: {message}")
+            logger.info("Starting group chat with message: %s", truncate(message, 200))
             
             # Preprocess the message
             processed_message = await preprocessing.process(message)
-            logger.info(f"Processed message: {processed_message}")
-            
-            # Use the chat method which properly handles message history
-            chat_response, manager = self.chat(processed_message)
+            logger.debug("Processed message: %s", truncate(processed_message, 200))
             
-            # Get messages from the manager
-            tmp_messages = copy.deepcopy(manager.groupchat.messages)
-            end_window = len(tmp_messages)
-            start_window = 0
-            retain_messages = 11
+            tool_calls: List[Dict[str, Any]] = []
 
-            # Filter out intro messages
-            messages = []
-            intro_string = 'We have assembled a great team today'
-            
-            for msg in tmp_messages:
-                if not isinstance(msg, dict) or intro_string in msg.get('content', ''):
-                    continue
-                
-                content = msg.get('content', '')
-                if not content or "Hello everyone." in content:
-                    continue
-                
-                messages.append({
-                    "id": len(messages) + 1,
-                    "role": msg.get("role", "assistant"),
-                    "name": msg.get("name", "Unknown"),
-                    "content": content,
-                    "timestamp": str(datetime.now())
-                })
+            # One turn at a time, all agents share a single group chat
+            async with self._turn_lock:
+                # Answer common catalog questions directly, falling back to the agents
+                fast_result = self.fast_path.answer(processed_message, self._raw_messages)
+                if fast_result is not None:
+                    with observe_chat_turn("fast_path"):
+                        self._turn_start = len(self.manager.groupchat.messages)
+                        self.manager.groupchat.messages.extend(fast_result.to_messages(processed_message))
+                    manager = self.manager
+                else:
+                    # Use the chat method which properly handles message history,
+                    # off the event loop so other requests keep being served.
+                    # The worker thread inherits the interactive LLM priority
+                    # and the tool call collector.
+                    with observe_chat_turn("agents"), llm_priority(Priority.INTERACTIVE), \
+                            track_tool_calls() as tool_calls:
+                        chat_response, manager = await asyncio.to_thread(self.chat, processed_message)
+                    CHAT_ROUNDS_PER_TURN.observe(len(manager.groupchat.messages) - self._turn_start)
 
-            # Keep only recent messages
-            if len(messages) > retain_messages:
-                start_window = len(messages) - retain_messages
-                messages = messages[start_window:]
+                # Only messages added this turn are new, earlier ones are already in the transcript
+                new_messages = manager.groupchat.messages[self._turn_start:]
+                self._raw_messages.extend(new_messages)
+                self._record_messages(new_messages)
+                # Later turns append to the transcript, this turn's result must not include them
+                transcript = list(self._transcript)
+
+            retain_messages = 11
+            messages = transcript[-retain_messages:]
             
-            logger.info(f"Processed {len(messages)} messages")
+            logger.info("Processed %d messages", len(messages))
+
+            metadata = {"timestamp": str(datetime.now())}
+            if fast_result is not None:
+                metadata["fast_path"] = fast_result.intent
+            # Shows whether a slow turn was spent in tools (DuckDB, DQ API) or the LLM
+            metadata["tool_timings"] = summarize_tool_calls(tool_calls)
             
             # Create ChatResult with the messages
             result = ChatResult(
@@ -149,7 +194,8 @@ class ChatManager:
                 },
                 participants=[agent.name for agent in self.groupchat.agents],
                 chat_history=messages,
-                metadata={"timestamp": str(datetime.now())}
+                metadata=metadata,
+                transcript=transcript
             )
             
             return result
@@ -168,6 +214,43 @@ class ChatManager:
                 metadata={"error": True, "error_message": str(e)}
             )
 
+    def _record_messages(self, new_messages: List[Dict[str, Any]]) -> None:
+        """Format messages added this turn and append them to the transcript with stable ids"""
+        intro_string = 'We have assembled a great team today'
+        timestamp = str(datetime.now())
+        for msg in new_messages:
+            if not isinstance(msg, dict):
+                continue
+            content = msg.get('content', '')
+            if not content or not isinstance(content, str) or intro_string in content or "Hello everyone." in content:
+                continue
+            self._transcript.append({
+                "id": self._next_message_id,
+                "role": msg.get("role", "assistant"),
+                "name": msg.get("name", "Unknown"),
+                "content": content,
+                "timestamp": timestamp
+            })
+            self._next_message_id += 1
+
+        if len(self._transcript) > self._max_transcript_messages:
+            del self._transcript[:-self._max_transcript_messages]
+
+    def get_messages(self, last_seen_id: Optional[int] = None, limit: int = 11) -> List[Dict[str, Any]]:
+        """
+        Get formatted messages from the transcript
+
+        Args:
+            last_seen_id: Only return messages newer than this id (all retained ones)
+            limit: Number of most recent messages when no last_seen_id is given
+
+        Returns:
+            List[Dict[str, Any]]: Messages, oldest first
+        """
+        if last_seen_id is not None:
+            return [m for m in self._transcript if m["id"] > last_seen_id]
+        return self._transcript[-limit:]
+
     def _format_chat_history(self) -> List[Dict[str, Any]]:
         """Format the chat history as a list of messages"""
         messages = []
@@ -175,7 +258,7 @@ class ChatManager:
             # Get messages from groupchat
             if hasattr(self.manager, 'groupchat') and hasattr(self.manager.groupchat, 'messages'):
                 chat_messages = self.manager.groupchat.messages
-                logger.debug(f"Raw chat messages: {chat_messages}")
+                log_payload(logger, "Raw chat messages", chat_messages)
                 
                 for i, m in enumerate(chat_messages):
                     if not m or not isinstance(m, dict):
@@ -195,7 +278,6 @@ class ChatManager:
                         "timestamp": str(datetime.now())
                     }
                     messages.append(message)
-                    logger.debug(f"Formatted message: {message}")
                 
             return messages
             
@@ -244,12 +326,7 @@ class ChatManager:
     def chat(self, prompt: str) -> Tuple[Any, Any]:
         """Handle chat with proper message history and initialization"""
         try:
-            clean_transform = MessageRedact()
-            tmp_messages = copy.deepcopy(self.manager.groupchat.messages)
-            end_window = len(tmp_messages)
-            
-            # retain window of 11 messages
-            start_window = max(0, end_window - 11)  # Keep last 5 messages
+            self._turn_start = len(self.manager.groupchat.messages)
 
             # Create intro message with valid agent name
             intro_message = {
@@ -257,12 +334,25 @@ class ChatManager:
                 'role': 'user',
                 'name': self.user_proxy.name  # Use a valid agent name
             }
+
+            # No deep copy here, the transform memoizes and copies per message
+            tmp_messages = [
+                m for m in self._raw_messages
+                if m.get('content') != intro_message['content']
+            ]
+
+            # Pack recent messages into the token budget, older ones are summarized
+            window_messages, summary_message = self.context_builder.build(tmp_messages)
+            # Dropped messages live on in the summary
+            self._raw_messages = list(window_messages)
             
-            # Process existing messages if any
+            # Process existing messages if any. The intro stays first and the
+            # changing summary after it, so the system prompt, tool schemas and
+            # intro form a prefix that provider prompt caches can reuse.
             if tmp_messages:
-                processed_messages = clean_transform.apply_transform(
-                    tmp_messages[start_window:end_window]
-                )
+                processed_messages = self.clean_transform.apply_transform(window_messages)
+                if summary_message:
+                    processed_messages.insert(0, dict(summary_message))
                 processed_messages.insert(0, intro_message)
             else:
                 # If no messages, just start with intro
@@ -278,12 +368,16 @@ class ChatManager:
                 last_agent = self.user_proxy
                 last_message = None
 
+            # Everything after the resumed history is new this turn
+            self._turn_start = len(self.manager.groupchat.messages)
+
             # Initiate chat with the prompt
             chat_result = self.user_proxy.initiate_chat(
                 recipient=self.manager,
                 message=prompt,
                 clear_history=False,
-                max_rounds=7
+                max_rounds=7,
+                cache=get_response_cache()
             )
             
             return chat_result, self.manager
@@ -0,0 +1,260 @@
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+from ..tools.dq_tools import get_catalog_cursor, get_catalog_version
+
+logger = logging.getLogger(__name__)
+
+# Requests that need the Job_Assistant (or anything beyond a catalog lookup)
+_AGENT_ONLY_PATTERN = re.compile(
+    r"\b(dq|job|jobs|run|status|profile|count|how many|why|compare|describe)\b", re.IGNORECASE
+)
+_LIST_PATTERN = re.compile(r"\b(what|which|list|show|get|find|give|are there|do i have)\b", re.IGNORECASE)
+_CONNECTIONS_PATTERN = re.compile(r"\bconnections?\b", re.IGNORECASE)
+# Trailing words may repeat the request, e.g. "list my connections, list all"
+_ALL_CONNECTIONS_PATTERN = re.compile(
+    r"^\W*(?:what|which|list|show)(?:\s+(?:are|all|the|my|of|available))*\s+connections\b"
+    r"(?:[\s,.;!?]+(?:do|are|have|available|there|i|we|you|exist|list|show|all|of|them|please))*\W*$",
+    re.IGNORECASE
+)
+_SCHEMAS_PATTERN = re.compile(r"\bschemas?\b", re.IGNORECASE)
+_TABLES_PATTERN = re.compile(r"\btables?\b", re.IGNORECASE)
+_REFERENCE_PATTERN = re.compile(r"\b(that|this|same|the previous|those)\s+(connection|schema)\b", re.IGNORECASE)
+_NAME_FILTER_PATTERN = re.compile(
+    r"(?:w/|with|containing|like|named)\s+(?:'([^']+)'|\"([^\"]+)\"|([A-Za-z0-9_\-]+)\s+in\s+(?:the|their)\s+names?)",
+    re.IGNORECASE
+)
+_LIMIT_PATTERN = re.compile(r"\b(?:first|top)\s+(\d+)\b", re.IGNORECASE)
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_\-`!@\[\]]+")
+_STOPWORDS = {
+    "what", "which", "list", "show", "tables", "table", "schemas", "schema", "connection", "connections",
+    "have", "with", "that", "this", "same", "there", "name", "the", "are", "for", "from", "give", "find",
+}
+
+@dataclass
+class FastPathResult:
+    """Result of a deterministic catalog answer"""
+    intent: str
+    sql: str
+    answer: str
+    confidence: float
+    rows: List[Tuple] = field(default_factory=list)
+
+    def to_messages(self, prompt: str) -> List[Dict[str, Any]]:
+        """Synthetic chat-history entries so later agent turns keep the context"""
+        return [
+            {"content": prompt, "role": "user", "name": "Admin_User"},
+            {
+                "content": f"{self.answer}\n\nquery: {self.sql}",
+                "role": "user",
+                "name": "Reviewer_Assistant",
+            },
+        ]
+
+
+class CatalogFastPath:
+    """Answer common catalog questions directly from the metadata table"""
+
+    def __init__(self, min_confidence: float = 0.75, max_rows: int = 30):
+        self.min_confidence = min_confidence
+        self.max_rows = max_rows
+        self._connections: Optional[List[str]] = None
+        self._schemas: Optional[Dict[str, List[str]]] = None
+        self._catalog_version: Optional[int] = None
+
+    def _load_catalog(self):
+        """Load connection and schema names, again after each catalog refresh"""
+        version = get_catalog_version()
+        if self._connections is not None and self._catalog_version == version:
+            return
+        cursor = get_catalog_cursor()
+        rows = cursor.execute(
+            "select distinct connection_name, schema_name from metadata order by 1, 2"
+        ).fetchall()
+        schemas: Dict[str, List[str]] = {}
+        for connection_name, schema_name in rows:
+            schemas.setdefault(connection_name, []).append(schema_name)
+        self._schemas = schemas
+        self._connections = list(schemas)
+        self._catalog_version = version
+
+    def _referenced_connection(self, history: List[Dict[str, Any]]) -> Optional[str]:
+        """Connection named in the latest chat message naming one, None if that message names several"""
+        for msg in reversed(history):
+            content = str(msg.get("content") or "").lower()
+            named = [c for c in self._connections if c.lower() in content]
+            if named:
+                return named[0] if len(named) == 1 else None
+        return None
+
+    def _referenced_schema(self, history: List[Dict[str, Any]],
+                           connection_name: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """(connection, schema) named in the latest chat message naming a schema, unless ambiguous"""
+        for msg in reversed(history):
+            tokens = {t.lower() for t in _TOKEN_PATTERN.findall(str(msg.get("content") or ""))}
+            named = [
+                (c, s) for c, schemas in self._schemas.items()
+                if connection_name in (None, c)
+                for s in schemas if s.lower() in tokens
+            ]
+            if named:
+                return named[0] if len(named) == 1 else (None, None)
+        return None, None
+
+    def _match_connection(self, message: str, history: List[Dict[str, Any]]) -> Tuple[Optional[str], float]:
+        """Find the connection referenced in a message"""
+        lowered = message.lower()
+        exact = [c for c in self._connections if c.lower() in lowered]
+        if len(exact) == 1:
+            return exact[0], 1.0
+        if len(exact) > 1:
+            return None, 0.0
+
+        # Partial names, e.g. "the snowflake connection"
+        tokens = {
+            t.lower() for t in _TOKEN_PATTERN.findall(message)
+            if len(t) >= 4 and t.lower() not in _STOPWORDS
+        }
+        partial = [
+            c for c in self._connections
+            if tokens & set(c.lower().replace("-", "_").split("_"))
+        ]
+        if len(partial) == 1:
+            return partial[0], 0.8
+
+        # "that connection" is whichever one the conversation (fast path or agents) named last
+        if _REFERENCE_PATTERN.search(message):
+            referenced = self._referenced_connection(history)
+            if referenced:
+                return referenced, 0.8
+        return None, 0.0
+
+    def _match_schema(self, message: str, connection_name: Optional[str],
+                      history: List[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str], float]:
+        """Find the schema (and owning connection) referenced in a message"""
+        tokens = {t.lower() for t in _TOKEN_PATTERN.findall(message)}
+        candidates = [
+            (c, s) for c, schemas in self._schemas.items()
+            if connection_name in (None, c)
+            for s in schemas if s.lower() in tokens
+        ]
+        if len(candidates) == 1:
+            return candidates[0][0], candidates[0][1], 1.0
+
+        if not candidates and _REFERENCE_PATTERN.search(message):
+            owner, schema_name = self._referenced_schema(history, connection_name)
+            if schema_name:
+                return owner, schema_name, 0.8
+        return None, None, 0.0
+
+    def _run(self, sql: str, params: List[Any]) -> List[Tuple]:
+        return get_catalog_cursor().execute(sql, params).fetchall()
+
+    @staticmethod
+    def _format_list(title: str, values: List[str]) -> str:
+        return f"{title}\n" + "\n".join(f"- {value}" for value in values)
+
+    def answer(self, message: str, history: Optional[List[Dict[str, Any]]] = None) -> Optional[FastPathResult]:
+        """
+        Try to answer a message without the agents
+
+        Args:
+            message (str): The user message
+            history (Optional[List[Dict[str, Any]]]): Chat messages so far, resolves "that connection"
+
+        Returns:
+            Optional[FastPathResult]: The answer, or None when the agents should handle it
+        """
+        try:
+            if not message or _AGENT_ONLY_PATTERN.search(message) or not _LIST_PATTERN.search(message):
+                return None
+            self._load_catalog()
+            history = [m for m in history or [] if isinstance(m, dict)]
+
+            result = None
+            if _TABLES_PATTERN.search(message):
+                result = self._answer_tables(message, history)
+            elif _SCHEMAS_PATTERN.search(message):
+                result = self._answer_schemas(message, history)
+            elif _CONNECTIONS_PATTERN.search(message):
+                result = self._answer_connections(message)
+
+            if result is None or result.confidence < self.min_confidence:
+                return None
+            logger.info(f"Fast path answered intent '{result.intent}' with {len(result.rows)} rows")
+            return result
+
+        except Exception as e:
+            logger.warning(f"Fast path failed, falling back to agents: {str(e)}")
+            return None
+
+    def _answer_connections(self, message: str) -> Optional[FastPathResult]:
+        sql = "select distinct connection_name from metadata order by 1"
+        rows = self._run(sql, [])
+        values = [r[0] for r in rows]
+        return FastPathResult(
+            intent="list_connections",
+            sql=sql,
+            answer=self._format_list(f"You have {len(values)} connections:", values),
+            confidence=1.0 if _ALL_CONNECTIONS_PATTERN.search(message) else 0.5,
+            rows=rows,
+        )
+
+    def _answer_schemas(self, message: str, history: List[Dict[str, Any]]) -> Optional[FastPathResult]:
+        connection_name, confidence = self._match_connection(message, history)
+        if connection_name is None:
+            return None
+        sql = "select distinct schema_name from metadata where lower(connection_name) = lower(?) order by 1"
+        rows = self._run(sql, [connection_name])
+        values = [r[0] for r in rows]
+        return FastPathResult(
+            intent="list_schemas",
+            sql=sql.replace("?", f"'{connection_name}'"),
+            answer=self._format_list(
+                f"The connection {connection_name} has {len(values)} schemas:", values
+            ),
+            confidence=confidence,
+            rows=rows,
+        )
+
+    def _answer_tables(self, message: str, history: List[Dict[str, Any]]) -> Optional[FastPathResult]:
+        connection_name, connection_confidence = self._match_connection(message, history)
+        owner, schema_name, schema_confidence = self._match_schema(message, connection_name, history)
+        if schema_name is None:
+            return None
+        if connection_name is None:
+            connection_name, connection_confidence = owner, schema_confidence
+
+        sql = (
+            "select distinct table_name from metadata "
+            "where lower(connection_name) = lower(?) and lower(schema_name) = lower(?)"
+        )
+        params = [connection_name, schema_name]
+        name_filter = _NAME_FILTER_PATTERN.search(message)
+        search_string = next((g for g in name_filter.groups() if g), None) if name_filter else None
+        if search_string:
+            sql += " and lower(table_name) like lower(?)"
+            params.append(f"%{search_string}%")
+        limit_match = _LIMIT_PATTERN.search(message)
+        limit = min(int(limit_match.group(1)), self.max_rows) if limit_match else self.max_rows
+        sql += f" order by 1 limit {limit}"
+
+        rows = self._run(sql, params)
+        values = [r[0] for r in rows]
+
+        rendered_sql = sql
+        for param in params:
+            rendered_sql = rendered_sql.replace("?", f"'{param}'", 1)
+        title = f"Found {len(values)} tables in schema {schema_name} of connection {connection_name}"
+        if search_string:
+            title += f" matching '{search_string}'"
+        if len(values) == limit:
+            title += f" (limited to the first {limit})"
+        return FastPathResult(
+            intent="list_tables",
+            sql=rendered_sql,
+            answer=self._format_list(title + ":", values),
+            confidence=min(connection_confidence, schema_confidence),
+            rows=rows,
+        )
@@ -0,0 +1,71 @@
+import logging
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+class RuleBasedSpeakerSelector:
+    """
+    Speaker selection for autogen GroupChat that resolves the next speaker from
+    the transition graph and the shape of the last message, and only defers to
+    the LLM ("auto") when more than one candidate is genuinely possible.
+    """
+
+    def __init__(self, allowed_transitions: Dict[Any, List[Any]], executor: Any,
+                 reviewer: Any, fallback_method: str = "auto"):
+        """
+        Initialize the selector
+
+        Args:
+            allowed_transitions: Allowed speaker transitions (agent -> next agents)
+            executor: Agent that executes tool calls
+            reviewer: Agent that summarizes tool results
+            fallback_method: autogen selection method used for ambiguous branches
+        """
+        self.allowed_transitions = allowed_transitions
+        self.executor = executor
+        self.reviewer = reviewer
+        self.fallback_method = fallback_method
+        self.rule_selections = 0
+        self.llm_selections = 0
+
+    @staticmethod
+    def _has_tool_calls(message: Dict[str, Any]) -> bool:
+        return bool(message.get("tool_calls") or message.get("function_call"))
+
+    @staticmethod
+    def _is_tool_response(message: Dict[str, Any]) -> bool:
+        return bool(message.get("tool_responses")) or message.get("role") in ("tool", "function")
+
+    def _select(self, last_speaker: Any, message: Dict[str, Any]) -> Optional[Any]:
+        """Apply the deterministic rules, returns None when ambiguous"""
+        candidates = self.allowed_transitions.get(last_speaker, [])
+        if not candidates:
+            return None
+
+        # Tool calls are always run by the executor
+        if self._has_tool_calls(message):
+            return self.executor if self.executor in candidates else None
+
+        # Tool results are summarized by the reviewer
+        if self._is_tool_response(message) and self.reviewer in candidates:
+            return self.reviewer
+
+        # A plain text reply from an assistant never goes to the executor
+        if last_speaker is not self.executor:
+            candidates = [agent for agent in candidates if agent is not self.executor]
+
+        if len(candidates) == 1:
+            return candidates[0]
+        return None
+
+    def __call__(self, last_speaker: Any, groupchat: Any) -> Union[Any, str]:
+        """Select the next speaker (autogen custom speaker_selection_method)"""
+        message = groupchat.messages[-1] if groupchat.messages else {}
+        speaker = self._select(last_speaker, message)
+        if speaker is not None:
+            self.rule_selections += 1
+            logger.debug("Rule-based speaker selection: %s -> %s", last_speaker.name, speaker.name)
+            return speaker
+
+        self.llm_selections += 1
+        return self.fallback_method
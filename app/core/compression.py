@@ -0,0 +1,31 @@
+from typing import Iterable
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class StreamingAwareGZipMiddleware:
+    """
+    GZipMiddleware that leaves event streams alone
+
+    Some starlette versions gzip text/event-stream responses without
+    flushing each chunk, so server-sent events would sit in the zlib buffer.
+    Requests to the excluded paths, or that accept text/event-stream, go to
+    the app uncompressed; everything else is gzipped as before.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, exclude_paths: Iterable[str] = ()):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+        self.exclude_paths = tuple(exclude_paths)
+
+    def _is_stream(self, scope: Scope) -> bool:
+        if scope.get("path", "").startswith(self.exclude_paths):
+            return True
+        accept = dict(scope.get("headers") or []).get(b"accept", b"")
+        return b"text/event-stream" in accept
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and self._is_stream(scope):
+            await self.app(scope, receive, send)
+            return
+        await self.gzip(scope, receive, send)
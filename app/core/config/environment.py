@@ -24,9 +24,14 @@ class Environment:
             os.environ["AUTOGEN_USE_DOCKER"] = "False"  # Disable Docker globally for autogen
             
             # Log important configurations
-            logger.info(f"Environment initialized from: {env_path}")
-            logger.info(f"LLM_PROVIDER set to: {os.getenv('LLM_PROVIDER', 'not set')}")
-            logger.info(f"GOOGLE_APPLICATION_CREDENTIALS: {os.getenv('GOOGLE_APPLICATION_CREDENTIALS', 'not set')}")
+            logger.info("Environment initialized from: %s", env_path)
+            logger.info("LLM_PROVIDER set to: %s", os.getenv('LLM_PROVIDER', 'not set'))
+            logger.info("GOOGLE_APPLICATION_CREDENTIALS: %s", os.getenv('GOOGLE_APPLICATION_CREDENTIALS', 'not set'))
+            # Logged once here rather than on every tool call (excluding sensitive info)
+            logger.info(
+                "DQ Configuration: URL: %s, Username: %s, Tenant: %s",
+                os.getenv("DQ_URL"), os.getenv("DQ_USERNAME"), os.getenv("DQ_TENANT")
+            )
 
     @classmethod
     def get_required_vars(cls) -> Dict[str, str]:
@@ -44,12 +49,6 @@ class Environment:
             "LLM_PROVIDER": provider,
         }
         
-        # Log DQ configuration (excluding sensitive info)
-        logger.info("DQ Configuration:")
-        logger.info(f"URL: {required_vars['DQ_URL']}")
-        logger.info(f"Username: {required_vars['DQ_USERNAME']}")
-        logger.info(f"Tenant: {required_vars['DQ_TENANT']}")
-        
         # Add provider-specific requirements
         if provider == "google":
             required_vars.update({
@@ -31,7 +31,6 @@ class ModelConfigs:
             "project_id": project_id,
             "location": "us-central1",
             "google_application_credentials": "/Users/brian/key.json",
-            "api_rate_limit": 1,
             "safety_settings": ModelConfigs.get_safety_settings(),
             "temperature": 0.0,
             "max_tokens": 7000
@@ -1,7 +1,144 @@
+import os
+import copy
+import json
+import queue
+import atexit
+import random
 import logging
+import logging.handlers
+from typing import Any, Dict, Optional
+
+_DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Read once, main loads .env before importing this module
+_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "2000"))
+# Log arguments of these types can't change before the listener formats them
+_IMMUTABLE_ARG_TYPES = (str, bytes, int, float, complex, bool, type(None), BaseException)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class Truncated:
+    """Lazily truncated log argument, only rendered if the record is emitted"""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        self.value = value
+        self.limit = limit if limit is not None else _PAYLOAD_MAX_CHARS
+
+    def __str__(self) -> str:
+        text = str(self.value)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... [{len(text) - self.limit} more chars]"
+
+
+def truncate(value: Any, limit: Optional[int] = None) -> Truncated:
+    """Wrap a payload so it is truncated when (and only when) it is logged"""
+    return Truncated(value, limit)
+
+
+def log_payload(logger: logging.Logger, label: str, payload: Any) -> None:
+    """
+    Log a large payload (response bodies, chat histories) without paying for it on every call
+
+    Payloads are logged in full (truncated) at DEBUG. At INFO only a sample,
+    LOG_PAYLOAD_SAMPLE_RATE (default 0), is logged.
+
+    Args:
+        logger: Logger to use
+        label: Short description of the payload
+        payload: The payload, only converted to text if logged
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s: %s", label, truncate(payload))
+    elif logger.isEnabledFor(logging.INFO):
+        sample_rate = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0"))
+        if sample_rate > 0 and random.random() < sample_rate:
+            logger.info("%s (sampled): %s", label, truncate(payload))
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues records unformatted where that is safe
+
+    The stock prepare() formats the message (rendering lazy arguments and
+    the traceback) in the logging thread and clears args and exc_info. The
+    queue here stays in-process, nothing is pickled, so records whose
+    arguments are immutable are passed as is and the listener thread does
+    all formatting. Other arguments (payloads, Truncated wrappers) may be
+    changed by the caller before the listener gets to them, so those
+    messages are rendered here; the traceback is still left to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Shallow copy, like the stock handler, so other handlers see the original
+        record = copy.copy(record)
+        args = record.args.values() if isinstance(record.args, dict) else record.args or ()
+        if not all(isinstance(arg, _IMMUTABLE_ARG_TYPES) for arg in args):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def _apply_module_levels(levels: str) -> None:
+    """Apply LOG_LEVELS, e.g. "app.tools=DEBUG,autogen=WARNING,httpx=WARNING" """
+    for item in levels.split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
 
 def setup_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    ) 
\ No newline at end of file
+    """
+    Configure logging once for the process
+
+    Records go through a LazyQueueHandler, so request threads only enqueue;
+    a QueueListener thread formats (including lazy arguments and tracebacks)
+    and writes them. Configured with LOG_LEVEL,
+    LOG_LEVELS (per-module overrides) and LOG_FORMAT ("text" or "json").
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    if os.getenv("LOG_FORMAT", "text").lower() == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(_DEFAULT_FORMAT))
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(LazyQueueHandler(log_queue))
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    _apply_module_levels(os.getenv("LOG_LEVELS", ""))
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,243 @@
+import time
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+    )
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+    PROMETHEUS_AVAILABLE = True
+except ImportError:  # Metrics are optional, everything below becomes a no-op
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+
+class _NoopMetric:
+    """Stand-in for prometheus_client metrics when the package isn't installed"""
+
+    def labels(self, *args: Any, **kwargs: Any) -> "_NoopMetric":
+        return self
+
+    def observe(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def inc(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def set(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def set_function(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+def _histogram(name: str, documentation: str, labels: tuple = (), **kwargs: Any) -> Any:
+    return Histogram(name, documentation, labels, **kwargs) if PROMETHEUS_AVAILABLE else _NoopMetric()
+
+def _counter(name: str, documentation: str, labels: tuple = ()) -> Any:
+    return Counter(name, documentation, labels) if PROMETHEUS_AVAILABLE else _NoopMetric()
+
+def _gauge(name: str, documentation: str, labels: tuple = ()) -> Any:
+    return Gauge(name, documentation, labels) if PROMETHEUS_AVAILABLE else _NoopMetric()
+
+
+_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+
+CHAT_TURN_SECONDS = _histogram(
+    "chat_turn_seconds", "Chat turn latency", ("path",), buckets=_LATENCY_BUCKETS
+)
+CHAT_ROUNDS_PER_TURN = _histogram(
+    "chat_rounds_per_turn", "Group chat rounds (messages) per turn", buckets=(1, 2, 3, 4, 5, 6, 7, 8, 10, 15)
+)
+LLM_CALL_SECONDS = _histogram(
+    "llm_call_seconds", "LLM call latency per agent", ("agent", "provider", "model", "status"),
+    buckets=_LATENCY_BUCKETS
+)
+LLM_TOKENS = _counter(
+    "llm_tokens", "LLM tokens per agent", ("agent", "provider", "model", "type")
+)
+TOOL_CALL_SECONDS = _histogram(
+    "tool_call_seconds", "Tool call latency", ("tool", "status"), buckets=_LATENCY_BUCKETS
+)
+TOOL_CALLS = _counter(
+    "tool_calls", "Tool calls by status (error for failures returned as text)", ("tool", "status")
+)
+TOOL_PAYLOAD_CHARS = _histogram(
+    "tool_payload_chars", "Tool argument and result sizes in characters", ("tool", "direction"),
+    buckets=(100, 1000, 5000, 20000, 100000, 500000)
+)
+DQ_API_SECONDS = _histogram(
+    "dq_api_request_seconds", "DQ API request latency", ("endpoint",), buckets=_LATENCY_BUCKETS
+)
+DQ_API_REQUESTS = _counter(
+    "dq_api_requests", "DQ API requests by status (error for network failures)", ("endpoint", "status")
+)
+ACTIVE_SESSIONS = _gauge("active_sessions", "Active chat sessions")
+INFLIGHT_CHAT_REQUESTS = _gauge("inflight_chat_requests", "Chat requests currently being computed")
+
+
+@contextmanager
+def observe_chat_turn(path: str = "agents") -> Iterator[None]:
+    """Time a chat turn"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        CHAT_TURN_SECONDS.labels(path).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def observe_dq_request(endpoint: str) -> Iterator[Dict[str, str]]:
+    """
+    Time a DQ API request, the caller sets outcome["status"] from the response
+
+    Args:
+        endpoint: Short endpoint name (e.g. "signin", "run-job-json")
+    """
+    outcome = {"status": "error"}
+    started = time.perf_counter()
+    try:
+        yield outcome
+    finally:
+        DQ_API_SECONDS.labels(endpoint).observe(time.perf_counter() - started)
+        DQ_API_REQUESTS.labels(endpoint, outcome["status"]).inc()
+
+
+def instrument_llm_client(client: Any, agent_name: str) -> None:
+    """
+    Record per-agent latency and token usage for an autogen OpenAIWrapper
+
+    Wraps the provider clients' create() (after autogen's cache lookup), so
+    only calls that reach the provider are measured.
+
+    Args:
+        client: The agent's OpenAIWrapper (agent.client)
+        agent_name: Agent label for the metrics
+    """
+    if client is None:
+        return
+    for model_client, config in zip(client._clients, client._config_list):
+        if getattr(model_client, "_llm_instrumented", False):
+            continue
+        provider = config.get("api_type", "openai")
+        default_model = config.get("model", "")
+        create = model_client.create
+
+        def instrumented_create(params: Dict[str, Any], create=create, provider=provider,
+                                default_model=default_model) -> Any:
+            model = params.get("model") or default_model
+            started = time.perf_counter()
+            status = "error"
+            try:
+                response = create(params)
+                status = "ok"
+            finally:
+                LLM_CALL_SECONDS.labels(agent_name, provider, model, status).observe(time.perf_counter() - started)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                LLM_TOKENS.labels(agent_name, provider, model, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+                LLM_TOKENS.labels(agent_name, provider, model, "completion").inc(
+                    getattr(usage, "completion_tokens", 0) or 0
+                )
+            return response
+
+        model_client.create = instrumented_create
+        model_client._llm_instrumented = True
+
+
+class _StatsCollector:
+    """Expose the in-process stats counters (caches, scheduler, router, DQ token, DQ jobs) at scrape time"""
+
+    def describe(self):
+        # Nothing to describe up front, so registering doesn't call collect()
+        return []
+
+    def collect(self):
+        # Imported lazily, the agents package imports this module
+        from ..agents.llm_cache import get_response_cache
+        from ..agents.llm_scheduler import get_llm_scheduler
+        from ..agents.llm_router import get_router_stats
+        from ..agents.prompt_cache import prompt_cache_stats
+        from ..tools.dq_client import get_dq_client_stats
+        from ..tools.dq_dedup import get_job_deduper
+        from ..tools.dq_resilience import get_breaker_stats
+
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            cache_lookups = CounterMetricFamily(
+                "llm_response_cache_lookups", "LLM response cache lookups by result", labels=["result"]
+            )
+            stats = response_cache.get_stats()
+            for result in ("hits", "semantic_hits", "misses", "bypassed"):
+                cache_lookups.add_metric([result], stats[result])
+            yield cache_lookups
+            yield GaugeMetricFamily("llm_response_cache_entries", "LLM response cache entries", value=stats["entries"])
+
+        prompt_stats = prompt_cache_stats.get_stats()
+        prompt_tokens = CounterMetricFamily(
+            "llm_prompt_cache_tokens", "Prompt tokens by provider prompt cache status", labels=["type"]
+        )
+        prompt_tokens.add_metric(["cached"], prompt_stats["cached_tokens"])
+        prompt_tokens.add_metric(["uncached"], prompt_stats["uncached_tokens"])
+        prompt_tokens.add_metric(["cache_write"], prompt_stats["cache_write_tokens"])
+        yield prompt_tokens
+
+        queue_depth = GaugeMetricFamily("llm_scheduler_queue_depth", "LLM calls waiting for quota", labels=["lane"])
+        throttled = CounterMetricFamily("llm_scheduler_throttled", "Provider 429 responses", labels=["lane"])
+        wait_seconds = CounterMetricFamily("llm_scheduler_wait_seconds", "Time spent waiting for quota", labels=["lane"])
+        for lane, stats in get_llm_scheduler().get_stats().items():
+            queue_depth.add_metric([lane], stats["waiting"])
+            throttled.add_metric([lane], stats["throttled"])
+            wait_seconds.add_metric([lane], stats["wait_seconds"])
+        yield queue_depth
+        yield throttled
+        yield wait_seconds
+
+        endpoint_latency = GaugeMetricFamily(
+            "llm_endpoint_latency_ewma_seconds", "Routed LLM endpoint latency EWMA", labels=["endpoint"]
+        )
+        endpoint_errors = GaugeMetricFamily(
+            "llm_endpoint_error_rate", "Routed LLM endpoint error rate EWMA", labels=["endpoint"]
+        )
+        for endpoint, stats in get_router_stats().items():
+            if stats["latency_ewma"] is not None:
+                endpoint_latency.add_metric([endpoint], stats["latency_ewma"])
+            endpoint_errors.add_metric([endpoint], stats["error_rate"])
+        yield endpoint_latency
+        yield endpoint_errors
+
+        token_stats = get_dq_client_stats()
+        if token_stats is not None:
+            yield CounterMetricFamily("dq_token_sign_ins", "DQ API sign-ins", value=token_stats["sign_ins"])
+            yield CounterMetricFamily("dq_token_cache_hits", "DQ API calls served a cached token", value=token_stats["hits"])
+
+        dedup_stats = get_job_deduper().get_stats()
+        submissions = CounterMetricFamily("dq_job_submissions", "DQ job submissions by outcome", labels=["result"])
+        submissions.add_metric(["submitted"], dedup_stats["submitted"])
+        submissions.add_metric(["deduplicated"], dedup_stats["deduplicated"])
+        yield submissions
+
+        circuit_open = GaugeMetricFamily("dq_circuit_open", "DQ circuit breaker open (1) or closed (0)", labels=["target"])
+        circuit_rejected = CounterMetricFamily(
+            "dq_circuit_rejected", "DQ calls failed fast by an open circuit", labels=["target"]
+        )
+        for target, stats in get_breaker_stats().items():
+            circuit_open.add_metric([target], 0 if stats["state"] == "closed" else 1)
+            circuit_rejected.add_metric([target], stats["rejected"])
+        yield circuit_open
+        yield circuit_rejected
+
+
+if PROMETHEUS_AVAILABLE:
+    REGISTRY.register(_StatsCollector())
+
+
+def render_metrics() -> bytes:
+    """Render all metrics in the Prometheus text format"""
+    if not PROMETHEUS_AVAILABLE:
+        return b"# prometheus_client is not installed\n"
+    return generate_latest()
@@ -0,0 +1,79 @@
+import os
+import json
+import logging
+from typing import Any, Dict, List, Optional
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response serialized once, without response_model validation"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def select_messages(result: Dict[str, Any], last_seen_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Messages of a chat result the client hasn't seen
+
+    Args:
+        result: Result from ChatService.process_chat (possibly replayed or shared)
+        last_seen_id: Last message id the client had, None for the recent window
+
+    Returns:
+        List[Dict[str, Any]]: Messages newer than last_seen_id, as of the result's turn
+    """
+    if last_seen_id is None:
+        return result["chat_history"]
+    return [m for m in result.get("transcript") or [] if m["id"] > last_seen_id]
+
+
+def build_chat_payload(result: Dict[str, Any], messages: List[Dict[str, Any]],
+                       response_mode: Optional[str] = None, last_seen_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Shape a chat result for the client
+
+    Args:
+        result: Result from ChatService.process_chat
+        messages: Messages to return (already filtered by last_seen_id)
+        response_mode: "lean" (version 2) lists messages once, "full" keeps the version 1
+            ChatResponse layout, which repeats them three times. None uses CHAT_RESPONSE_MODE
+            (default "lean")
+        last_seen_id: Last message id the client had, echoed when nothing is new
+
+    Returns:
+        Dict[str, Any]: Payload for FastJSONResponse
+    """
+    if response_mode is None:
+        response_mode = os.getenv("CHAT_RESPONSE_MODE", "lean").lower()
+    if response_mode != "full":
+        return {
+            "version": 2,
+            "session_id": result.get("session_id"),
+            "messages": messages,
+            "last_id": messages[-1]["id"] if messages else last_seen_id,
+            "metadata": result.get("metadata") or {},
+            "error": result.get("error", False),
+        }
+
+    # Version 1 layout for clients that opt out. The same list object is referenced
+    # in each place, it is not copied but is encoded three times
+    payload = {key: value for key, value in result.items() if key != "transcript"}
+    payload["response"] = dict(result.get("response") or {}, content=messages, chat_history=messages)
+    payload["chat_history"] = messages
+    return payload
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Literal, Optional
 
 class Message(BaseModel):
     """Model for a chat message"""
@@ -19,6 +19,20 @@ class ChatRequest(BaseModel):
     message: str
     session_id: str = "default"
     metadata: Dict[str, Any] = {}
+    # Only return messages with an id greater than this
+    last_seen_id: Optional[int] = None
+    # "lean" (version 2, messages listed once) or "full" (version 1 response/chat_history
+    # layout), defaults to CHAT_RESPONSE_MODE
+    response_mode: Optional[Literal["full", "lean"]] = None
+
+class LeanChatResponse(BaseModel):
+    """Chat response listing each message once"""
+    version: int = 2
+    session_id: str
+    messages: List[Message] = []
+    last_id: Optional[int] = None
+    metadata: Dict[str, Any] = {}
+    error: bool = False
 
 class ChatResponse(BaseModel):
     response: ResponseContent
@@ -17,4 +17,13 @@ class ClearRequest(BaseModel):
 
 class ClearResponse(BaseModel):
     success: bool
-    message: str 
\ No newline at end of file
+    message: str 
+
+class DQJobItem(BaseModel):
+    """One table to run a DQ job for (see run_dq_jobs)"""
+    dataset: str
+    query: str
+    connection_name: str
+    schema_name: str
+    # Submit even if the same job was submitted moments ago
+    rerun: bool = False
@@ -0,0 +1,207 @@
+import json
+import re
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from .message_redact import MessageRedact
+
+try:
+    import tiktoken
+except ImportError:  # Fall back to a character heuristic
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PREFIX = "Summary of earlier conversation:"
+
+# Catalog entities referenced in SQL predicates, tool arguments and results
+_ENTITY_PATTERNS = {
+    "connections": re.compile(
+        r"connection_name\)?\\*[\"']?\s*(?:[:=]|like)\s*(?:lower\()?\s*\\*[\"']%?([A-Za-z0-9_.\-]+)", re.IGNORECASE
+    ),
+    "schemas": re.compile(
+        r"schema_name\)?\\*[\"']?\s*(?:[:=]|like)\s*(?:lower\()?\s*\\*[\"']%?([A-Za-z0-9_.\-]+)", re.IGNORECASE
+    ),
+    "tables": re.compile(
+        r"(?:table_name|dataset)\)?\\*[\"']?\s*(?:[:=]|like)\s*(?:lower\()?\s*\\*[\"']%?([A-Za-z0-9_.\-]+)", re.IGNORECASE
+    ),
+}
+_CATALOG_MARKERS = ("connection_name", "schema_name", "table_name", "run_sql_statement", "run_dq_job")
+
+
+class ContextBuilder:
+    """Build a token-budgeted chat history with a rolling summary of older messages"""
+
+    def __init__(self, token_budget: int, summary_budget: int = 300,
+                 message_char_limit: int = 1000, max_cached_messages: int = 1024):
+        """
+        Initialize the context builder
+
+        Args:
+            token_budget: Total tokens available for history, including the summary
+            summary_budget: Tokens reserved for the rolling summary
+            message_char_limit: Characters per message counted (matches MessageRedact truncation)
+            max_cached_messages: Size of the per-message token count cache
+        """
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.message_char_limit = message_char_limit
+        self._max_cached_messages = max_cached_messages
+        self._token_counts: "OrderedDict[Tuple, int]" = OrderedDict()
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning(f"Could not load tiktoken encoding, using estimate: {str(e)}")
+
+        # Rolling summary state, folded in as messages fall out of the budget
+        self._folded_keys = set()
+        self._entities: Dict[str, Dict[str, None]] = {name: {} for name in _ENTITY_PATTERNS}
+        self._questions: List[str] = []
+        self._summary_message: Optional[Dict] = None
+
+    @staticmethod
+    def is_summary_message(message: Dict) -> bool:
+        """Check whether a message is a summary produced by this builder"""
+        content = message.get("content")
+        return isinstance(content, str) and content.startswith(SUMMARY_PREFIX)
+
+    def _message_text(self, message: Dict) -> str:
+        """Text that will be sent to the model for a message"""
+        parts = []
+        if isinstance(message.get("content"), str):
+            parts.append(message["content"])
+        elif isinstance(message.get("content"), list):
+            parts.extend(item.get("text", "") for item in message["content"] if isinstance(item, dict))
+        for call in message.get("tool_calls") or []:
+            function = call.get("function", {})
+            parts.append(f"{function.get('name', '')} {json.dumps(function.get('arguments', ''))}")
+        for response in message.get("tool_responses") or []:
+            parts.append(json.dumps(response.get("content", "")))
+        return "\n".join(parts)
+
+    def _count_text(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return len(text) // 4 + 1
+
+    def count_tokens(self, message: Dict) -> int:
+        """Count tokens for a message, cached per message identity"""
+        key = MessageRedact.message_key(message)
+        if key is not None and key in self._token_counts:
+            self._token_counts.move_to_end(key)
+            return self._token_counts[key]
+
+        # Per-message overhead for role/name framing
+        tokens = self._count_text(self._message_text(message)[:self.message_char_limit]) + 4
+
+        if key is not None:
+            self._token_counts[key] = tokens
+            if len(self._token_counts) > self._max_cached_messages:
+                self._token_counts.popitem(last=False)
+        return tokens
+
+    def _has_catalog_context(self, message: Dict) -> bool:
+        text = self._message_text(message)
+        return any(marker in text for marker in _CATALOG_MARKERS)
+
+    def _fold(self, messages: List[Dict]) -> bool:
+        """Fold dropped messages into the rolling summary state"""
+        changed = False
+        for message in messages:
+            key = MessageRedact.message_key(message)
+            if key is not None and key in self._folded_keys:
+                continue
+            if key is not None:
+                self._folded_keys.add(key)
+            changed = True
+
+            text = self._message_text(message)
+            for name, pattern in _ENTITY_PATTERNS.items():
+                for value in pattern.findall(text):
+                    self._entities[name].pop(value, None)
+                    self._entities[name][value] = None
+
+            is_tool_context = (
+                "tool_calls" in message or "tool_responses" in message
+                or text.startswith("Context from previous tool")
+            )
+            if message.get("name") == "Admin_User" and text and not is_tool_context \
+                    and not text.startswith("Thank you. I will review"):
+                self._questions.append(" ".join(text.split())[:120])
+        self._questions = self._questions[-20:]
+        return changed
+
+    def _render_summary(self) -> Optional[Dict]:
+        """Render the summary message, trimming oldest items to fit the budget"""
+        questions = list(self._questions)
+        entities = {name: list(values) for name, values in self._entities.items()}
+        if not questions and not any(entities.values()):
+            return None
+
+        while True:
+            lines = [SUMMARY_PREFIX]
+            if questions:
+                lines.append("Earlier requests: " + " | ".join(questions))
+            for name, values in entities.items():
+                if values:
+                    lines.append(f"Referenced {name}: " + ", ".join(values))
+            content = "\n".join(lines)
+            if self._count_text(content) <= self.summary_budget:
+                break
+            # Drop the oldest question first, then the oldest entity
+            if questions:
+                questions.pop(0)
+            else:
+                longest = max(entities, key=lambda name: len(entities[name]))
+                if not entities[longest]:
+                    break
+                entities[longest].pop(0)
+
+        return {"content": content, "role": "user", "name": "Admin_User"}
+
+    def build(self, messages: List[Dict]) -> Tuple[List[Dict], Optional[Dict]]:
+        """
+        Pack the most relevant recent messages into the token budget
+
+        Args:
+            messages: Chat history, oldest first
+
+        Returns:
+            Tuple[List[Dict], Optional[Dict]]: Kept messages in order and the
+            rolling summary message (None if nothing has been summarized)
+        """
+        messages = [m for m in messages if not self.is_summary_message(m)]
+        counts = [self.count_tokens(m) for m in messages]
+        remaining = self.token_budget
+        if self._summary_message or sum(counts) > self.token_budget:
+            remaining -= self.summary_budget
+
+        keep = set()
+        # Pin the latest catalog (connection/schema/table) context if it fits
+        for index in range(len(messages) - 1, -1, -1):
+            if self._has_catalog_context(messages[index]):
+                if counts[index] <= remaining:
+                    keep.add(index)
+                    remaining -= counts[index]
+                break
+
+        # Fill the remainder newest first, stopping at the first message that doesn't fit
+        for index in range(len(messages) - 1, -1, -1):
+            if index in keep:
+                continue
+            if counts[index] > remaining:
+                break
+            keep.add(index)
+            remaining -= counts[index]
+
+        kept = [m for index, m in enumerate(messages) if index in keep]
+        dropped = [m for index, m in enumerate(messages) if index not in keep]
+
+        # Only re-render the summary when the summarized span changed
+        if dropped and self._fold(dropped):
+            self._summary_message = self._render_summary()
+            logger.debug("Summarized %d messages outside the token budget", len(dropped))
+
+        return kept, self._summary_message
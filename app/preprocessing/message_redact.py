@@ -1,97 +1,152 @@
 import json
 import copy
 import re
-from typing import Dict, List, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 class MessageRedact:
     """Class for cleaning and transforming chat messages"""
-    
-    def __init__(self):
-        self._content_wrapper_pattern = r"~~~.*?~~~"
+
+    _content_wrapper_regex = re.compile(r"~~~.*?~~~", re.DOTALL)
+
+    def __init__(self, max_cached_messages: int = 512, head_char_limit: int = 600,
+                 char_limit: int = 1000):
+        self._head_char_limit = head_char_limit
+        self._char_limit = char_limit
+        self._content_wrapper_pattern = self._content_wrapper_regex.pattern
         self._replacement_string = "TRUNCATED_MESSAGE"
+        # Transformed messages keyed by message identity, so each turn only
+        # transforms messages appended since the previous turn
+        self._cache: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._max_cached_messages = max_cached_messages
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def __call__(self, message: str) -> str:
         """
         Clean and transform a single message string
-        
+
         Args:
             message (str): The input message to clean
-            
+
         Returns:
             str: The cleaned message
         """
         if not message or not isinstance(message, str):
             return ""
-        
-        # Truncate long messages
-        if len(message) > 1000:
-            message = message[:1000]
-            
-        # Replace content between ~~~ markers
-        cleaned = re.sub(self._content_wrapper_pattern, 
-                        self._replacement_string, 
-                        message, 
-                        flags=re.DOTALL)
-        
+
+        # Truncate long messages and replace content between ~~~ markers
+        cleaned = self._content_wrapper_regex.sub(self._replacement_string, message[:1000])
+
         return cleaned.strip()
 
+    @staticmethod
+    def message_key(message: Dict) -> Optional[Tuple]:
+        """
+        Build a stable identity for a message dictionary
+
+        String hashes are cached on the string object, so keying repeated
+        turns on the same content is constant time per message.
+
+        Args:
+            message (Dict): Message dictionary
+
+        Returns:
+            Optional[Tuple]: Hashable key, or None if the message can't be keyed
+        """
+        content = message.get("content")
+        if content is not None and not isinstance(content, str):
+            return None
+
+        tool_call_ids = tuple(
+            call.get("id") or json.dumps(call.get("function", {}), sort_keys=True)
+            for call in message.get("tool_calls") or []
+        )
+        tool_response_ids = tuple(
+            response.get("tool_call_id") or str(response.get("content"))
+            for response in message.get("tool_responses") or []
+        )
+        return (
+            message.get("role"),
+            message.get("name"),
+            content,
+            tool_call_ids,
+            tool_response_ids,
+        )
+
+    def _transform_message(self, message: Dict) -> Dict:
+        """Flatten tool calls/responses and redact list content for one message"""
+        m = copy.deepcopy(message)
+
+        if "tool_calls" in m:
+            parts = ["Context from previous tool calls: "]
+            for i in m.pop("tool_calls"):
+                parts.append("\n function name: ")
+                parts.append(i['function']['name'])
+                parts.append("\n function arguments: ")
+                parts.append(json.dumps(i['function']['arguments']))
+            m['role'] = "user"
+            m["content"] = "".join(parts)
+
+        if "tool_responses" in m:
+            parts = ["Context from previous tool response:"]
+            parts.extend(json.dumps(j['content']) for j in m.pop("tool_responses"))
+            m["content"] = "".join(parts)
+            m['role'] = "user"
+
+        if isinstance(m.get("content"), list):
+            for item in m["content"]:
+                if item["type"] == "text":
+                    item["text"] = self._content_wrapper_regex.sub(
+                        self._replacement_string, item["text"]
+                    )
+
+        return m
+
+    def _get_transformed(self, message: Dict) -> Dict:
+        """Return the memoized transform of a message, computing it if new"""
+        key = self.message_key(message)
+        if key is None:
+            self.cache_misses += 1
+            return self._transform_message(message)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+        else:
+            self.cache_misses += 1
+            cached = self._transform_message(message)
+            self._cache[key] = cached
+            if len(self._cache) > self._max_cached_messages:
+                self._cache.popitem(last=False)
+
+        # Shallow copy, callers (e.g. GroupChat.append) mutate top-level keys
+        return dict(cached)
+
     def apply_transform(self, messages: List[Dict]) -> List[Dict]:
         """
         Transform a list of message dictionaries
-        
+
         Args:
             messages (List[Dict]): List of message dictionaries to transform
-            
+
         Returns:
             List[Dict]: Transformed messages
         """
-        temp_messages = copy.deepcopy(messages)
-
-        total_tool_calls = 0
-        total_tool_responses = 0
+        temp_messages = []
         counter = 0
-        
-        for m in temp_messages:
-            if "tool_calls" in m:
-                total_tool_calls += len(m["tool_calls"])
-                content_string = "Context from previous tool calls: "
-                
-                for i in m["tool_calls"]:
-                    content_string += "\n function name: " + i['function']['name']
-                    content_string += "\n function arguments: " + json.dumps(i['function']['arguments'])
-                
-                m.pop("tool_calls")
-                m['role'] = "user"
-                m["content"] = content_string
-
-            if "tool_responses" in m:
-                total_tool_responses += len(m["tool_responses"])
-                content_string = "Context from previous tool response:"
-                
-                for j in m["tool_responses"]:
-                    content_string += json.dumps(j['content'])
-                    
-                m["content"] = content_string
-                m['role'] = "user"
-                m.pop("tool_responses")
-            
-            # Handle message content
-            if isinstance(m["content"], str):
+
+        for message in messages:
+            m = self._get_transformed(message)
+
+            # Handle message content, truncation depends on window position
+            if isinstance(m.get("content"), str):
                 counter += 1
-                if counter < 5:
-                    m["content"] = m["content"][:600]
-                else:
-                    m["content"] = m["content"][:1000]
-            
-            elif isinstance(m["content"], list):
-                for item in m["content"]:
-                    if item["type"] == "text":
-                        item["text"] = re.sub(
-                            self._content_wrapper_pattern, 
-                            self._replacement_string, 
-                            item["text"], 
-                            flags=re.DOTALL
-                        )
+                limit = self._head_char_limit if counter < 5 else self._char_limit
+                m["content"] = m["content"][:limit]
+
+            temp_messages.append(m)
 
         # Add final message
         temp_messages.append({
@@ -99,10 +154,10 @@ class MessageRedact:
             'role': 'user',
             'name': 'Admin_User'
         })
-        
+
         return temp_messages
 
-    def get_logs(self, pre_transform_messages: List[Dict], 
+    def get_logs(self, pre_transform_messages: List[Dict],
                 post_transform_messages: List[Dict]) -> Tuple[str, bool]:
         """Get logs of transformation changes"""
         keys_redacted = self._count_redacted(post_transform_messages) - \
@@ -123,4 +178,4 @@ class MessageRedact:
                     if isinstance(item, dict) and "text" in item:
                         if self._replacement_string in item["text"]:
                             count += 1
-        return count 
\ No newline at end of file
+        return count
@@ -6,6 +6,7 @@ from ..agents.agent_factory import create_group_chat_agents
 from ..chat.chat_manager import ChatManager
 from ..preprocessing.assistants import PreprocessingAssistants
 from ..agents.agent_config import ModelConfig
+from ..core.logging import truncate
 import traceback
 import json
 import os
@@ -65,34 +66,34 @@ class ChatService:
     async def process_chat(self, message: str, session_id: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Process a chat message"""
         try:
-            logger.info(f"Processing chat message: {message}")
+            logger.info("Processing chat message: %s", truncate(message, 200))
             result = await self.chat_manager.group_chat(
                 message=message,
                 agents=self.agents,
                 preprocessing=self.preprocessing
             )
             
-            # Log the chat history
-            logger.debug(f"Chat history from result: {result.chat_history}")
-            
-            # Create response using the chat history directly
-            response = ChatResponse(
-                response=ResponseContent(
-                    content=result.chat_history,  # Use chat history directly
-                    role="assistant",
-                    chat_history=result.chat_history
-                ),
-                session_id=session_id,
-                metadata=metadata,
-                chat_history=result.chat_history,
-                error=False,
-                cleaned_message=True
-            )
-            
-            # Log and return
-            response_dict = response.model_dump()
-            logger.debug(f"Final response: {response_dict}")
-            return response_dict
+            logger.debug("Chat history from result: %d messages", len(result.chat_history))
+
+            # Per-turn tool timings travel with the request metadata
+            if result.metadata and "tool_timings" in result.metadata:
+                metadata = dict(metadata or {}, tool_timings=result.metadata["tool_timings"])
+
+            # Plain dict in the ChatResponse layout, the history list is shared
+            # rather than copied and the route serializes it once
+            return {
+                "response": {
+                    "content": result.chat_history,
+                    "role": "assistant",
+                    "chat_history": result.chat_history
+                },
+                "session_id": session_id,
+                "metadata": metadata,
+                "chat_history": result.chat_history,
+                "transcript": result.transcript,
+                "error": False,
+                "cleaned_message": True
+            }
 
         except Exception as e:
             logger.error(f"Error processing chat: {str(e)}")
@@ -106,5 +107,6 @@ class ChatService:
                 "session_id": session_id,
                 "metadata": metadata,
                 "chat_history": [],
+                "transcript": [],
                 "error": True
             } 
\ No newline at end of file
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class RequestCoalescer:
+    """
+    Single-flight coalescing for chat requests
+
+    Identical requests (same session and normalized message) that arrive while
+    one is in flight attach to it and receive the same result. Completed
+    results are also kept per idempotency key so client retries are replayed
+    instead of recomputed.
+    """
+
+    def __init__(self, idempotency_ttl: float = 600.0, max_idempotency_entries: int = 1024):
+        """
+        Initialize the coalescer
+
+        Args:
+            idempotency_ttl: Seconds a completed result is replayed for its idempotency key
+            max_idempotency_entries: Maximum completed results kept
+        """
+        self.idempotency_ttl = idempotency_ttl
+        self.max_idempotency_entries = max_idempotency_entries
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+        self._inflight_by_idempotency_key: Dict[Tuple, asyncio.Task] = {}
+        self._completed: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self.coalesced = 0
+        self.replayed = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get in-flight and coalescing counters"""
+        return {
+            "in_flight": len(self._inflight),
+            "coalesced": self.coalesced,
+            "replayed": self.replayed,
+        }
+
+    @staticmethod
+    def normalize(message: str) -> str:
+        """Normalize a message for duplicate detection"""
+        return " ".join((message or "").lower().split())
+
+    def _get_completed(self, key: Tuple) -> Optional[Any]:
+        entry = self._completed.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._completed[key]
+            return None
+        return result
+
+    def _store_completed(self, key: Tuple, result: Any):
+        self._completed[key] = (time.monotonic() + self.idempotency_ttl, result)
+        self._completed.move_to_end(key)
+        while len(self._completed) > self.max_idempotency_entries:
+            self._completed.popitem(last=False)
+
+    async def run(self, session_id: str, message: str, factory: Callable[[], Awaitable[Any]],
+                  idempotency_key: Optional[str] = None) -> Any:
+        """
+        Run a chat request, attaching to an identical in-flight request if any
+
+        Args:
+            session_id: Chat session id
+            message: User message
+            factory: Coroutine factory that computes the result
+            idempotency_key: Optional client-supplied key for retries
+
+        Returns:
+            Any: The (possibly shared) result
+        """
+        idempotency_scope = (session_id, idempotency_key) if idempotency_key else None
+        if idempotency_scope is not None:
+            result = self._get_completed(idempotency_scope)
+            if result is not None:
+                self.replayed += 1
+                logger.info(f"Replaying result for idempotency key {idempotency_key}")
+                return result
+            task = self._inflight_by_idempotency_key.get(idempotency_scope)
+            if task is not None:
+                self.coalesced += 1
+                return await asyncio.shield(task)
+
+        flight_key = (session_id, self.normalize(message))
+        task = self._inflight.get(flight_key)
+        if task is not None:
+            self.coalesced += 1
+            logger.info(f"Coalescing duplicate chat request for session {session_id}")
+        else:
+            task = asyncio.ensure_future(factory())
+            self._inflight[flight_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(flight_key, None))
+
+        if idempotency_scope is not None:
+            self._inflight_by_idempotency_key[idempotency_scope] = task
+
+        try:
+            # Shielded so a disconnecting client doesn't cancel the shared computation
+            result = await asyncio.shield(task)
+        finally:
+            if idempotency_scope is not None:
+                self._inflight_by_idempotency_key.pop(idempotency_scope, None)
+
+        # Error responses are not replayed, a retry should recompute them
+        is_error = isinstance(result, dict) and result.get("error")
+        if idempotency_scope is not None and not is_error:
+            self._store_completed(idempotency_scope, result)
+        return result
@@ -1,7 +1,8 @@
-from .dq_tools import run_dq_job, get_job_status, run_sql_statement
+from .dq_tools import run_dq_job, run_dq_jobs, get_job_status, run_sql_statement
 
 __all__ = [
     'run_dq_job',
+    'run_dq_jobs',
     'get_job_status', 
     'run_sql_statement'
 ] 
\ No newline at end of file
@@ -1,19 +1,212 @@
+import io
+import os
+import inspect
+import json
+import time
+import pstats
+import random
+import cProfile
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import wraps
-from typing import Callable, Any
+from typing import Callable, Any, Dict, Iterator, List, Optional
+from ..core.logging import log_payload
+from ..core.metrics import TOOL_CALL_SECONDS, TOOL_CALLS, TOOL_PAYLOAD_CHARS
 
-def register_tool(executor: Any = None, assistant: Any = None, description: str = None):
-    """Decorator to register a tool with both executor and assistant"""
-    def decorator(func: Callable):
+logger = logging.getLogger(__name__)
+
+# Tools report failures as strings rather than raising
+_ERROR_PREFIXES = ("Error", "Unable", "Job failed")
+
+# Tool calls made during the current chat turn, see track_tool_calls()
+_turn_tool_calls: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("turn_tool_calls", default=None)
+
+
+@contextmanager
+def track_tool_calls() -> Iterator[List[Dict[str, Any]]]:
+    """
+    Collect a record for every tool call made in this context
+
+    The list itself is shared, so calls made in worker threads started with
+    asyncio.to_thread (which copies the context) are collected too.
+    """
+    calls: List[Dict[str, Any]] = []
+    token = _turn_tool_calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _turn_tool_calls.reset(token)
+
+
+def summarize_tool_calls(calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Per-tool timing summary for a chat turn
+
+    Args:
+        calls: Records collected by track_tool_calls()
+
+    Returns:
+        Dict[str, Any]: Totals and per-tool calls, errors and milliseconds
+    """
+    tools: Dict[str, Dict[str, Any]] = {}
+    for call in calls:
+        summary = tools.setdefault(call["tool"], {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+        summary["calls"] += 1
+        summary["errors"] += call["status"] != "ok"
+        summary["total_ms"] = round(summary["total_ms"] + call["ms"], 1)
+        summary["max_ms"] = max(summary["max_ms"], call["ms"])
+    return {
+        "calls": len(calls),
+        "total_ms": round(sum(call["ms"] for call in calls), 1),
+        "tools": tools,
+    }
+
+
+def _payload_size(value: Any) -> int:
+    """Approximate size of a tool argument or result in characters"""
+    if isinstance(value, str):
+        return len(value)
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(str(value))
+
+
+def _start_profiler() -> Optional[cProfile.Profile]:
+    """Profile a sample of tool calls, TOOL_PROFILE_SAMPLE_RATE (default 0)"""
+    sample_rate = float(os.getenv("TOOL_PROFILE_SAMPLE_RATE", "0"))
+    if sample_rate <= 0 or random.random() >= sample_rate:
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # Another profiler is already active in this thread
+        return None
+    return profiler
+
+
+def _report_profile(profiler: cProfile.Profile, tool_name: str, elapsed: float) -> None:
+    """Log the top functions of a sampled call slower than TOOL_PROFILE_SLOW_MS"""
+    if elapsed * 1000 < float(os.getenv("TOOL_PROFILE_SLOW_MS", "1000")):
+        return
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(15)
+    logger.info("Slow tool call %s took %.0f ms, profile follows", tool_name, elapsed * 1000)
+    logger.info("%s", output.getvalue())
+
+
+def _record_call(tool_name: str, status: str, elapsed: float, input_size: int, result: Any) -> None:
+    """Record one tool call in the metrics and the current turn's timings"""
+    output_size = _payload_size(result) if result is not None else 0
+
+    TOOL_CALL_SECONDS.labels(tool_name, status).observe(elapsed)
+    TOOL_CALLS.labels(tool_name, status).inc()
+    TOOL_PAYLOAD_CHARS.labels(tool_name, "input").observe(input_size)
+    TOOL_PAYLOAD_CHARS.labels(tool_name, "output").observe(output_size)
+
+    calls = _turn_tool_calls.get()
+    if calls is not None:
+        calls.append({
+            "tool": tool_name,
+            "status": status,
+            "ms": round(elapsed * 1000, 1),
+            "input_size": input_size,
+            "output_size": output_size,
+        })
+    logger.debug(
+        "Tool %s %s in %.1f ms (input %d, output %d chars)",
+        tool_name, status, elapsed * 1000, input_size, output_size
+    )
+    if status != "ok" and result is not None:
+        log_payload(logger, f"Tool {tool_name} error result", result)
+
+
+def _result_status(result: Any) -> str:
+    return "error" if isinstance(result, str) and result.startswith(_ERROR_PREFIXES) else "ok"
+
+
+def instrument_tool(func: Callable, name: Optional[str] = None) -> Callable:
+    """
+    Record wall time, payload sizes, errors and call counts for an agent tool
+
+    The wrapper keeps the tool's name and signature, autogen builds the tool
+    schema from them. Failures returned as "Error ..." strings count as errors
+    too, not only exceptions. Async tools get an async wrapper (and aren't
+    profiled, cProfile can't follow a coroutine across awaits).
+
+    Args:
+        func: Tool function
+        name: Tool name for the metrics, defaults to the function name
+
+    Returns:
+        Callable: Instrumented tool
+    """
+    tool_name = name or func.__name__
+
+    if inspect.iscoroutinefunction(func):
         @wraps(func)
-        def wrapper(*args, **kwargs):
-            return func(*args, **kwargs)
-            
+        async def async_wrapper(*args, **kwargs):
+            input_size = _payload_size(kwargs) + (_payload_size(args) if args else 0)
+            started = time.perf_counter()
+            status = "exception"
+            result = None
+            try:
+                result = await func(*args, **kwargs)
+                status = _result_status(result)
+                return result
+            except Exception as e:
+                logger.warning("Tool %s raised %s: %s", tool_name, type(e).__name__, e)
+                raise
+            finally:
+                _record_call(tool_name, status, time.perf_counter() - started, input_size, result)
+
+        async_wrapper._tool_instrumented = True
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        input_size = _payload_size(kwargs) + (_payload_size(args) if args else 0)
+        profiler = _start_profiler()
+        started = time.perf_counter()
+        status = "exception"
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            status = _result_status(result)
+            return result
+        except Exception as e:
+            logger.warning("Tool %s raised %s: %s", tool_name, type(e).__name__, e)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                _report_profile(profiler, tool_name, elapsed)
+            _record_call(tool_name, status, elapsed, input_size, result)
+
+    wrapper._tool_instrumented = True
+    return wrapper
+
+
+def register_tool(executor: Any = None, assistant: Any = None, description: str = None,
+                  executor_description: str = None, name: str = None):
+    """
+    Decorator to register an instrumented tool with both executor and assistant
+
+    Args:
+        executor: Agent that executes the tool
+        assistant: Agent that suggests the tool
+        description: Tool description for the assistant
+        executor_description: Tool description for the executor (defaults to the docstring)
+        name: Tool name, defaults to the function name (e.g. to register an async variant)
+    """
+    def decorator(func: Callable):
+        wrapper = func if getattr(func, "_tool_instrumented", False) else instrument_tool(func, name)
         if executor:
-            executor.register_for_execution()(wrapper)
-            executor.register_for_llm()(wrapper)
-            
+            executor.register_for_execution(name=name)(wrapper)
+            executor.register_for_llm(name=name, description=executor_description)(wrapper)
         if assistant and description:
-            assistant.register_for_llm(description=description)(wrapper)
-            
+            assistant.register_for_llm(name=name, description=description)(wrapper)
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator
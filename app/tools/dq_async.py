@@ -0,0 +1,347 @@
+import os
+import time
+import asyncio
+import logging
+import weakref
+import httpx
+from typing import Annotated, Any, Dict, List, Optional, Tuple
+from ..core.config.environment import Environment
+from ..core.logging import truncate
+from ..core.metrics import observe_dq_request
+from .dq_auth import decode_expiry
+from .dq_resilience import RETRY_STATUSES, RetryPolicy, get_circuit_breaker, is_service_failure
+from .dq_simulator import SIMULATOR_BASE_URL, SimulatorAsyncTransport, get_dq_simulator, is_simulated
+from .dq_tools import (
+    _validate_job, _job_params, _job_result, _parse_job_items, _validate_job_items,
+    _batch_outcome, _format_batch, _track_job, _format_job_history, current_job_history, job_page_params, job_page_rows
+)
+from .dq_watcher import get_job_watcher
+from .dq_dedup import get_job_deduper
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDQClient:
+    """
+    asyncio DQ API client on one pooled httpx.AsyncClient
+
+    Same operations as DQClient, but waiting on the network doesn't hold a
+    thread, so one event loop can keep many DQ requests in flight. A client
+    belongs to the event loop it was created on. A sim:// base URL answers
+    from the in-process DQ simulator.
+    """
+
+    def __init__(self, base_url: str, username: str, password: str, tenant: str,
+                 max_connections: int = 100, connect_timeout: float = 5.0, read_timeout: float = 30.0,
+                 verify: bool = False, transport: Optional[httpx.AsyncBaseTransport] = None):
+        if transport is None and is_simulated(base_url):
+            base_url, transport = SIMULATOR_BASE_URL, SimulatorAsyncTransport(get_dq_simulator())
+        self.username = username
+        self.password = password
+        self.tenant = tenant
+        self.refresh_margin = float(os.getenv("DQ_TOKEN_REFRESH_MARGIN", "60"))
+        self.default_ttl = float(os.getenv("DQ_TOKEN_TTL", "600"))
+        self.retry = RetryPolicy.from_env()
+        self.breaker = get_circuit_breaker(base_url.rstrip("/"))
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            verify=verify,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={'Accept': 'application/json', 'Accept-Language': 'en-US,en;q=0.9'},
+            transport=transport,
+        )
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.sign_ins = 0
+
+    async def _send(self, method: str, path: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+        """Send with DQClient's retry and circuit breaker rules (the breaker is shared with it)"""
+        retries = self.retry.retries_for(method, endpoint)
+        for attempt in range(retries + 1):
+            self.breaker.before_call()
+            try:
+                with observe_dq_request(endpoint) as outcome:
+                    response = await self._client.request(method, path, **kwargs)
+                    outcome["status"] = str(response.status_code)
+            except httpx.HTTPError as e:
+                self.breaker.record_failure()
+                if attempt >= retries:
+                    raise
+                logger.warning("DQ %s failed (%s), retry %d of %d", endpoint, e, attempt + 1, retries)
+            else:
+                if is_service_failure(response.status_code):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    return response
+                logger.warning("DQ %s returned %s, retry %d of %d", endpoint, response.status_code, attempt + 1, retries)
+            await asyncio.sleep(self.retry.delay(attempt))
+
+    async def sign_in(self) -> str:
+        """Get a new API token for the DQ service"""
+        payload = {'username': self.username, 'password': self.password, 'iss': self.tenant}
+        try:
+            response = await self._send("POST", "/v3/auth/signin", "signin", json=payload)
+        except httpx.HTTPError as e:
+            error_msg = f"Network error during auth: {str(e)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if response.status_code == 401:
+            error_msg = "Authentication failed: Invalid credentials or tenant"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        if response.status_code != 200:
+            error_msg = f"Auth API returned status code {response.status_code}"
+            logger.error(error_msg)
+            logger.error("Response content: %s", truncate(response.text))
+            raise ValueError(error_msg)
+        try:
+            token = response.json().get("token")
+        except ValueError as e:
+            raise ValueError(f"Failed to parse auth response: {str(e)}")
+        if not token:
+            raise ValueError("No token in auth response")
+        return token
+
+    async def _refresh(self, stale_token: Optional[str] = None) -> str:
+        """Sign in unless another task already replaced the token while we waited"""
+        async with self._refresh_lock:
+            if self._token and self._token != stale_token and time.time() < self._expires_at:
+                return self._token
+            token = await self.sign_in()
+            self._token = token
+            self._expires_at = decode_expiry(token) or time.time() + self.default_ttl
+            self.sign_ins += 1
+            logger.info("DQ token refreshed (async client), expires in %.0f s", self._expires_at - time.time())
+            return token
+
+    async def _refresh_quietly(self, stale_token: str) -> None:
+        try:
+            await self._refresh(stale_token)
+        except Exception as e:
+            logger.warning("Background DQ token refresh failed: %s", e)
+
+    async def get_token(self) -> str:
+        """Get a valid DQ API token, renewing it in the background shortly before it expires"""
+        now = time.time()
+        if self._token and now < self._expires_at - self.refresh_margin:
+            return self._token
+        if self._token and now < self._expires_at:
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._refresh_quietly(self._token))
+            return self._token
+        return await self._refresh()
+
+    async def request(self, method: str, path: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+        """
+        Make an authenticated DQ API request, signing in again and retrying once on a 401
+
+        Args:
+            method: HTTP method
+            path: Path below the DQ URL (e.g. "/v2/run-job-json")
+            endpoint: Short endpoint name for the metrics (e.g. "run-job-json")
+            **kwargs: Passed to httpx (json, params, headers, timeout, ...)
+
+        Returns:
+            httpx.Response: The response
+        """
+        token = await self.get_token()
+        headers = dict(kwargs.pop("headers", None) or {})
+        for attempt in range(2):
+            headers['Authorization'] = f'Bearer {token}'
+            response = await self._send(method, path, endpoint, headers=headers, **kwargs)
+            if response.status_code != 401 or attempt:
+                return response
+            logger.info("DQ API rejected the token for %s, signing in again", endpoint)
+            token = await self._refresh(stale_token=token)
+        return response
+
+    async def run_job(self, params: Dict[str, Any]) -> httpx.Response:
+        """Submit a job (run-job-json)"""
+        return await self.request("POST", "/v2/run-job-json", "run-job-json", json=params)
+
+    async def job_status(self, params: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """Recent jobs (getowlcheckq)"""
+        return await self.request("GET", "/v2/getowlcheckq", "getowlcheckq", params=params, headers=headers)
+
+    async def get_connection_aliases(self) -> List[Dict[str, Any]]:
+        """List the DQ connections"""
+        response = await self.request("GET", "/v2/getconnectionaliases", "getconnectionaliases")
+        response.raise_for_status()
+        return response.json()
+
+    async def get_schema_tree(self, alias_name: str) -> Dict[str, Dict[str, str]]:
+        """Schemas and their tables for one connection"""
+        response = await self.request(
+            "GET",
+            "/v2/getconnectionschematreebyaliasname",
+            "getconnectionschematreebyaliasname",
+            params={'aliasname': alias_name, 'showviews': 0, 'eagerfetch': 'true'}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch_catalog(self, connection_names: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        """
+        Catalog rows for the metadata table, fetching all schema trees concurrently
+
+        Args:
+            connection_names: Connections to include, defaults to all JDBC pushdown connections
+
+        Returns:
+            List[Dict[str, str]]: connection_name, schema_name and table_name rows
+        """
+        if not connection_names:
+            connection_names = [
+                c['aliasname'] for c in await self.get_connection_aliases()
+                if c.get('isPushdown', 0) > 0 and c.get('connectionType') == 'jdbc'
+            ]
+        trees = await asyncio.gather(*[self.get_schema_tree(name) for name in connection_names])
+        return [
+            {"connection_name": connection_name, "schema_name": schema, "table_name": table}
+            for connection_name, tree in zip(connection_names, trees)
+            for schema, tables in tree.items()
+            for table in tables.values()
+        ]
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# One client per event loop, httpx connections can't be shared across loops
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[Tuple[str, ...], AsyncDQClient]]" = \
+    weakref.WeakKeyDictionary()
+
+def get_async_dq_client() -> AsyncDQClient:
+    """Get the DQ client for the running event loop, a new one is created if the DQ settings change"""
+    loop = asyncio.get_running_loop()
+    env_vars = Environment.get_required_vars()
+    key = (env_vars.get("DQ_URL"), env_vars.get("DQ_USERNAME"), env_vars.get("DQ_CREDENTIAL"), env_vars.get("DQ_TENANT"))
+    entry = _clients.get(loop)
+    if entry is None or entry[0] != key:
+        if entry is not None:
+            loop.create_task(entry[1].aclose())
+        client = AsyncDQClient(
+            base_url=env_vars.get("DQ_URL"),
+            username=env_vars.get("DQ_USERNAME"),
+            password=env_vars.get("DQ_CREDENTIAL"),
+            tenant=env_vars.get("DQ_TENANT"),
+            max_connections=int(os.getenv("DQ_ASYNC_MAX_CONNECTIONS", "100")),
+            connect_timeout=float(os.getenv("DQ_CONNECT_TIMEOUT", "5")),
+            read_timeout=float(os.getenv("DQ_READ_TIMEOUT", "30")),
+        )
+        entry = _clients[loop] = (key, client)
+    return entry[1]
+
+async def close_async_dq_client() -> None:
+    """Close the running event loop's DQ client (application shutdown)"""
+    entry = _clients.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[1].aclose()
+
+
+async def a_run_dq_job(
+    dataset: Annotated[str, "dataset name to use"],
+    query: Annotated[str, "query to use"],
+    connection_name: Annotated[str, "connection name to use"],
+    schema_name: Annotated[str, "schema name to use"],
+    rerun: Annotated[bool, "true only if the user asks to run the same job again"] = False
+) -> str:
+    """Run a DQ job with the given parameters"""
+    logger.info("run_dq_job: connection_name=%s schema_name=%s dataset=%s", connection_name, schema_name, dataset)
+
+    # The catalog look-up is local DuckDB work, off the event loop
+    error, schema_name = await asyncio.to_thread(_validate_job, dataset, connection_name, schema_name)
+    if error:
+        return error
+
+    try:
+        params = _job_params(dataset, query, connection_name)
+        client = get_async_dq_client()
+        response, duplicate_age = await get_job_deduper().a_submit(
+            params, lambda: client.run_job(params), force=rerun
+        )
+        _track_job(params, response)
+        return _job_result(dataset, schema_name, response, duplicate_age)
+    except Exception as e:
+        logger.error(f"DQ job error: {str(e)}")
+        return f"Error running DQ job: {str(e)}"
+
+async def a_run_dq_jobs(
+    jobs: Annotated[
+        List[Dict[str, str]],
+        "jobs to run, each with dataset, query, connection_name and schema_name, "
+        "and rerun true only if the user asks to run the same job again"
+    ]
+) -> str:
+    """Run DQ jobs for several tables with one call"""
+    try:
+        items = _parse_job_items(jobs)
+    except ValueError as e:
+        return f"Error running DQ jobs: {e}"
+    logger.info("run_dq_jobs: %d jobs", len(items))
+
+    try:
+        valid = await asyncio.to_thread(_validate_job_items, items)
+    except Exception as e:
+        logger.error(f"Validation error: {str(e)}")
+        return "Error validating the tables for the DQ jobs."
+
+    semaphore = asyncio.Semaphore(max(1, int(os.getenv("DQ_BATCH_CONCURRENCY", "4"))))
+
+    async def submit(item) -> Tuple[str, str]:
+        async with semaphore:
+            try:
+                params = _job_params(item.dataset, item.query, item.connection_name)
+                response, duplicate_age = await get_job_deduper().a_submit(
+                    params, lambda: client.run_job(params), force=item.rerun
+                )
+                _track_job(params, response)
+                return _batch_outcome(response, duplicate_age)
+            except Exception as e:
+                logger.error("DQ job error for %s: %s", item.dataset, e)
+                return "error", str(e)[:200]
+
+    if any(valid):
+        try:
+            # Sign in (if needed) once up front rather than in every submission
+            client = get_async_dq_client()
+            await client.get_token()
+        except Exception as e:
+            logger.error(f"DQ job error: {str(e)}")
+            return f"Error running DQ jobs: {str(e)}"
+
+    outcomes = await asyncio.gather(*[
+        submit(item) if is_valid else asyncio.sleep(0, ("not found", "table not in catalog"))
+        for item, is_valid in zip(items, valid)
+    ])
+    return _format_batch(items, list(outcomes))
+
+async def a_fetch_job_page(offset: int, limit: int) -> List[Dict[str, Any]]:
+    """One page of the DQ job queue, newest first"""
+    params, headers = job_page_params(offset, limit)
+    return job_page_rows(await get_async_dq_client().job_status(params, headers))
+
+async def a_get_job_status(
+    dataset_prefix: Annotated[str, "only jobs whose dataset starts with this, e.g. AI_ for jobs run from here"] = "",
+    limit: Annotated[int, "number of jobs to show, newest first"] = 5
+) -> str:
+    """Check the status of DQ jobs"""
+    try:
+        history = current_job_history()
+        if not get_job_watcher().fresh():
+            await history.a_sync(a_fetch_job_page)
+        return _format_job_history(history, dataset_prefix, limit)
+    except httpx.HTTPError as e:
+        error_msg = f"Network error: {str(e)}"
+        logger.error(error_msg)
+        return f"Error checking job status: {error_msg}"
+    except Exception as e:
+        error_msg = f"Unexpected error: {str(e)}"
+        logger.error(error_msg)
+        return f"Error checking job status: {error_msg}"
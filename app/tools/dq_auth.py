@@ -0,0 +1,125 @@
+import json
+import time
+import base64
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def decode_expiry(token: str) -> Optional[float]:
+    """
+    Read the exp claim of a JWT without verifying it
+
+    Args:
+        token: Bearer token
+
+    Returns:
+        Optional[float]: Expiry as a unix timestamp, None if the token isn't a JWT with exp
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class DQTokenCache:
+    """
+    DQ API token, refreshed shortly before it expires
+
+    A token inside the refresh margin is still handed out while a background
+    thread signs in again. Only one sign-in runs at a time, concurrent callers
+    that need a token wait for it instead of signing in themselves.
+    """
+
+    def __init__(self, sign_in: Callable[[], str], refresh_margin: float = 60.0, default_ttl: float = 600.0):
+        self.sign_in = sign_in
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self.sign_ins = 0
+        self.hits = 0
+
+    def _valid_token(self, margin: float = 0.0) -> Optional[str]:
+        with self._lock:
+            if self._token and time.time() < self._expires_at - margin:
+                return self._token
+            return None
+
+    def _refresh(self, stale_token: Optional[str] = None) -> str:
+        """Sign in unless another thread already replaced the token while we waited"""
+        with self._refresh_lock:
+            token = self._valid_token()
+            if token is not None and token != stale_token:
+                return token
+            token = self.sign_in()
+            expires_at = decode_expiry(token) or time.time() + self.default_ttl
+            with self._lock:
+                self._token, self._expires_at = token, expires_at
+                self.sign_ins += 1
+            logger.info("DQ token refreshed, expires in %.0f s", expires_at - time.time())
+            return token
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+            stale_token = self._token
+
+        def run():
+            try:
+                self._refresh(stale_token)
+            except Exception as e:
+                logger.warning("Background DQ token refresh failed: %s", e)
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="dq-token-refresh", daemon=True).start()
+
+    def get_token(self) -> str:
+        """
+        Get a valid DQ API token, signing in only when needed
+
+        Returns:
+            str: Bearer token
+        """
+        token = self._valid_token(self.refresh_margin)
+        if token is not None:
+            self.hits += 1
+            return token
+        token = self._valid_token()
+        if token is not None:
+            # Still usable, renew it without making this call wait
+            self.hits += 1
+            self._refresh_in_background()
+            return token
+        return self._refresh()
+
+    def invalidate(self, token: str) -> str:
+        """
+        Replace a token the DQ service rejected
+
+        Args:
+            token: The rejected token
+
+        Returns:
+            str: A new token (or one another thread already obtained)
+        """
+        return self._refresh(stale_token=token)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sign_ins": self.sign_ins,
+                "hits": self.hits,
+                "expires_in": round(self._expires_at - time.time(), 1) if self._token else None,
+            }
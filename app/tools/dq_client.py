@@ -0,0 +1,255 @@
+import os
+import json
+import logging
+import time
+import threading
+import requests
+import urllib3
+import pandas as pd
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, List, Optional, Tuple
+from ..core.config.environment import Environment
+from ..core.logging import truncate
+from ..core.metrics import observe_dq_request
+from .dq_auth import DQTokenCache
+from .dq_resilience import RETRY_STATUSES, DQUnavailableError, RetryPolicy, get_circuit_breaker, is_service_failure
+from .dq_simulator import SIMULATOR_BASE_URL, SimulatorAdapter, get_dq_simulator, is_simulated
+
+logger = logging.getLogger(__name__)
+
+
+class DQClient:
+    """
+    DQ API client sharing one pooled, keep-alive session
+
+    Every call has a (connect, read) timeout, authenticated calls use the
+    cached token and sign in again once if the token is rejected.
+    Idempotent calls are retried with jittered backoff, and a circuit
+    breaker fails calls fast while DQ keeps failing.
+    A sim:// base URL answers from the in-process DQ simulator.
+    """
+
+    def __init__(self, base_url: str, username: str, password: str, tenant: str,
+                 pool_size: int = 10, connect_timeout: float = 5.0, read_timeout: float = 30.0,
+                 verify: bool = False):
+        simulated = is_simulated(base_url)
+        if simulated:
+            base_url = SIMULATOR_BASE_URL
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.password = password
+        self.tenant = tenant
+        self.timeout = (connect_timeout, read_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if simulated:
+            self.session.mount(SIMULATOR_BASE_URL, SimulatorAdapter(get_dq_simulator()))
+        self.session.verify = verify
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+        if not verify:
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+        self.retry = RetryPolicy.from_env()
+        self.breaker = get_circuit_breaker(self.base_url)
+
+        self.tokens = DQTokenCache(
+            self.sign_in,
+            refresh_margin=float(os.getenv("DQ_TOKEN_REFRESH_MARGIN", "60")),
+            default_ttl=float(os.getenv("DQ_TOKEN_TTL", "600")),
+        )
+
+    def _send(self, method: str, path: str, endpoint: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        retries = self.retry.retries_for(method, endpoint)
+        for attempt in range(retries + 1):
+            # Raises DQUnavailableError while the breaker is open
+            self.breaker.before_call()
+            try:
+                with observe_dq_request(endpoint) as outcome:
+                    response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+                    outcome["status"] = str(response.status_code)
+            except requests.exceptions.RequestException as e:
+                self.breaker.record_failure()
+                if attempt >= retries:
+                    raise
+                logger.warning("DQ %s failed (%s), retry %d of %d", endpoint, e, attempt + 1, retries)
+            else:
+                if is_service_failure(response.status_code):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    return response
+                logger.warning("DQ %s returned %s, retry %d of %d", endpoint, response.status_code, attempt + 1, retries)
+            time.sleep(self.retry.delay(attempt))
+
+    def sign_in(self) -> str:
+        """Get a new API token for the DQ service"""
+        try:
+            payload = {
+                'username': self.username,
+                'password': self.password,
+                'iss': self.tenant
+            }
+
+            # Log request details (excluding sensitive info)
+            logger.debug("Making auth request to: %s/v3/auth/signin", self.base_url)
+            logger.debug("With username: %s and tenant: %s", payload['username'], payload['iss'])
+
+            response = self._send("POST", "/v3/auth/signin", "signin", json=payload)
+
+            logger.debug("Auth response status code: %s", response.status_code)
+
+            if response.status_code == 401:
+                error_msg = "Authentication failed: Invalid credentials or tenant"
+                logger.error(error_msg)
+                logger.error("Response content: %s", truncate(response.text))
+                raise ValueError(error_msg)
+            elif response.status_code != 200:
+                error_msg = f"Auth API returned status code {response.status_code}"
+                logger.error(error_msg)
+                logger.error("Response content: %s", truncate(response.text))
+                raise ValueError(error_msg)
+
+            try:
+                data = response.json()
+                logger.debug("Successfully parsed auth response")
+            except json.JSONDecodeError as e:
+                error_msg = f"Failed to parse auth response: {str(e)}"
+                logger.error(error_msg)
+                logger.error("Raw response: %s", truncate(response.text))
+                raise ValueError(error_msg)
+
+            if not data.get("token"):
+                error_msg = "No token in auth response"
+                logger.error(error_msg)
+                logger.error("Response data: %s", truncate(data))
+                raise ValueError(error_msg)
+
+            logger.debug("Successfully obtained auth token")
+            return data["token"]
+
+        except DQUnavailableError:
+            # Callers tell an open circuit apart from failed credentials
+            raise
+        except requests.exceptions.RequestException as e:
+            error_msg = f"Network error during auth: {str(e)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        except Exception as e:
+            error_msg = f"Unexpected error during auth: {str(e)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+    def request(self, method: str, path: str, endpoint: str, **kwargs: Any) -> requests.Response:
+        """
+        Make an authenticated DQ API request, signing in again and retrying once on a 401
+
+        Args:
+            method: HTTP method
+            path: Path below the DQ URL (e.g. "/v2/run-job-json")
+            endpoint: Short endpoint name for the metrics (e.g. "run-job-json")
+            **kwargs: Passed to requests (json, params, headers, timeout, ...)
+
+        Returns:
+            requests.Response: The response
+        """
+        token = self.tokens.get_token()
+        headers = dict(kwargs.pop("headers", None) or {})
+        for attempt in range(2):
+            headers['Authorization'] = f'Bearer {token}'
+            response = self._send(method, path, endpoint, headers=headers, **kwargs)
+            if response.status_code != 401 or attempt:
+                return response
+            logger.info("DQ API rejected the token for %s, signing in again", endpoint)
+            token = self.tokens.invalidate(token)
+        return response
+
+    def get_connection_aliases(self) -> List[Dict[str, Any]]:
+        """List the DQ connections"""
+        response = self.request("GET", "/v2/getconnectionaliases", "getconnectionaliases")
+        response.raise_for_status()
+        return response.json()
+
+    def get_schema_tree(self, alias_name: str) -> Dict[str, Dict[str, str]]:
+        """Schemas and their tables for one connection"""
+        response = self.request(
+            "GET",
+            "/v2/getconnectionschematreebyaliasname",
+            "getconnectionschematreebyaliasname",
+            params={'aliasname': alias_name, 'showviews': 0, 'eagerfetch': 'true'}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_catalog(self, connection_names: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Build the connection/schema/table catalog (the metadata table) from the DQ API
+
+        Args:
+            connection_names: Connections to include, defaults to all JDBC pushdown connections
+
+        Returns:
+            pd.DataFrame: connection_name, schema_name and table_name rows
+        """
+        if not connection_names:
+            connection_names = [
+                c['aliasname'] for c in self.get_connection_aliases()
+                if c.get('isPushdown', 0) > 0 and c.get('connectionType') == 'jdbc'
+            ]
+        rows = [
+            {"connection_name": connection_name, "schema_name": schema, "table_name": table}
+            for connection_name in connection_names
+            for schema, tables in self.get_schema_tree(connection_name).items()
+            for table in tables.values()
+        ]
+        logger.info("Fetched %d catalog tables for %d connections", len(rows), len(connection_names))
+        return pd.DataFrame(rows, columns=["connection_name", "schema_name", "table_name"])
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_client: Optional[DQClient] = None
+_client_key: Optional[Tuple[str, ...]] = None
+_client_lock = threading.Lock()
+
+def get_dq_client() -> DQClient:
+    """Get the shared DQ client, a new one is created if the DQ settings change"""
+    global _client, _client_key
+    env_vars = Environment.get_required_vars()
+    key = (env_vars.get("DQ_URL"), env_vars.get("DQ_USERNAME"), env_vars.get("DQ_CREDENTIAL"), env_vars.get("DQ_TENANT"))
+    with _client_lock:
+        if _client is None or _client_key != key:
+            if _client is not None:
+                _client.close()
+            _client = DQClient(
+                base_url=env_vars.get("DQ_URL"),
+                username=env_vars.get("DQ_USERNAME"),
+                password=env_vars.get("DQ_CREDENTIAL"),
+                tenant=env_vars.get("DQ_TENANT"),
+                pool_size=int(os.getenv("DQ_POOL_SIZE", "10")),
+                connect_timeout=float(os.getenv("DQ_CONNECT_TIMEOUT", "5")),
+                read_timeout=float(os.getenv("DQ_READ_TIMEOUT", "30")),
+            )
+            _client_key = key
+        return _client
+
+def get_dq_client_stats() -> Optional[Dict[str, Any]]:
+    """Token stats of the shared client, None before the first DQ call"""
+    client = _client
+    return client.tokens.get_stats() if client is not None else None
+
+def close_dq_client() -> None:
+    """Close the shared DQ client's connections (application shutdown)"""
+    global _client, _client_key
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client, _client_key = None, None
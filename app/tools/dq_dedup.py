@@ -0,0 +1,164 @@
+import os
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def job_fingerprint(params: Dict[str, Any]) -> str:
+    """
+    Fingerprint of a run-job-json body: dataset, normalized query, connection and runId
+
+    Args:
+        params: Body for the run-job-json endpoint (see dq_tools._job_params)
+
+    Returns:
+        str: Hex digest identifying the submission
+    """
+    pushdown = params.get('pushdown') or {}
+    query = " ".join((pushdown.get('sourceQuery') or "").split()).rstrip(";").strip()
+    parts = (params.get('dataset') or "", query, pushdown.get('connectionName') or "", params.get('runId') or "")
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class JobSubmissionDeduper:
+    """
+    Idempotency layer for DQ job submissions
+
+    A submission with the same fingerprint as one accepted within the window
+    isn't sent again, the caller gets the original response. Identical
+    submissions made at the same time (parallel tool calls) share one
+    request. Failed submissions aren't kept, so a retry resubmits, and a
+    forced submission (an explicit rerun) is always sent.
+    Works for sync callers (tool threads) and async ones (an event loop).
+    """
+
+    def __init__(self, window: float = 600.0, max_entries: int = 1024):
+        """
+        Initialize the deduper
+
+        Args:
+            window: Seconds an accepted submission suppresses duplicates, 0 disables
+            max_entries: Maximum accepted submissions kept
+        """
+        self.window = window
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._accepted: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self.submitted = 0
+        self.deduplicated = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"submitted": self.submitted, "deduplicated": self.deduplicated, "entries": len(self._accepted)}
+
+    def _claim(self, key: str, force: bool = False) -> Tuple[bool, Any]:
+        """
+        (True, future to settle) if the caller submits, (False, accepted entry
+        or in-flight future) for a duplicate
+        """
+        with self._lock:
+            entry = self._accepted.get(key)
+            if entry is not None and force:
+                del self._accepted[key]
+            elif entry is not None:
+                if time.time() - entry[0] < self.window:
+                    self.deduplicated += 1
+                    return False, entry
+                del self._accepted[key]
+            future = self._inflight.get(key)
+            if future is not None and not force:
+                self.deduplicated += 1
+                return False, future
+            future = self._inflight[key] = Future()
+            self.submitted += 1
+            return True, future
+
+    def _settle(self, key: str, future: Future, response: Any = None, error: Optional[BaseException] = None) -> None:
+        submitted_at = time.time()
+        with self._lock:
+            # A forced submission may have replaced this one as the in-flight request
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if error is None and getattr(response, "status_code", None) == 200:
+                self._accepted[key] = (submitted_at, response)
+                self._accepted.move_to_end(key)
+                while len(self._accepted) > self.max_entries:
+                    self._accepted.popitem(last=False)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result((submitted_at, response))
+
+    @staticmethod
+    def _duplicate(params: Dict[str, Any], entry: Tuple[float, Any]) -> Tuple[Any, float]:
+        submitted_at, response = entry
+        age = max(0.0, time.time() - submitted_at)
+        logger.info("Skipping duplicate DQ job submission for %s (submitted %.0f s ago)", params.get('dataset'), age)
+        return response, age
+
+    def submit(self, params: Dict[str, Any], send: Callable[[], Any],
+               force: bool = False) -> Tuple[Any, Optional[float]]:
+        """
+        Submit a job unless an identical one was accepted within the window
+
+        Args:
+            params: Body for the run-job-json endpoint
+            send: Sends the submission and returns the response
+            force: Submit even if an identical job was accepted (explicit rerun)
+
+        Returns:
+            Tuple[Any, Optional[float]]: The response, and when this submission was
+                a duplicate, the age in seconds of the original (else None)
+        """
+        if self.window <= 0:
+            return send(), None
+        key = job_fingerprint(params)
+        owner, claimed = self._claim(key, force)
+        if not owner:
+            entry = claimed.result() if isinstance(claimed, Future) else claimed
+            return self._duplicate(params, entry)
+        try:
+            response = send()
+        except BaseException as e:
+            self._settle(key, claimed, error=e)
+            raise
+        self._settle(key, claimed, response)
+        return response, None
+
+    async def a_submit(self, params: Dict[str, Any], send: Callable[[], Awaitable[Any]],
+                       force: bool = False) -> Tuple[Any, Optional[float]]:
+        """Async version of submit, send returns an awaitable response"""
+        if self.window <= 0:
+            return await send(), None
+        key = job_fingerprint(params)
+        owner, claimed = self._claim(key, force)
+        if not owner:
+            entry = await asyncio.wrap_future(claimed) if isinstance(claimed, Future) else claimed
+            return self._duplicate(params, entry)
+        try:
+            response = await send()
+        except BaseException as e:
+            self._settle(key, claimed, error=e)
+            raise
+        self._settle(key, claimed, response)
+        return response, None
+
+
+_deduper: Optional[JobSubmissionDeduper] = None
+_deduper_lock = threading.Lock()
+
+def get_job_deduper() -> JobSubmissionDeduper:
+    """Get the shared job submission deduper, window from DQ_SUBMIT_DEDUP_WINDOW (seconds)"""
+    global _deduper
+    with _deduper_lock:
+        if _deduper is None:
+            _deduper = JobSubmissionDeduper(window=float(os.getenv("DQ_SUBMIT_DEDUP_WINDOW", "600")))
+        return _deduper
@@ -0,0 +1,197 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which DQ no longer changes a job
+TERMINAL_STATUSES = {"FINISHED", "FAILED", "ERROR", "CANCELLED", "KILLED"}
+
+
+def _job_number(row: Dict[str, Any]) -> Optional[int]:
+    try:
+        return int(row.get("jobId"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _job_key(row: Dict[str, Any]) -> str:
+    number = _job_number(row)
+    return str(number) if number is not None else f"{row.get('dataset')}|{row.get('runId')}"
+
+
+class JobHistory:
+    """
+    Incrementally synced copy of one tenant's DQ job queue
+
+    getowlcheckq lists jobs newest first, so a sync pages down (limit and
+    offset) only until it reaches the cursor: the oldest job that can still
+    have changed, i.e. the high-water mark (newest job id seen) or an older
+    job that hadn't finished yet, among the newest `backfill` jobs. The
+    first sync backfills that many jobs. Without job ids in the rows only
+    the first page is read. One sync runs at a time, sync (tool threads) and
+    a_sync (the job watcher, async tools) wait for each other.
+    """
+
+    def __init__(self, tenant: str, page_size: int = 25, max_pages: int = 10,
+                 backfill: int = 100, max_jobs: int = 1000):
+        self.tenant = tenant
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.backfill = backfill
+        self.max_jobs = max_jobs
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self.high_water: Optional[int] = None
+        self.synced_at: Optional[float] = None
+        self.pages_fetched = 0
+        self.rows_fetched = 0
+
+    def _cursor(self) -> Optional[int]:
+        """Oldest job id a sync has to reach, None before the first sync"""
+        with self._lock:
+            if self.high_water is None:
+                return None
+            # Only the newest jobs are re-checked, a stuck old job doesn't make every sync page deep
+            recent = sorted((n for n in map(_job_number, self._jobs.values()) if n is not None), reverse=True)
+            floor = recent[min(len(recent), self.backfill) - 1] if recent else self.high_water
+            unfinished = [
+                _job_number(row) for row in self._jobs.values()
+                if row.get("status") not in TERMINAL_STATUSES and (_job_number(row) or -1) >= floor
+            ]
+            return min(unfinished + [self.high_water])
+
+    def _merge(self, rows: List[Dict[str, Any]], cursor: Optional[int], fetched: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Merge one page, returns (new or changed rows, whether the sync is done)"""
+        changed = []
+        with self._lock:
+            self.pages_fetched += 1
+            self.rows_fetched += len(rows)
+            for row in rows:
+                key = _job_key(row)
+                previous = self._jobs.get(key)
+                if previous is None or (previous.get("status"), previous.get("activity")) != (row.get("status"), row.get("activity")):
+                    changed.append(row)
+                self._jobs[key] = dict(row)
+        numbers = [number for number in map(_job_number, rows) if number is not None]
+        if len(rows) < self.page_size or len(numbers) < len(rows):
+            return changed, True
+        if cursor is None:
+            return changed, fetched >= self.backfill
+        return changed, min(numbers) <= cursor
+
+    def _finish(self) -> None:
+        with self._lock:
+            numbers = [number for number in map(_job_number, self._jobs.values()) if number is not None]
+            if numbers:
+                self.high_water = max(numbers)
+            elif self.high_water is None:
+                self.high_water = 0
+            if len(self._jobs) > self.max_jobs:
+                # Oldest jobs go first
+                for key, _ in sorted(self._jobs.items(), key=lambda item: _job_number(item[1]) or 0)[:len(self._jobs) - self.max_jobs]:
+                    del self._jobs[key]
+            self.synced_at = time.time()
+
+    def sync(self, fetch_page: Callable[[int, int], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Fetch new and changed jobs
+
+        Args:
+            fetch_page: Returns the getowlcheckq rows for (offset, limit)
+
+        Returns:
+            List[Dict[str, Any]]: Rows that are new or changed since the last sync
+        """
+        with self._sync_lock:
+            cursor, changed, offset = self._cursor(), [], 0
+            for _ in range(self.max_pages):
+                rows = fetch_page(offset, self.page_size)
+                offset += len(rows)
+                page_changed, done = self._merge(rows, cursor, offset)
+                changed.extend(page_changed)
+                if done:
+                    break
+            self._finish()
+        logger.debug("Job history %s: %d rows fetched, %d new or changed", self.tenant, offset, len(changed))
+        return changed
+
+    async def a_sync(self, fetch_page: Callable[[int, int], Awaitable[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """Async version of sync, fetch_page returns an awaitable"""
+        # Polled rather than acquired in a thread, a cancelled wait must not leave the lock taken
+        while not self._sync_lock.acquire(blocking=False):
+            await asyncio.sleep(0.05)
+        try:
+            cursor, changed, offset = self._cursor(), [], 0
+            for _ in range(self.max_pages):
+                rows = await fetch_page(offset, self.page_size)
+                offset += len(rows)
+                page_changed, done = self._merge(rows, cursor, offset)
+                changed.extend(page_changed)
+                if done:
+                    break
+            self._finish()
+        finally:
+            self._sync_lock.release()
+        logger.debug("Job history %s: %d rows fetched, %d new or changed", self.tenant, offset, len(changed))
+        return changed
+
+    def jobs(self, dataset_prefix: str = "", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Known jobs, newest first
+
+        Args:
+            dataset_prefix: Only datasets starting with this (case-insensitive)
+            limit: Maximum number of jobs (all if None)
+
+        Returns:
+            List[Dict[str, Any]]: Job rows as returned by getowlcheckq
+        """
+        prefix = dataset_prefix.lower()
+        with self._lock:
+            rows = [dict(row) for row in self._jobs.values() if str(row.get("dataset") or "").lower().startswith(prefix)]
+        # Stable sort, rows without a job id keep the order DQ listed them in
+        rows.sort(key=lambda row: _job_number(row) or 0, reverse=True)
+        return rows if limit is None else rows[:limit]
+
+    def has_job(self, dataset: str, run_id: str) -> bool:
+        """Whether DQ listed a job for this dataset and run id"""
+        with self._lock:
+            return any(
+                row.get("dataset") == dataset and str(row.get("runId") or "") == run_id
+                for row in self._jobs.values()
+            )
+
+    def count(self, dataset_prefix: str = "") -> int:
+        return len(self.jobs(dataset_prefix))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "jobs": len(self._jobs),
+                "high_water": self.high_water,
+                "pages_fetched": self.pages_fetched,
+                "rows_fetched": self.rows_fetched,
+                "synced_at": self.synced_at,
+            }
+
+
+_histories: Dict[str, JobHistory] = {}
+_histories_lock = threading.Lock()
+
+def get_job_history(tenant: str) -> JobHistory:
+    """Get the job history of a tenant (paging from the DQ_HISTORY_* variables)"""
+    with _histories_lock:
+        if tenant not in _histories:
+            _histories[tenant] = JobHistory(
+                tenant,
+                page_size=int(os.getenv("DQ_HISTORY_PAGE_SIZE", "25")),
+                max_pages=int(os.getenv("DQ_HISTORY_MAX_PAGES", "10")),
+                backfill=int(os.getenv("DQ_HISTORY_BACKFILL", "100")),
+                max_jobs=int(os.getenv("DQ_HISTORY_MAX_JOBS", "1000")),
+            )
+        return _histories[tenant]
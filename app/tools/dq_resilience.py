@@ -0,0 +1,149 @@
+import os
+import time
+import random
+import logging
+import threading
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying
+RETRY_STATUSES = {429, 502, 503, 504}
+# Calls that are safe to send again, job submissions are not
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+IDEMPOTENT_ENDPOINTS = {"signin"}
+
+
+class DQUnavailableError(Exception):
+    """Raised instead of calling DQ while its circuit breaker is open"""
+
+
+def is_idempotent(method: str, endpoint: str) -> bool:
+    return method.upper() in IDEMPOTENT_METHODS or endpoint in IDEMPOTENT_ENDPOINTS
+
+
+def is_service_failure(status_code: int) -> bool:
+    """Whether a response counts against the DQ service's health (5xx, throttling)"""
+    return status_code >= 500 or status_code == 429
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform between 0 and min(cap, base * 2^attempt)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one DQ service
+
+    After failure_threshold consecutive failures (network errors, 5xx, 429) the
+    breaker opens and calls fail fast with DQUnavailableError. After
+    reset_timeout seconds one trial call is let through (half open), its
+    outcome closes the breaker again or re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started = 0.0
+        self.rejected = 0
+        self.opened = 0
+
+    def before_call(self) -> None:
+        """Let a call through or raise DQUnavailableError"""
+        with self._lock:
+            if self._state == "closed":
+                return
+            retry_in = self._opened_at + self.reset_timeout - time.monotonic()
+            if self._state == "open" and retry_in <= 0:
+                self._state = "half_open"
+            # A trial that never reported back (e.g. cancelled) doesn't block the next one for long
+            if self._state == "half_open" and time.monotonic() - self._trial_started > self.reset_timeout:
+                self._trial_started = time.monotonic()
+                return
+            self.rejected += 1
+        raise DQUnavailableError(
+            f"DQ service is unavailable after repeated failures, not calling it for {max(0.0, retry_in):.0f}s"
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != "closed":
+                logger.info("DQ circuit %s closed", self.name)
+            self._state = "closed"
+            self._failures = 0
+            self._trial_started = 0.0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_started = 0.0
+            if self._state == "half_open" or (self._state == "closed" and self._failures >= self.failure_threshold):
+                self._state = "open"
+                self._opened_at = time.monotonic()
+                self.opened += 1
+                logger.warning(
+                    "DQ circuit %s opened after %d failures, failing fast for %.0f s",
+                    self.name, self._failures, self.reset_timeout
+                )
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = self._opened_at + self.reset_timeout - time.monotonic() if self._state == "open" else 0.0
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "retry_in": round(max(0.0, retry_in), 1),
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+class RetryPolicy:
+    """Bounded retries with jittered exponential backoff, from DQ_RETRIES, DQ_BACKOFF_BASE and DQ_BACKOFF_MAX"""
+
+    def __init__(self, max_retries: int = 2, backoff_base: float = 0.5, backoff_max: float = 8.0):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(
+            max_retries=int(os.getenv("DQ_RETRIES", "2")),
+            backoff_base=float(os.getenv("DQ_BACKOFF_BASE", "0.5")),
+            backoff_max=float(os.getenv("DQ_BACKOFF_MAX", "8")),
+        )
+
+    def retries_for(self, method: str, endpoint: str) -> int:
+        """Retries allowed for a call, none for calls that aren't idempotent"""
+        return self.max_retries if is_idempotent(method, endpoint) else 0
+
+    def delay(self, attempt: int) -> float:
+        return backoff_delay(attempt, self.backoff_base, self.backoff_max)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(base_url: str) -> CircuitBreaker:
+    """Get the breaker for a DQ URL, shared by the sync and async clients"""
+    with _breakers_lock:
+        if base_url not in _breakers:
+            _breakers[base_url] = CircuitBreaker(
+                base_url,
+                failure_threshold=int(os.getenv("DQ_BREAKER_FAILURES", "5")),
+                reset_timeout=float(os.getenv("DQ_BREAKER_RESET", "30")),
+            )
+        return _breakers[base_url]
+
+def get_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """Breaker state per DQ URL, for the health endpoint"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.get_stats() for breaker in breakers}
@@ -0,0 +1,283 @@
+import os
+import json
+import time
+import base64
+import random
+import asyncio
+import logging
+import itertools
+import threading
+import httpx
+import requests
+from collections import deque
+from urllib.parse import parse_qsl, urlsplit
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from typing import Any, Dict, List, Optional, Tuple
+from .dq_auth import decode_expiry
+
+logger = logging.getLogger(__name__)
+
+# DQ_URL="sim://..." selects the simulator, the clients then talk to this host
+SIMULATOR_SCHEME = "sim://"
+SIMULATOR_BASE_URL = "http://dq-simulator"
+
+_CONNECTIONS = {
+    "SIM_SNOWFLAKE_PUSHDOWN": {"SALES": ["CUSTOMERS", "ORDERS", "ORDER_ITEMS", "PRODUCTS"],
+                               "FINANCE": ["INVOICES", "PAYMENTS", "LEDGER_ENTRIES"]},
+    "SIM_SQL_SERVER_PD": {"dbo": ["ACCOUNTS", "ACCOUNT_BALANCES", "TRANSACTIONS"],
+                          "OPERATIONS": ["SHIPMENTS", "WAREHOUSES", "INVENTORY"]},
+}
+
+
+def is_simulated(base_url: Optional[str]) -> bool:
+    """Whether a DQ URL selects the simulator"""
+    return bool(base_url) and base_url.lower().startswith(SIMULATOR_SCHEME)
+
+
+class DQSimulator:
+    """
+    In-process stand-in for the DQ API
+
+    Serves signin, run-job-json, getowlcheckq, getconnectionaliases and
+    getconnectionschematreebyaliasname with payloads shaped like a DQ
+    tenant's. Tokens are JWTs that expire, and a submitted job moves from
+    SUBMITTED to RUNNING to FINISHED (or FAILED) over its run time.
+    Each call is given a latency, and calls can fail at random or hit a
+    slow spell, to reproduce slow-DQ incidents.
+    """
+
+    def __init__(self, latency_ms: float = 100.0, jitter_ms: float = 50.0, error_rate: float = 0.0,
+                 slow_rate: float = 0.0, slow_ms: float = 5000.0, job_seconds: float = 30.0,
+                 job_failure_rate: float = 0.1, token_ttl: float = 600.0, seed: Optional[int] = None):
+        """
+        Initialize the simulator
+
+        Args:
+            latency_ms: Mean response latency
+            jitter_ms: Uniform latency jitter (+/-)
+            error_rate: Share of calls answered with a 503
+            slow_rate: Share of calls that take slow_ms instead
+            slow_ms: Latency of a slow call
+            job_seconds: Mean job run time
+            job_failure_rate: Share of jobs that end FAILED
+            token_ttl: Lifetime of an issued token in seconds
+            seed: Random seed, for reproducible runs
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.job_seconds = job_seconds
+        self.job_failure_rate = job_failure_rate
+        self.token_ttl = token_ttl
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count(1)
+        self._jobs: deque = deque(maxlen=500)
+        self.calls = 0
+        self.errors = 0
+
+    def latency(self) -> float:
+        """Seconds the next call takes"""
+        with self._lock:
+            if self._random.random() < self.slow_rate:
+                return self.slow_ms / 1000
+            return max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+    def _issue_token(self, username: str) -> str:
+        def encode(part: Dict[str, Any]) -> str:
+            return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+        claims = {"sub": username, "iss": "dq-simulator", "exp": int(time.time() + self.token_ttl)}
+        return f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode(claims)}.sim"
+
+    @staticmethod
+    def _authorized(headers: Dict[str, str]) -> bool:
+        authorization = headers.get("Authorization") or headers.get("authorization") or ""
+        token = authorization[len("Bearer "):] if authorization.startswith("Bearer ") else ""
+        expires_at = decode_expiry(token)
+        return token.endswith(".sim") and expires_at is not None and time.time() < expires_at
+
+    def _job_row(self, job: Dict[str, Any], now: float) -> Dict[str, Any]:
+        elapsed = now - job["submitted_at"]
+        if elapsed < job["duration"] * 0.1:
+            status = "SUBMITTED"
+        elif elapsed < job["duration"]:
+            status = "RUNNING"
+        else:
+            status = "FAILED" if job["fails"] else "FINISHED"
+        return {
+            "jobId": job["jobId"],
+            "dataset": job["dataset"],
+            "runId": job["runId"],
+            "status": status,
+            "activity": "PUSHDOWN",
+            "percentComplete": round(min(1.0, elapsed / job["duration"]), 2),
+        }
+
+    def handle(self, method: str, path: str, params: Dict[str, str], body: Any,
+               headers: Dict[str, str]) -> Tuple[int, Any]:
+        """
+        Answer one DQ API call
+
+        Args:
+            method: HTTP method
+            path: Request path (e.g. "/v2/run-job-json")
+            params: Query parameters
+            body: Decoded JSON body, None if there was none
+            headers: Request headers
+
+        Returns:
+            Tuple[int, Any]: Status code and JSON payload
+        """
+        with self._lock:
+            self.calls += 1
+            if self._random.random() < self.error_rate:
+                self.errors += 1
+                return 503, {"error": "Simulated DQ outage"}
+
+        if method == "POST" and path == "/v3/auth/signin":
+            body = body or {}
+            if not body.get("username") or not body.get("password"):
+                return 401, {"error": "Invalid credentials"}
+            return 200, {"token": self._issue_token(body["username"])}
+
+        if not self._authorized(headers):
+            return 401, {"error": "Invalid or expired token"}
+
+        if method == "POST" and path == "/v2/run-job-json":
+            body = body or {}
+            if not body.get("dataset") or not body.get("runId"):
+                return 400, {"error": "dataset and runId are required"}
+            with self._lock:
+                job = {
+                    "jobId": next(self._job_ids),
+                    "dataset": body["dataset"],
+                    "runId": body["runId"],
+                    "submitted_at": time.time(),
+                    "duration": max(0.1, self.job_seconds * self._random.uniform(0.5, 1.5)),
+                    "fails": self._random.random() < self.job_failure_rate,
+                }
+                self._jobs.appendleft(job)
+            return 200, {"jobId": job["jobId"], "dataset": job["dataset"], "runId": job["runId"], "status": "SUBMITTED"}
+
+        if method == "GET" and path == "/v2/getowlcheckq":
+            now = time.time()
+            limit = int(params.get("limit") or 5)
+            offset = int(params.get("offset") or 0)
+            job_status = (params.get("jobStatus") or "ALL").upper()
+            with self._lock:
+                rows = [self._job_row(job, now) for job in self._jobs]
+            if job_status != "ALL":
+                rows = [row for row in rows if row["status"] == job_status]
+            return 200, {"data": rows[offset:offset + limit]}
+
+        if method == "GET" and path == "/v2/getconnectionaliases":
+            aliases = [
+                {"aliasname": name, "isPushdown": 1, "connectionType": "jdbc"}
+                for name in _CONNECTIONS
+            ]
+            return 200, aliases + [{"aliasname": "SIM_LOCAL_FILES", "isPushdown": 0, "connectionType": "file"}]
+
+        if method == "GET" and path == "/v2/getconnectionschematreebyaliasname":
+            schemas = _CONNECTIONS.get(params.get("aliasname") or "")
+            if schemas is None:
+                return 404, {"error": f"Unknown connection {params.get('aliasname')}"}
+            return 200, {
+                schema: {str(index): table for index, table in enumerate(tables)}
+                for schema, tables in schemas.items()
+            }
+
+        return 404, {"error": f"No simulated endpoint for {method} {path}"}
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "errors": self.errors, "jobs": len(self._jobs)}
+
+
+def _read_timeout(timeout: Any) -> Optional[float]:
+    """Read timeout from a requests timeout (float or (connect, read) tuple)"""
+    if isinstance(timeout, tuple):
+        return timeout[1]
+    return timeout
+
+
+class SimulatorAdapter(BaseAdapter):
+    """requests transport adapter answering from a DQSimulator"""
+
+    def __init__(self, simulator: DQSimulator):
+        super().__init__()
+        self.simulator = simulator
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        url = urlsplit(request.url)
+        body = request.body.decode("utf-8") if isinstance(request.body, bytes) else request.body
+        delay, read_timeout = self.simulator.latency(), _read_timeout(timeout)
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.exceptions.ReadTimeout(f"Simulated DQ call timed out after {read_timeout}s", request=request)
+        time.sleep(delay)
+        status, payload = self.simulator.handle(
+            request.method, url.path, dict(parse_qsl(url.query)), json.loads(body) if body else None,
+            dict(request.headers)
+        )
+
+        response = requests.Response()
+        response.status_code = status
+        response.reason = "OK" if status == 200 else "Simulated"
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response._content = json.dumps(payload).encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+class SimulatorAsyncTransport(httpx.AsyncBaseTransport):
+    """httpx transport answering from a DQSimulator, waiting without blocking the event loop"""
+
+    def __init__(self, simulator: DQSimulator):
+        self.simulator = simulator
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        delay = self.simulator.latency()
+        read_timeout = (request.extensions.get("timeout") or {}).get("read")
+        if read_timeout is not None and delay > read_timeout:
+            await asyncio.sleep(read_timeout)
+            raise httpx.ReadTimeout(f"Simulated DQ call timed out after {read_timeout}s", request=request)
+        await asyncio.sleep(delay)
+        status, payload = self.simulator.handle(
+            request.method, request.url.path, dict(request.url.params), json.loads(body) if body else None,
+            dict(request.headers)
+        )
+        return httpx.Response(status, json=payload, request=request)
+
+
+_simulator: Optional[DQSimulator] = None
+_simulator_lock = threading.Lock()
+
+def get_dq_simulator() -> DQSimulator:
+    """Get the shared simulator (configured from the DQ_SIM_* variables), shared by the sync and async clients"""
+    global _simulator
+    with _simulator_lock:
+        if _simulator is None:
+            seed = os.getenv("DQ_SIM_SEED")
+            _simulator = DQSimulator(
+                latency_ms=float(os.getenv("DQ_SIM_LATENCY_MS", "100")),
+                jitter_ms=float(os.getenv("DQ_SIM_JITTER_MS", "50")),
+                error_rate=float(os.getenv("DQ_SIM_ERROR_RATE", "0")),
+                slow_rate=float(os.getenv("DQ_SIM_SLOW_RATE", "0")),
+                slow_ms=float(os.getenv("DQ_SIM_SLOW_MS", "5000")),
+                job_seconds=float(os.getenv("DQ_SIM_JOB_SECONDS", "30")),
+                job_failure_rate=float(os.getenv("DQ_SIM_JOB_FAILURE_RATE", "0.1")),
+                token_ttl=float(os.getenv("DQ_SIM_TOKEN_TTL", "600")),
+                seed=int(seed) if seed else None,
+            )
+            logger.warning("DQ API simulator enabled (DQ_URL=sim://), no calls reach a DQ tenant")
+        return _simulator
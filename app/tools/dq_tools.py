@@ -1,248 +1,363 @@
 import os
+import re
+import threading
 import json
 import logging
 import requests
-import urllib3
 import pandas as pd
 import duckdb
-from datetime import datetime
-from typing import Annotated
+from datetime import datetime, timezone
+from typing import Annotated, Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from ..core.config.environment import Environment
 from pathlib import Path
+from ..core.logging import log_payload
+from .dq_client import get_dq_client
+from .dq_watcher import get_job_watcher
+from .dq_dedup import get_job_deduper
+from .dq_history import JobHistory, get_job_history
+from ..models.models import DQJobItem
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)  # Set the logging level as needed
 logger = logging.getLogger(__name__)  # Create a logger for this module
 
 def get_api_token() -> str:
-    """Get API token for DQ service"""
-    env_vars = Environment.get_required_vars()
-    
-    try:
-        url = env_vars.get("DQ_URL") + '/v3/auth/signin'
-        payload = {
-            'username': env_vars.get("DQ_USERNAME"),
-            'password': env_vars.get("DQ_CREDENTIAL"),
-            'iss': env_vars.get("DQ_TENANT")
-        }
-        headers = {
-            'Accept': 'application/json',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Connection': 'keep-alive',
-            'Content-Type': 'application/json'
-        }
-        
-        # Log request details (excluding sensitive info)
-        logger.info(f"Making auth request to: {url}")
-        logger.info(f"With username: {payload['username']} and tenant: {payload['iss']}")
-        logger.info(f"Headers: {headers}")
-        
-        response = requests.post(
-            url,
-            headers=headers,
-            json=payload,  # Use json parameter instead of data for proper JSON encoding
-            verify=False,
-            timeout=30  # Add timeout
-        )
-        
-        logger.info(f"Auth response status code: {response.status_code}")
-        
-        if response.status_code == 401:
-            error_msg = "Authentication failed: Invalid credentials or tenant"
-            logger.error(error_msg)
-            logger.error(f"Response content: {response.text}")
-            raise ValueError(error_msg)
-        elif response.status_code != 200:
-            error_msg = f"Auth API returned status code {response.status_code}"
-            logger.error(error_msg)
-            logger.error(f"Response content: {response.text}")
-            raise ValueError(error_msg)
-            
-        try:
-            data = response.json()
-            logger.info("Successfully parsed auth response")
-        except json.JSONDecodeError as e:
-            error_msg = f"Failed to parse auth response: {str(e)}"
-            logger.error(error_msg)
-            logger.error(f"Raw response: {response.text}")
-            raise ValueError(error_msg)
-            
-        if not data.get("token"):
-            error_msg = "No token in auth response"
-            logger.error(error_msg)
-            logger.error(f"Response data: {data}")
-            raise ValueError(error_msg)
-            
-        logger.info("Successfully obtained auth token")
-        return data["token"]
-        
-    except requests.exceptions.RequestException as e:
-        error_msg = f"Network error during auth: {str(e)}"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-    except Exception as e:
-        error_msg = f"Unexpected error during auth: {str(e)}"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
+    """Get API token for DQ service (cached, see dq_auth.DQTokenCache)"""
+    return get_dq_client().tokens.get_token()
 
 def get_metadata_path():
     """Get the path to the metadata CSV file"""
     return str(Path(__file__).parent.parent.parent / 'data' / 'connection_schema.csv')
 
+_catalog_lock = threading.Lock()
+_catalog_connection = None
+# Bumped by refresh_catalog, caches of catalog names reload when it changes
+_catalog_version = 0
+
+def get_catalog_cursor():
+    """Get a cursor on a shared in-memory catalog with the metadata table loaded once"""
+    global _catalog_connection
+    with _catalog_lock:
+        if _catalog_connection is None:
+            conn = duckdb.connect(database=':memory:')
+            conn.sql(f"create table metadata as select * from read_csv_auto('{get_metadata_path()}')")
+            _catalog_connection = conn
+        return _catalog_connection.cursor()
+
+def get_catalog_version() -> int:
+    """Number of catalog refreshes so far"""
+    return _catalog_version
+
+def refresh_catalog(connection_names: Optional[List[str]] = None) -> int:
+    """
+    Rebuild the metadata CSV from the DQ API and reload the shared catalog
+
+    Args:
+        connection_names: Connections to include, defaults to DQ_CATALOG_CONNECTIONS
+            (comma separated) or all JDBC pushdown connections
+
+    Returns:
+        int: Number of catalog tables
+    """
+    global _catalog_connection, _catalog_version
+    if connection_names is None:
+        connection_names = [c.strip() for c in os.getenv("DQ_CATALOG_CONNECTIONS", "").split(",") if c.strip()]
+    df = get_dq_client().fetch_catalog(connection_names)
+    if df.empty:
+        raise ValueError("DQ API returned no catalog tables")
+
+    path = get_metadata_path()
+    df.to_csv(f"{path}.tmp", index=False)
+    os.replace(f"{path}.tmp", path)
+    with _catalog_lock:
+        # Open cursors keep using the old catalog, new ones load the new file
+        _catalog_connection = None
+        _catalog_version += 1
+    return len(df)
+
+def _lookup_names(dataset: str, schema_name: str) -> Tuple[str, str]:
+    """Table and schema names to validate a job against the catalog"""
+    # remove schema name if it exists in dataset name
+    dataset2table = dataset
+    if schema_name in dataset:
+        dataset2table = dataset.replace(schema_name, "")
+
+    # if schema_name contains non-alphanumeric characters, remove them
+    if not schema_name.isalnum():
+        schema_name = re.sub(r'[^a-zA-Z0-9]+', '', schema_name)
+    return dataset2table, schema_name
+
+def _job_params(dataset: str, query: str, connection_name: str) -> Dict[str, Any]:
+    """Body for the run-job-json endpoint"""
+    return {
+        'dataset': f"AI_{dataset}",
+        'runId': datetime.now().strftime("%Y-%m-%d"),
+        'pushdown': {
+            'connectionName': connection_name,
+            'sourceQuery': query.replace("\\", "").replace("```sql", "").replace("```", "")
+        },
+        'agentId': {'id': 0}
+    }
+
+def _validate_job(dataset: str, connection_name: str, schema_name: str) -> Tuple[Optional[str], str]:
+    """Look up a job's table in the catalog, returns (error message or None, cleaned schema name)"""
+    try:
+        dataset2table, schema_name = _lookup_names(dataset, schema_name)
+        sql_statement = """
+            SELECT 1 FROM metadata
+            WHERE connection_name LIKE '%' || ? || '%'
+            AND schema_name LIKE '%' || ? || '%'
+            AND table_name LIKE '%' || ? || '%'
+            LIMIT 1
+        """
+        row = get_catalog_cursor().execute(sql_statement, [connection_name, schema_name, dataset2table]).fetchone()
+        if row is None:
+            return f"Unable to look-up and validate table {dataset} in schema {schema_name} for connection {connection_name}.", schema_name
+            
+    except Exception as e:
+        logger.error("Validation error: %s", e)
+        return f"Error validating table {dataset} in schema {schema_name} for connection {connection_name}.", schema_name
+    return None, schema_name
+
+def _track_job(params: Dict[str, Any], response: Any) -> None:
+    """Have the job watcher follow a submitted job"""
+    if response.status_code == 200:
+        get_job_watcher().track(params['dataset'], params['runId'])
+
+def _job_result(dataset: str, schema_name: str, response: Any, duplicate_age: Optional[float] = None) -> str:
+    """Tool result for a run-job-json response (requests or httpx)"""
+    if response.status_code == 200:
+        if duplicate_age is not None:
+            return (
+                f"Job for {dataset} in schema {schema_name} was already triggered {duplicate_age:.0f}s ago, "
+                f"not submitted again (use rerun to run it again). Response: {response.json()}"
+            )
+        return f"Job triggered successfully for {dataset} in schema {schema_name}. Response: {response.json()}"
+    return f"Job failed with status code {response.status_code}"
+
 def run_dq_job(
     dataset: Annotated[str, "dataset name to use"],
     query: Annotated[str, "query to use"],
     connection_name: Annotated[str, "connection name to use"], 
-    schema_name: Annotated[str, "schema name to use"]
+    schema_name: Annotated[str, "schema name to use"],
+    rerun: Annotated[bool, "true only if the user asks to run the same job again"] = False
 ) -> str:
     """Run a DQ job with the given parameters"""
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-    env_vars = Environment.get_required_vars()
-    
-    # Validate table exists
-    try:
-        conn = duckdb.connect(database=':memory:')
-        metadata_path = get_metadata_path()
-        conn.sql(f"create table metadata as select * from read_csv_auto('{metadata_path}')")
-        # schema_name = query.split(' ')[3].split('.')[0].strip()
-
-        # #if query.contains 3 periods database.schema.table 
-        # # then schema_name is the middle one
-        # if '.' in query and len(query.split('.')) == 3:
-        #     schema_name = query.split('.')[1].strip()
-
-        logger.info(f"query: {query}")
-        logger.info(f"connection_name: {connection_name}")
-        logger.info(f"schema_name: {schema_name}")
-        logger.info(f"dataset: {dataset}")
-
-        # remove schema name if it exists in dataset name
-        dataset2table = dataset
-        if schema_name in dataset:
-            dataset2table = dataset.replace(schema_name, "")
-        
-        # if schema_name contains non-alphanumeric characters, replace them with an underscore
-        if not schema_name.isalnum():
-            schema_name = re.sub(r'[^a-zA-Z0-9]+', '', schema_name)
-
-        sql_statement = f"""
-            SELECT * FROM metadata 
-            WHERE connection_name like '%{connection_name}%' 
-            AND schema_name like '%{schema_name}%' 
-            AND table_name like '%{dataset2table}%' 
-            LIMIT 1
-        """
-        logger.info(f"look-up query: {query}")
-        logger.info(f"sql statement: {sql_statement}")
+    logger.info("run_dq_job: connection_name=%s schema_name=%s dataset=%s", connection_name, schema_name, dataset)
+    logger.debug("query: %s", query)
 
-        rs = conn.sql(sql_statement.replace("\\","").replace("```sql", "").replace("```", ""))
-        if rs.to_df().shape[0] == 0:
-            return f"Unable to look-up and validate table {dataset} in schema {schema_name} for connection {connection_name}."
-            
-    except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        return f"Error validating table {dataset} in schema {schema_name} for connection {connection_name}."
+    # Validate table exists
+    error, schema_name = _validate_job(dataset, connection_name, schema_name)
+    if error:
+        return error
 
     # Run DQ job
     try:
-        token = get_api_token()
-        headers = {'Authorization': f'Bearer {token}'}
-        run_id = datetime.now().strftime("%Y-%m-%d")
-        
-        # Job paramters 
-        job_dataset_name = f"AI_{dataset}"
-        job_query = query.replace("\\", "").replace("```sql", "").replace("```", "")
-        job_connection_name = connection_name
-        job_schema_name = schema_name
-        
-        logger.info(f"job_dataset_name: {job_dataset_name}")
-        logger.info(f"job_query: {job_query}")
-        logger.info(f"job_connection_name: {job_connection_name}")
-        logger.info(f"job_schema_name: {job_schema_name}")
+        params = _job_params(dataset, query, connection_name)
+        logger.debug("job params: %s, schema: %s", params, schema_name)
         
-        params = {
-            'dataset': job_dataset_name,
-            'runId': run_id,
-            'pushdown': {
-                'connectionName': job_connection_name,
-                'sourceQuery': job_query
-            },
-            'agentId': {'id': 0}
-        }
-        
-        response = requests.post(
-            env_vars.get("DQ_URL") + '/v2/run-job-json',
-            headers=headers,
-            json=params,
-            verify=False
+        # Identical submissions within DQ_SUBMIT_DEDUP_WINDOW get the original response, unless rerun
+        response, duplicate_age = get_job_deduper().submit(
+            params, lambda: get_dq_client().request("POST", '/v2/run-job-json', "run-job-json", json=params),
+            force=rerun
         )
-        
-        if response.status_code == 200:
-            return f"Job triggered successfully for {dataset} in schema {schema_name}. Response: {response.json()}"
-        else:
-            return f"Job failed with status code {response.status_code}"
+        _track_job(params, response)
+        return _job_result(dataset, schema_name, response, duplicate_age)
             
     except Exception as e:
         logger.error(f"DQ job error: {str(e)}")
         return f"Error running DQ job: {str(e)}"
 
-def get_job_status() -> str:
-    """Check the status of DQ jobs"""
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-    env_vars = Environment.get_required_vars()
+def _validate_job_items(items: List[DQJobItem]) -> List[bool]:
+    """Look up every item's table in the catalog with a single query"""
+    rows = []
+    for index, item in enumerate(items):
+        table_name, schema_name = _lookup_names(item.dataset, item.schema_name)
+        rows.extend([index, item.connection_name, schema_name, table_name])
+    values = ", ".join(["(?, ?, ?, ?)"] * len(items))
+    sql_statement = f"""
+        SELECT DISTINCT i.idx
+        FROM (VALUES {values}) AS i(idx, connection_name, schema_name, table_name)
+        JOIN metadata m
+          ON m.connection_name LIKE '%' || i.connection_name || '%'
+         AND m.schema_name LIKE '%' || i.schema_name || '%'
+         AND m.table_name LIKE '%' || i.table_name || '%'
+    """
+    found = {row[0] for row in get_catalog_cursor().execute(sql_statement, rows).fetchall()}
+    return [index in found for index in range(len(items))]
 
+def _parse_job_items(jobs: List[Any]) -> List[DQJobItem]:
+    """Validate a batch tool's job list, raises ValueError with a message for the LLM"""
+    max_items = int(os.getenv("DQ_BATCH_MAX_JOBS", "25"))
     try:
-        token = get_api_token()
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        }
-        params = {
-            'jobStatus': 'ALL',  # Get all job statuses
-            'limit': '5',
-            'tenant': env_vars.get("DQ_TENANT")
-        }
-
-        url = f"{env_vars.get('DQ_URL')}/v2/getowlcheckq"
-        logger.info(f"Making request to: {url}")
-        logger.info(f"With params: {params}")
-
-        response = requests.get(
-            url,
-            params=params,
-            headers=headers,
-            verify=False
-        )
+        items = [job if isinstance(job, DQJobItem) else DQJobItem(**job) for job in jobs]
+    except Exception as e:
+        raise ValueError(f"invalid job list, each job needs dataset, query, connection_name, schema_name ({e})")
+    if not items:
+        raise ValueError("no jobs given")
+    if len(items) > max_items:
+        raise ValueError(f"at most {max_items} jobs per call, got {len(items)}")
+    return items
+
+def _batch_outcome(response: Any, duplicate_age: Optional[float] = None) -> Tuple[str, str]:
+    """(status, detail) for one run-job-json response of a batch"""
+    if response.status_code != 200:
+        return "failed", f"status code {response.status_code}"
+    data = response.json()
+    detail = f"job {data.get('jobId', '')}".strip()
+    if duplicate_age is not None:
+        detail += f", already submitted {duplicate_age:.0f}s ago"
+    return "submitted", detail
 
-        logger.info(f"Response status code: {response.status_code}")
-        logger.info(f"Response content: {response.text}")
+def _format_batch(items: List[DQJobItem], results: List[Tuple[str, str]]) -> str:
+    """Compact per-job status table"""
+    df = pd.DataFrame(
+        [
+            (item.dataset, item.schema_name, status, detail)
+            for item, (status, detail) in zip(items, results)
+        ],
+        columns=['dataset', 'schema', 'status', 'detail']
+    )
+    submitted_count = sum(status == "submitted" for status, _ in results)
+    return (
+        f"dq jobs: {submitted_count} of {len(items)} submitted "
+        f"~~~{df.to_markdown(index=False, tablefmt='presto')}~~~"
+    )
 
-        if response.status_code != 200:
-            error_msg = f"API returned status code {response.status_code}"
-            logger.error(error_msg)
-            return f"Error checking job status: {error_msg}"
+def _submit_job(item: DQJobItem) -> Tuple[str, str]:
+    """Submit one job of a batch, returning (status, detail)"""
+    try:
+        params = _job_params(item.dataset, item.query, item.connection_name)
+        response, duplicate_age = get_job_deduper().submit(
+            params, lambda: get_dq_client().request("POST", '/v2/run-job-json', "run-job-json", json=params),
+            force=item.rerun
+        )
+        _track_job(params, response)
+        return _batch_outcome(response, duplicate_age)
+    except Exception as e:
+        logger.error("DQ job error for %s: %s", item.dataset, e)
+        return "error", str(e)[:200]
 
-        if not response.text:
-            error_msg = "API returned empty response"
-            logger.error(error_msg)
-            return f"Error checking job status: {error_msg}"
+def run_dq_jobs(
+    jobs: Annotated[
+        List[Dict[str, str]],
+        "jobs to run, each with dataset, query, connection_name and schema_name, "
+        "and rerun true only if the user asks to run the same job again"
+    ]
+) -> str:
+    """Run DQ jobs for several tables with one call"""
+    try:
+        items = _parse_job_items(jobs)
+    except ValueError as e:
+        return f"Error running DQ jobs: {e}"
+    logger.info("run_dq_jobs: %d jobs", len(items))
 
+    try:
+        valid = _validate_job_items(items)
+    except Exception as e:
+        logger.error(f"Validation error: {str(e)}")
+        return "Error validating the tables for the DQ jobs."
+
+    results = [("not found", "table not in catalog") for _ in items]
+    to_submit = [index for index, is_valid in enumerate(valid) if is_valid]
+    if to_submit:
         try:
-            data = response.json()
-        except json.JSONDecodeError as e:
-            error_msg = f"Failed to parse JSON response: {str(e)}\nResponse text: {response.text}"
-            logger.error(error_msg)
-            return f"Error checking job status: {error_msg}"
-
-        if not data.get('data'):
-            return "No jobs found in the last 5 runs"
-
-        df = pd.DataFrame(data['data'], columns=['dataset', 'status', 'activity'])
-        if df.empty:
-            return "No jobs found in the last 5 runs"
-            
-        return f"job status: ~~~{df.to_markdown(index=False, tablefmt='presto', floatfmt='.0%').replace('000','')}~~~"
+            # Sign in (if needed) once up front rather than in every worker
+            get_api_token()
+        except Exception as e:
+            logger.error(f"DQ job error: {str(e)}")
+            return f"Error running DQ jobs: {str(e)}"
+
+        # A bounded number of submissions in flight over the shared DQ connection pool
+        concurrency = max(1, min(len(to_submit), int(os.getenv("DQ_BATCH_CONCURRENCY", "4"))))
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dq-batch") as pool:
+            submitted = pool.map(lambda index: _submit_job(items[index]), to_submit)
+            for index, outcome in zip(to_submit, submitted):
+                results[index] = outcome
+
+    return _format_batch(items, results)
+
+def job_status_params() -> Tuple[Dict[str, str], Dict[str, str]]:
+    """(params, headers) for the getowlcheckq endpoint"""
+    env_vars = Environment.get_required_vars()
+    headers = {
+        'Content-Type': 'application/json',
+        'Accept': 'application/json'
+    }
+    params = {
+        'jobStatus': 'ALL',  # Get all job statuses
+        'limit': '5',
+        'tenant': env_vars.get("DQ_TENANT")
+    }
+    return params, headers
+
+def current_job_history() -> JobHistory:
+    """Job history of the configured DQ tenant"""
+    return get_job_history(Environment.get_required_vars().get("DQ_TENANT"))
+
+def job_page_params(offset: int, limit: int) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """(params, headers) for one page of the getowlcheckq endpoint"""
+    params, headers = job_status_params()
+    params.update({'limit': str(limit), 'offset': str(offset)})
+    return params, headers
+
+def job_page_rows(response: Any) -> List[Dict[str, Any]]:
+    """Job rows of a getowlcheckq response (requests or httpx), raises ValueError on a bad response"""
+    logger.debug("Job status response status code: %s", response.status_code)
+    log_payload(logger, "Job status response content", response.text)
+
+    if response.status_code != 200:
+        raise ValueError(f"API returned status code {response.status_code}")
+    if not response.text:
+        raise ValueError("API returned empty response")
+    try:
+        data = response.json()
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Failed to parse JSON response: {str(e)}")
+    return data.get('data') or []
+
+def fetch_job_page(offset: int, limit: int) -> List[Dict[str, Any]]:
+    """One page of the DQ job queue, newest first"""
+    params, headers = job_page_params(offset, limit)
+    response = get_dq_client().request("GET", '/v2/getowlcheckq', "getowlcheckq", params=params, headers=headers)
+    return job_page_rows(response)
+
+def _pending_jobs(history: JobHistory, dataset_prefix: str) -> List[Dict[str, Any]]:
+    """Jobs submitted from here that DQ doesn't list yet, newest first"""
+    prefix = dataset_prefix.lower()
+    return [
+        {"dataset": job["dataset"], "status": job["status"], "activity": "not listed by DQ yet"}
+        for job in get_job_watcher().tracked_jobs()
+        if job["dataset"].lower().startswith(prefix) and not history.has_job(job["dataset"], job["run_id"])
+    ]
+
+def _format_job_history(history: JobHistory, dataset_prefix: str, limit: int) -> str:
+    """Tool result for the newest jobs of a job history, with the watcher's just-submitted jobs first"""
+    limit = max(1, min(int(limit), int(os.getenv("DQ_STATUS_MAX_ROWS", "50"))))
+    pending = _pending_jobs(history, dataset_prefix)
+    rows = (pending + history.jobs(dataset_prefix, limit))[:limit]
+    total = len(pending) + history.count(dataset_prefix)
+    as_of = datetime.fromtimestamp(history.synced_at, timezone.utc).strftime("%H:%M:%S UTC")
+    matching = f"jobs with datasets starting with {dataset_prefix}" if dataset_prefix else "jobs"
+    if not rows:
+        return f"No {matching} found (as of {as_of})"
+
+    df = pd.DataFrame(rows, columns=['dataset', 'status', 'activity'])
+    return (
+        f"job status, newest {len(rows)} of {total} {matching} (as of {as_of}): "
+        f"~~~{df.to_markdown(index=False, tablefmt='presto')}~~~"
+    )
+
+def get_job_status(
+    dataset_prefix: Annotated[str, "only jobs whose dataset starts with this, e.g. AI_ for jobs run from here"] = "",
+    limit: Annotated[int, "number of jobs to show, newest first"] = 5
+) -> str:
+    """Check the status of DQ jobs"""
+    try:
+        history = current_job_history()
+        # The job watcher keeps the history fresh, otherwise fetch what changed since the last look
+        if not get_job_watcher().fresh():
+            history.sync(fetch_job_page)
+        return _format_job_history(history, dataset_prefix, limit)
     
     except requests.exceptions.RequestException as e:
         error_msg = f"Network error: {str(e)}"
@@ -256,11 +371,16 @@ def get_job_status() -> str:
 def run_sql_statement(sql_statement: Annotated[str, "SQL statement to execute"]) -> str:
     """Run a SQL statement on the metadata table"""
     try:
-        conn = duckdb.connect(database=':memory:')
-        metadata_path = get_metadata_path()
-        conn.sql(f"create table metadata as select * from read_csv_auto('{metadata_path}')")
-        rs = conn.sql(sql_statement.replace("\\","").replace("```sql", "").replace("```", ""))
-        return f"results: ~~~{sql_statement} \n {rs.to_df().drop_duplicates().head(15).to_markdown(index=False)}~~~"
+        statement = sql_statement.replace("\\","").replace("```sql", "").replace("```", "")
+        # The catalog is shared by every session, so it only answers queries
+        if not re.match(r"\s*(select|with)\b", statement, re.IGNORECASE):
+            return "Error executing SQL: only select queries on the metadata table are allowed"
+        cursor = get_catalog_cursor()
+        try:
+            df = cursor.execute(statement).df()
+        finally:
+            cursor.close()
+        return f"results: ~~~{sql_statement} \n {df.drop_duplicates().head(15).to_markdown(index=False)}~~~"
     
     except Exception as e:
         logger.error(f"Error running SQL statement: {str(e)}")
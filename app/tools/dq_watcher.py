@@ -0,0 +1,249 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+from .dq_history import TERMINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+JobKey = Tuple[str, str]
+
+
+class DQJobWatcher:
+    """
+    Background poller of the DQ job queue with an in-memory status table
+
+    Syncs the tenant's job history every DQ_WATCH_INTERVAL seconds, and
+    every DQ_WATCH_ACTIVE_INTERVAL seconds while jobs submitted from here
+    haven't finished, so the job status tool answers from it instead of
+    calling DQ. The newest jobs are mirrored in a status table, and status
+    changes are pushed to subscribers (the SSE endpoint).
+    Runs as a task on the event loop it was started on.
+    """
+
+    def __init__(self, interval: float = 30.0, active_interval: float = 5.0,
+                 limit: int = 50, max_age: float = 120.0, track_ttl: float = 900.0):
+        self.interval = interval
+        self.active_interval = active_interval
+        self.limit = limit
+        self.max_age = max_age
+        self.track_ttl = track_ttl
+
+        self._lock = threading.Lock()
+        self._jobs: Dict[JobKey, Dict[str, Any]] = {}
+        self._order: List[JobKey] = []
+        self._tracked: Dict[JobKey, float] = {}
+        self._fetched_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._polls = 0
+        self._subscribers: Set[asyncio.Queue] = set()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start polling on the running event loop"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+        logger.info("DQ job watcher started (interval %.0f s, %.0f s while jobs run)", self.interval, self.active_interval)
+
+    async def stop(self) -> None:
+        """Stop polling (application shutdown)"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def track(self, dataset: str, run_id: str) -> None:
+        """
+        Watch a job submitted from here, polling faster until it finishes
+
+        Safe to call from any thread.
+
+        Args:
+            dataset: DQ dataset name (as submitted, e.g. "AI_table")
+            run_id: Run id of the submission
+        """
+        key = (dataset, run_id)
+        with self._lock:
+            self._tracked[key] = time.time()
+            if key not in self._jobs:
+                self._jobs[key] = {"dataset": dataset, "run_id": run_id, "status": "SUBMITTED",
+                                   "activity": "", "changed_at": time.time()}
+                self._order.insert(0, key)
+        loop = self._loop
+        if self.running and loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake.set)
+
+    def tracked_jobs(self) -> List[Dict[str, Any]]:
+        """Jobs submitted from here within the track TTL, newest first (safe from any thread)"""
+        cutoff = time.time() - self.track_ttl
+        with self._lock:
+            tracked = sorted(self._tracked.items(), key=lambda item: item[1], reverse=True)
+            return [dict(self._jobs[key]) for key, tracked_at in tracked if tracked_at >= cutoff and key in self._jobs]
+
+    def _active(self) -> bool:
+        """Whether a tracked job is still running"""
+        cutoff = time.time() - self.track_ttl
+        with self._lock:
+            for key, tracked_at in list(self._tracked.items()):
+                job = self._jobs.get(key)
+                if tracked_at < cutoff or (job is not None and job["status"] in TERMINAL_STATUSES):
+                    del self._tracked[key]
+            return bool(self._tracked)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._last_error = str(e)
+                logger.warning("DQ job watcher poll failed: %s", e)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(), self.active_interval if self._active() else self.interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def poll(self) -> List[Dict[str, Any]]:
+        """
+        Fetch the job queue once and update the status table
+
+        Returns:
+            List[Dict[str, Any]]: Status changes since the previous poll
+        """
+        # Imported lazily, the DQ tools import this module
+        from .dq_async import a_fetch_job_page
+        from .dq_tools import current_job_history
+
+        # Only new and changed jobs are fetched, the history has the rest
+        history = current_job_history()
+        await history.a_sync(a_fetch_job_page)
+        rows = history.jobs(limit=self.limit)
+
+        now = time.time()
+        changes = []
+        with self._lock:
+            first_poll = self._fetched_at is None
+            jobs: Dict[JobKey, Dict[str, Any]] = {}
+            for row in rows:
+                key = (row.get("dataset") or "", str(row.get("runId") or row.get("run_id") or ""))
+                if key in jobs:
+                    continue
+                previous = self._jobs.get(key)
+                job = {
+                    "dataset": key[0],
+                    "run_id": key[1],
+                    "status": row.get("status") or "",
+                    "activity": row.get("activity") or "",
+                    "changed_at": now,
+                }
+                if previous is not None and (previous["status"], previous["activity"]) == (job["status"], job["activity"]):
+                    job["changed_at"] = previous["changed_at"]
+                elif not first_poll or key in self._tracked:
+                    changes.append(dict(job, previous=previous["status"] if previous else None))
+                jobs[key] = job
+            # Submitted jobs DQ doesn't list yet stay at the top
+            pending = [key for key in self._order if key in self._tracked and key not in jobs]
+            for key in pending:
+                jobs[key] = self._jobs[key]
+            self._order = pending + [key for key in jobs if key not in pending]
+            self._jobs = jobs
+            self._fetched_at = now
+            self._last_error = None
+            self._polls += 1
+
+        for change in changes:
+            self._publish(change)
+        if changes:
+            logger.info("DQ job watcher: %d status changes", len(changes))
+        return changes
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning("Dropping DQ job event for a slow subscriber")
+
+    def subscribe(self, max_queued: int = 100) -> asyncio.Queue:
+        """Queue receiving status changes, call on the watcher's event loop"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def snapshot(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Current status table
+
+        Args:
+            limit: Number of jobs to include, newest first (all if None)
+
+        Returns:
+            Dict[str, Any]: jobs, fetched_at (epoch seconds or None) and age in seconds
+        """
+        with self._lock:
+            keys = self._order if limit is None else self._order[:limit]
+            jobs = [dict(self._jobs[key]) for key in keys]
+            fetched_at = self._fetched_at
+        return {
+            "jobs": jobs,
+            "fetched_at": fetched_at,
+            "age": round(time.time() - fetched_at, 1) if fetched_at is not None else None,
+            "error": self._last_error,
+        }
+
+    def fresh(self) -> bool:
+        """Whether the watcher is running and synced the job history within max_age"""
+        age = self.snapshot(0)["age"]
+        return self.running and age is not None and age <= self.max_age
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "polls": self._polls,
+                "jobs": len(self._jobs),
+                "tracked": len(self._tracked),
+                "subscribers": len(self._subscribers),
+                "age": round(time.time() - self._fetched_at, 1) if self._fetched_at is not None else None,
+            }
+
+
+_watcher: Optional[DQJobWatcher] = None
+_watcher_lock = threading.Lock()
+
+def get_job_watcher() -> DQJobWatcher:
+    """Get the shared DQ job watcher (started by the app, see DQ_JOB_WATCHER)"""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = DQJobWatcher(
+                interval=float(os.getenv("DQ_WATCH_INTERVAL", "30")),
+                active_interval=float(os.getenv("DQ_WATCH_ACTIVE_INTERVAL", "5")),
+                limit=int(os.getenv("DQ_WATCH_LIMIT", "50")),
+                max_age=float(os.getenv("DQ_WATCH_MAX_AGE", "120")),
+                track_ttl=float(os.getenv("DQ_WATCH_TRACK_TTL", "900")),
+            )
+        return _watcher
@@ -1,25 +1,18 @@
-import requests
 import pandas as pd
 from typing import Dict
-from .dq_tools import DQTools
+from .dq_client import get_dq_client
 
 class JobTools:
     @staticmethod
     def get_job_status() -> str:
         try:
-            token = DQTools.get_api_token()
-            headers = {'Authorization': f'Bearer {token}'}
             params = {
                 'jobStatus': '',
                 'limit': '5',
             }
 
-            response = requests.get(
-                os.environ.get("DQ_URL") + '/v2/getowlcheckq',
-                params=params,
-                headers=headers,
-                verify=False
-            )
+            # Pooled connection and cached token, see dq_client.DQClient
+            response = get_dq_client().request("GET", '/v2/getowlcheckq', "getowlcheckq", params=params)
 
             df = pd.DataFrame(
                 response.json()['data'],
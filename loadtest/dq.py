@@ -0,0 +1,96 @@
+"""
+Drive the DQ clients against the local DQ stand-in
+
+Compares the thread-per-request DQClient with the asyncio AsyncDQClient for
+many concurrent status requests, and checks the catalog and job operations.
+
+Usage:
+    python -m loadtest.dq --requests 500 --concurrency 200 --dq-latency-ms 100
+    python -m loadtest.dq --simulated  # in-process DQ simulator instead of the fake server
+"""
+import os
+import time
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from . import fake_dq
+from .run import _serve
+
+_STATUS_PARAMS = {'jobStatus': 'ALL', 'limit': '5', 'tenant': 'loadtest'}
+
+
+def _sync_run(base_url: str, requests_count: int, concurrency: int) -> Dict[str, Any]:
+    from app.tools.dq_client import DQClient
+
+    client = DQClient(base_url, "loadtest", "loadtest", "loadtest", pool_size=concurrency)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        statuses = list(pool.map(
+            lambda _: client.request("GET", "/v2/getowlcheckq", "getowlcheckq", params=_STATUS_PARAMS).status_code,
+            range(requests_count)
+        ))
+    elapsed = time.perf_counter() - started
+    client.close()
+    return {"elapsed": elapsed, "errors": sum(status != 200 for status in statuses), "sign_ins": client.tokens.sign_ins}
+
+
+async def _async_run(base_url: str, requests_count: int, concurrency: int) -> Dict[str, Any]:
+    from app.tools.dq_async import AsyncDQClient
+
+    client = AsyncDQClient(base_url, "loadtest", "loadtest", "loadtest", max_connections=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> int:
+        async with semaphore:
+            return (await client.job_status(_STATUS_PARAMS)).status_code
+
+    try:
+        # Exercise the other operations once
+        catalog = await client.fetch_catalog()
+        job = await client.run_job({'dataset': 'AI_LOADTEST', 'runId': '2024-01-01', 'pushdown': {}})
+        assert catalog and job.status_code == 200, "catalog or job submission failed"
+
+        started = time.perf_counter()
+        statuses: List[int] = await asyncio.gather(*[one() for _ in range(requests_count)])
+        elapsed = time.perf_counter() - started
+    finally:
+        await client.aclose()
+    return {
+        "elapsed": elapsed,
+        "errors": sum(status != 200 for status in statuses),
+        "sign_ins": client.sign_ins,
+        "catalog_rows": len(catalog),
+    }
+
+
+def main(argv: List[str] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Compare the sync and async DQ clients against a fake DQ service")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--dq-latency-ms", type=float, default=100.0)
+    parser.add_argument("--dq-port", type=int, default=8702)
+    parser.add_argument("--simulated", action="store_true", help="Use the DQ simulator (DQ_URL=sim://)")
+    args = parser.parse_args(argv)
+
+    if args.simulated:
+        os.environ.setdefault("DQ_SIM_LATENCY_MS", str(args.dq_latency_ms))
+        os.environ.setdefault("DQ_SIM_JITTER_MS", "0")
+        base_url = "sim://dq"
+    else:
+        _serve(fake_dq.create_app(latency_ms=args.dq_latency_ms, jitter_ms=0), args.dq_port)
+        base_url = f"http://127.0.0.1:{args.dq_port}"
+
+    report = {}
+    for name, result in (
+        ("sync", _sync_run(base_url, args.requests, args.concurrency)),
+        ("async", asyncio.run(_async_run(base_url, args.requests, args.concurrency))),
+    ):
+        report[name] = dict(result, requests_per_second=round(args.requests / result["elapsed"], 1))
+        print(f"{name:>6}: " + ", ".join(f"{key}={value}" for key, value in report[name].items()))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import random
+import asyncio
+import itertools
+from collections import deque
+from fastapi import FastAPI, Request
+
+
+def create_app(latency_ms: float = 50.0, jitter_ms: float = 20.0) -> FastAPI:
+    """
+    Local stand-in for the DQ endpoints the tools call
+
+    Args:
+        latency_ms: Mean response latency
+        jitter_ms: Uniform latency jitter (+/-)
+    """
+    app = FastAPI(title="Fake DQ")
+    app.state.calls = 0
+    job_ids = itertools.count(1)
+    jobs = deque(maxlen=50)
+
+    async def delay():
+        app.state.calls += 1
+        await asyncio.sleep(max(0.0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000)
+
+    @app.post("/v3/auth/signin")
+    async def signin():
+        await delay()
+        return {"token": "fake-token"}
+
+    @app.post("/v2/run-job-json")
+    async def run_job(request: Request):
+        await delay()
+        body = await request.json()
+        job_id = next(job_ids)
+        jobs.appendleft({
+            "jobId": job_id, "dataset": body.get("dataset"), "runId": body.get("runId"),
+            "status": "FINISHED", "activity": "PUSHDOWN"
+        })
+        return {"jobId": job_id, "dataset": body.get("dataset"), "runId": body.get("runId")}
+
+    @app.get("/v2/getowlcheckq")
+    async def job_status(limit: int = 5, offset: int = 0):
+        await delay()
+        if not jobs:
+            return {"data": [{"dataset": "AI_SAMPLE", "status": "FINISHED", "activity": "PUSHDOWN"}][offset:offset + limit]}
+        return {"data": list(jobs)[offset:offset + limit]}
+
+    @app.get("/v2/getconnectionaliases")
+    async def connection_aliases():
+        await delay()
+        return [
+            {"aliasname": f"FAKE_PUSHDOWN_{index}", "isPushdown": 1, "connectionType": "jdbc"}
+            for index in range(3)
+        ]
+
+    @app.get("/v2/getconnectionschematreebyaliasname")
+    async def schema_tree(aliasname: str):
+        await delay()
+        return {
+            f"SCHEMA_{schema}": {str(table): f"{aliasname}_TABLE_{table}" for table in range(5)}
+            for schema in range(2)
+        }
+
+    return app
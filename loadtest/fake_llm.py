@@ -0,0 +1,146 @@
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import itertools
+from typing import Any, Dict, List, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# First catalog row, used for canned tool arguments
+_CONNECTION = "APPROVED_SNOWFLAKE_PUSHDOWN"
+_SCHEMA = "UNDERSCORE_TEST"
+_TABLE = "ACCOUNTS_TEST8"
+
+
+def _question(messages: List[Dict[str, Any]]) -> str:
+    """Latest user question in the conversation"""
+    for message in reversed(messages):
+        content = message.get("content")
+        if message.get("role") == "user" and isinstance(content, str) \
+                and not content.startswith(("Context from previous tool", "Thank you. I will review")):
+            return content
+    return ""
+
+
+def _tool_call(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [{
+            "id": f"call_{hashlib.md5(f'{name}{time.time_ns()}'.encode()).hexdigest()[:12]}",
+            "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments)},
+        }],
+    }
+
+
+def script_reply(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pick a canned reply that mimics the agent the request came from
+
+    Args:
+        body: Chat completions request body
+
+    Returns:
+        Dict[str, Any]: Assistant message
+    """
+    messages = body.get("messages") or []
+    text = " ".join(m["content"] for m in messages if isinstance(m.get("content"), str))
+    question = _question(messages).lower()
+    wants_jobs = any(word in question for word in ("job", "status", "dq"))
+
+    # GroupChatManager speaker selection
+    if "select the next role" in text:
+        candidates = re.findall(r"\[([^\]]*)\]", text[text.rindex("select the next role"):])
+        names = re.findall(r"'([^']+)'", candidates[0]) if candidates else []
+        preferred = "Job_Assistant" if wants_jobs else "SQL_Assistant"
+        return {"role": "assistant", "content": preferred if preferred in names or not names else names[0]}
+
+    if messages and messages[-1].get("role") == "tool":
+        return {"role": "assistant", "content": "The tool returned the requested results. TERMINATE"}
+
+    tools = [tool["function"]["name"] for tool in body.get("tools") or []]
+    if "run_dq_job" in tools and "run" in question:
+        return _tool_call("run_dq_job", {
+            "dataset": _TABLE,
+            "query": f"select * from {_SCHEMA}.{_TABLE} limit 10000",
+            "connection_name": _CONNECTION,
+            "schema_name": _SCHEMA,
+        })
+    if "get_job_status" in tools and wants_jobs:
+        return _tool_call("get_job_status", {})
+    if "run_sql_statement" in tools:
+        return _tool_call("run_sql_statement", {
+            "sql_statement": f"select * from metadata where lower(connection_name) = lower('{_CONNECTION}') "
+                             f"and lower(schema_name) = lower('{_SCHEMA}') limit 30"
+        })
+
+    return {"role": "assistant", "content": f"Summary: answered '{question[:80]}'. TERMINATE"}
+
+
+def create_app(latency_ms: float = 200.0, jitter_ms: float = 50.0,
+               requests_per_minute: int = 10000, tokens_per_minute: int = 2000000) -> FastAPI:
+    """
+    OpenAI-compatible fake LLM server
+
+    Args:
+        latency_ms: Mean response latency
+        jitter_ms: Uniform latency jitter (+/-)
+        requests_per_minute: Limit advertised in x-ratelimit headers
+        tokens_per_minute: Token limit advertised in x-ratelimit headers
+    """
+    app = FastAPI(title="Fake LLM")
+    app.state.calls = 0
+    ids = itertools.count(1)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.calls += 1
+        await asyncio.sleep(max(0.0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000)
+
+        message = script_reply(body)
+        prompt_tokens = len(json.dumps(body.get("messages"))) // 4 + len(json.dumps(body.get("tools") or [])) // 4
+        static_tokens = (len(json.dumps(body.get("tools") or [])) + len(str(body["messages"][0].get("content")))) // 4
+        # Providers cache prefixes of at least 1024 tokens in 128 token steps
+        cached_tokens = static_tokens // 128 * 128 if static_tokens >= 1024 else 0
+        completion_tokens = len(json.dumps(message)) // 4
+        return JSONResponse(
+            content={
+                "id": f"chatcmpl-fake-{next(ids)}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [{
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                    "prompt_tokens_details": {"cached_tokens": cached_tokens},
+                },
+            },
+            headers={
+                "x-ratelimit-limit-requests": str(requests_per_minute),
+                "x-ratelimit-limit-tokens": str(tokens_per_minute),
+            },
+        )
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs: Optional[List[str]] = body.get("input")
+        inputs = [inputs] if isinstance(inputs, str) else inputs or []
+        data = []
+        for index, text in enumerate(inputs):
+            digest = hashlib.sha256(text.encode("utf-8")).digest()
+            data.append({"object": "embedding", "index": index, "embedding": [b / 255 for b in digest]})
+        return {"object": "list", "data": data, "model": body.get("model"), "usage": {"prompt_tokens": 0, "total_tokens": 0}}
+
+    return app
@@ -0,0 +1,154 @@
+"""
+Load test the chat API against a scripted fake LLM and a local DQ stand-in
+
+Usage:
+    python -m loadtest.run --sessions 20 --turns 5 --concurrency 10 --llm-latency-ms 200
+
+Requires a .env file (cp .env.example .env); the settings below take precedence over it.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+import uvicorn
+
+from . import fake_dq, fake_llm
+
+PROMPTS = [
+    "list the tables in schema UNDERSCORE_TEST for connection APPROVED_SNOWFLAKE_PUSHDOWN",
+    "what's the status of the dq jobs",
+    "use sql, count tables with 'ACCOUNTS' in the name",
+    "run a dq job for ACCOUNTS_TEST8",
+    "show me all connections",
+]
+
+
+def _serve(app: Any, port: int) -> uvicorn.Server:
+    """Run an app with uvicorn in a daemon thread"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+
+async def _run_session(client: httpx.AsyncClient, session_id: str, turns: int,
+                       semaphore: asyncio.Semaphore, latencies: List[float], errors: List[str]):
+    last_seen_id = None
+    for turn in range(turns):
+        payload = {
+            "message": PROMPTS[turn % len(PROMPTS)],
+            "session_id": session_id,
+            "response_mode": "lean",
+            "last_seen_id": last_seen_id,
+        }
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.post("/api/v1/chat", json=payload)
+                latencies.append(time.perf_counter() - started)
+                body = response.json()
+                if response.status_code != 200 or body.get("error"):
+                    errors.append(f"{response.status_code}: {str(body)[:200]}")
+                last_seen_id = body.get("last_id", last_seen_id)
+            except Exception as e:
+                latencies.append(time.perf_counter() - started)
+                errors.append(str(e))
+
+
+async def _drive(app: Any, sessions: int, turns: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors: List[str] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=600) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            _run_session(client, f"loadtest-{index}", turns, semaphore, latencies, errors)
+            for index in range(sessions)
+        ])
+        elapsed = time.perf_counter() - started
+    return {"latencies": latencies, "errors": errors, "elapsed": elapsed}
+
+
+def main(argv: List[str] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Load test the chat API with a fake LLM and DQ service")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent chat sessions")
+    parser.add_argument("--turns", type=int, default=5, help="Turns per session")
+    parser.add_argument("--concurrency", type=int, default=10, help="Maximum in-flight requests")
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--dq-latency-ms", type=float, default=50.0)
+    parser.add_argument("--llm-port", type=int, default=8701)
+    parser.add_argument("--dq-port", type=int, default=8702)
+    parser.add_argument("--llm-cache", action="store_true", help="Keep the LLM response cache enabled")
+    args = parser.parse_args(argv)
+
+    if not (Path(__file__).resolve().parent.parent / ".env").exists():
+        sys.exit("A .env file is required (cp .env.example .env)")
+
+    llm_app = fake_llm.create_app(latency_ms=args.llm_latency_ms, jitter_ms=args.llm_jitter_ms)
+    dq_app = fake_dq.create_app(latency_ms=args.dq_latency_ms)
+    _serve(llm_app, args.llm_port)
+    _serve(dq_app, args.dq_port)
+
+    # Point the app at the fakes before it is imported (the chat service is created at import)
+    os.environ.update({
+        "LLM_PROVIDER": "openai",
+        "LLM_PROVIDERS": "",
+        "OPENAI_API_KEY": "fake-key",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{args.llm_port}/v1",
+        "DQ_URL": f"http://127.0.0.1:{args.dq_port}",
+        "DQ_USERNAME": "loadtest",
+        "DQ_CREDENTIAL": "loadtest",
+        "DQ_TENANT": "loadtest",
+        "LLM_CACHE_ENABLED": "true" if args.llm_cache else "false",
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+    })
+
+    from main import app
+
+    # Only allocations made while driving the sessions are counted
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    result = asyncio.run(_drive(app, args.sessions, args.turns, args.concurrency))
+    memory_after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    latencies = result["latencies"]
+    report = {
+        "requests": len(latencies),
+        "errors": len(result["errors"]),
+        "elapsed_seconds": round(result["elapsed"], 2),
+        "requests_per_second": round(len(latencies) / result["elapsed"], 2) if result["elapsed"] else 0.0,
+        "latency_p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+        "latency_p90_ms": round(_percentile(latencies, 90) * 1000, 1),
+        "latency_p95_ms": round(_percentile(latencies, 95) * 1000, 1),
+        "latency_p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+        "memory_per_session_kb": round((memory_after - memory_before) / 1024 / max(1, args.sessions), 1),
+        "llm_calls": llm_app.state.calls,
+        "dq_calls": dq_app.state.calls,
+    }
+    for name, value in report.items():
+        print(f"{name:>24}: {value}")
+    for error in result["errors"][:5]:
+        print(f"error: {error}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
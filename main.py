@@ -4,12 +4,14 @@ load_dotenv()
 
 # Standard library imports
 import os
+import asyncio
 import logging
 from pathlib import Path
 import datetime
 
-# Set up basic logging
-logging.basicConfig(level=logging.INFO)
+# Set up logging before anything logs (queue-based, see app/core/logging.py)
+from app.core.logging import setup_logging
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Log environment variables for debugging
@@ -17,12 +19,11 @@ logger.info(f"LLM_PROVIDER from env: {os.getenv('LLM_PROVIDER')}")
 
 # Third-party imports
 from fastapi import FastAPI, Request, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 # Local application imports
 from app.api.routes import router
-from app.core.logging import setup_logging
 from app.core.session import SessionManager
 from app.models.models import ChatRequest, ChatResponse, ClearRequest, ClearResponse
 from app.core.config.paths import DataPaths
@@ -30,9 +31,16 @@ from app.core.config.environment import Environment
 from app.services.retrieval_service import RetrievalService
 from app.services.sql_service import SQLService
 from app.services.chat_service import ChatService
-
-# Setup logging
-setup_logging()
+from app.agents.llm_transport import LLMTransportPool
+from app.agents.tool_executor import shutdown_tool_pool
+from app.tools.dq_client import close_dq_client
+from app.tools.dq_async import close_async_dq_client
+from app.tools.dq_watcher import get_job_watcher
+from app.tools.dq_tools import refresh_catalog
+from app.tools.dq_resilience import get_breaker_stats
+from app.core.background_loop import get_background_loop
+from app.core.compression import StreamingAwareGZipMiddleware
+from app.core.metrics import ACTIVE_SESSIONS, CONTENT_TYPE_LATEST, render_metrics
 
 # Initialize environment
 Environment.initialize()
@@ -52,8 +60,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (long chat histories) for clients that accept gzip,
+# except the server-sent event streams, which have to reach the client as written
+app.add_middleware(
+    StreamingAwareGZipMiddleware,
+    minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", "1000")),
+    exclude_paths=("/api/v1/dq/jobs/events",)
+)
+
 # Initialize session manager
 session_manager = SessionManager()
+ACTIVE_SESSIONS.set_function(lambda: len(session_manager._sessions))
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -85,6 +102,18 @@ async def startup_event():
             
         # Initialize database connections if needed
         logger.info("Initializing database connections...")
+
+        # Poll the DQ job queue in the background, the job status tool answers from it
+        if os.getenv("DQ_JOB_WATCHER", "true").lower() == "true":
+            get_job_watcher().start()
+
+        if os.getenv("DQ_CATALOG_REFRESH_ON_STARTUP", "false").lower() == "true":
+            # The bundled metadata CSV stays in use if DQ can't be reached
+            try:
+                tables = await asyncio.to_thread(refresh_catalog)
+                logger.info("Refreshed DQ catalog: %d tables", tables)
+            except Exception as e:
+                logger.warning("DQ catalog refresh failed, using the existing metadata file: %s", e)
         
         # Initialize any other required services
         logger.info("All services initialized successfully")
@@ -105,6 +134,12 @@ async def shutdown_event():
         
         # Close any open connections
         logger.info("Closing database connections...")
+        LLMTransportPool.close()
+        shutdown_tool_pool()
+        close_dq_client()
+        await get_job_watcher().stop()
+        await close_async_dq_client()
+        get_background_loop().stop(cleanup=close_async_dq_client())
         
         logger.info("Cleanup completed successfully")
     except Exception as e:
@@ -145,9 +180,12 @@ async def health_check():
     try:
         # Add any additional health checks here
         # For example, check database connectivity
+        dq_circuits = get_breaker_stats()
+        degraded = any(stats["state"] != "closed" for stats in dq_circuits.values())
         return {
-            "status": "healthy",
+            "status": "degraded" if degraded else "healthy",
             "active_sessions": len(session_manager._sessions),
+            "dq_circuits": dq_circuits,
             "version": "1.0.0"
         }
     except Exception as e:
@@ -160,6 +198,11 @@ async def health_check():
             }
         )
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/retrieve")
 async def test_retrieve(query: str = Query(..., description="The query to retrieve similar documents for")):
     """Test endpoint for retrieval functionality"""
@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+
+pytest.importorskip("autogen")
+pytest.importorskip("duckdb")
+
+from app.chat.chat_manager import ChatManager
+
+LLM_CONFIG = {"config_list": [{"model": "gpt-4o", "api_key": "test"}], "cache_seed": None}
+
+
+class Passthrough:
+    async def process(self, message):
+        return message
+
+
+@pytest.fixture
+def chat_manager(monkeypatch):
+    manager = ChatManager(LLM_CONFIG)
+    # Stands in for the agents: the question, a tool round trip and an answer per turn
+    def initiate_chat(recipient, message, **kwargs):
+        turn = len(manager._transcript)
+        recipient.groupchat.messages.extend([
+            {"content": message, "role": "user", "name": manager.user_proxy.name},
+            {"content": None, "role": "assistant", "name": manager.sql_assistant.name,
+             "tool_calls": [{"id": f"call_{turn}", "type": "function",
+                             "function": {"name": "run_sql_statement", "arguments": "{\"sql_statement\": \"select 1\"}"}}]},
+            {"content": "~~~| 1 |~~~", "role": "tool", "name": manager.executor.name,
+             "tool_responses": [{"tool_call_id": f"call_{turn}", "role": "tool", "content": "~~~| 1 |~~~"}]},
+            {"content": f"answer {turn} " + "x" * 800 + " TERMINATE", "role": "user",
+             "name": manager.reviewer_assistant.name},
+        ])
+    monkeypatch.setattr(manager.user_proxy, "initiate_chat", initiate_chat)
+    monkeypatch.setattr(manager.fast_path, "answer", lambda message, history=None: None)
+    return manager
+
+
+def _turn(manager, message):
+    return asyncio.run(manager.group_chat(message, [], Passthrough()))
+
+
+def test_transform_memo_hits_across_turns(chat_manager):
+    transform = chat_manager.clean_transform
+    _turn(chat_manager, "list the tables in SALES")
+    _turn(chat_manager, "and in FINANCE?")
+    hits, misses = transform.cache_hits, transform.cache_misses
+
+    _turn(chat_manager, "run a dq job for ORDERS")
+
+    # Turn 3 only transforms turn 2's messages, turn 1's come from the memo
+    assert transform.cache_hits - hits >= 4
+    assert transform.cache_misses - misses <= 4
+
+
+def test_context_is_built_from_the_original_messages(chat_manager):
+    _turn(chat_manager, "list the tables in SALES")
+    _turn(chat_manager, "and in FINANCE?")
+
+    # The agents' own long answer, not the truncated copy the group chat resumed with
+    answers = [m["content"] for m in chat_manager._raw_messages if str(m.get("content")).startswith("answer 0")]
+    assert answers and len(answers[0]) > 800
+    assert any("tool_calls" in m for m in chat_manager._raw_messages)
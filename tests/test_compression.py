@@ -0,0 +1,83 @@
+import asyncio
+import gzip
+import pytest
+
+pytest.importorskip("fastapi")
+
+from app.core.compression import StreamingAwareGZipMiddleware
+
+EVENTS_PATH = "/api/v1/dq/jobs/events"
+
+
+def _scope(path: str, accept: bytes = b"*/*"):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": [(b"accept-encoding", b"gzip"), (b"accept", accept)],
+    }
+
+
+async def _event_stream(scope, receive, send):
+    """An SSE endpoint that writes one event and then stays open"""
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"text/event-stream")],
+    })
+    await send({"type": "http.response.body", "body": b"event: snapshot\ndata: {}\n\n", "more_body": True})
+    await asyncio.Event().wait()
+
+
+async def _large_json(scope, receive, send):
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json")],
+    })
+    await send({"type": "http.response.body", "body": b'{"data": "' + b"x" * 5000 + b'"}'})
+
+
+async def _first_body(app, scope, timeout: float = 1.0):
+    """Headers and the first body chunk the client receives, within timeout"""
+    messages = []
+    got_body = asyncio.Event()
+
+    async def receive():
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+        if message["type"] == "http.response.body" and message.get("body"):
+            got_body.set()
+
+    task = asyncio.ensure_future(app(scope, receive, send))
+    try:
+        await asyncio.wait_for(got_body.wait(), timeout)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    headers = dict(messages[0]["headers"])
+    body = next(m["body"] for m in messages if m["type"] == "http.response.body" and m.get("body"))
+    return headers, body
+
+
+def test_event_stream_arrives_promptly_with_gzip_accepted():
+    app = StreamingAwareGZipMiddleware(_event_stream, minimum_size=10, exclude_paths=(EVENTS_PATH,))
+    headers, body = asyncio.run(_first_body(app, _scope(EVENTS_PATH)))
+    assert b"content-encoding" not in headers
+    assert body.startswith(b"event: snapshot")
+
+
+def test_event_stream_accept_header_skips_gzip():
+    app = StreamingAwareGZipMiddleware(_event_stream, minimum_size=10)
+    headers, body = asyncio.run(_first_body(app, _scope("/elsewhere", accept=b"text/event-stream")))
+    assert b"content-encoding" not in headers
+    assert body.startswith(b"event: snapshot")
+
+
+def test_other_responses_still_gzipped():
+    app = StreamingAwareGZipMiddleware(_large_json, minimum_size=10, exclude_paths=(EVENTS_PATH,))
+    headers, body = asyncio.run(_first_body(app, _scope("/api/v1/chat")))
+    assert headers[b"content-encoding"] == b"gzip"
+    assert gzip.decompress(body).startswith(b'{"data": "x')
@@ -0,0 +1,74 @@
+from app.preprocessing.context_builder import ContextBuilder
+
+
+def _message(content, name="Reviewer_Assistant"):
+    return {"content": content, "role": "user", "name": name}
+
+
+def _conversation(turns):
+    messages = []
+    for n in range(turns):
+        messages.append(_message(f"question {n}: " + "word " * 40, name="Admin_User"))
+        messages.append(_message(f"answer {n}: " + "text " * 40))
+    return messages
+
+
+def test_keeps_newest_messages_within_budget():
+    builder = ContextBuilder(token_budget=200, summary_budget=50)
+    messages = _conversation(10)
+
+    kept, summary = builder.build(messages)
+
+    assert sum(builder.count_tokens(m) for m in kept) <= 200 - 50
+    assert kept == messages[-len(kept):]
+    assert summary is not None and summary["content"].startswith("Summary of earlier conversation:")
+    # The newest dropped question survives the summary budget
+    assert f"question {(len(messages) - len(kept) - 1) // 2}" in summary["content"]
+
+
+def test_everything_fits_without_summary():
+    builder = ContextBuilder(token_budget=10000)
+    messages = _conversation(3)
+
+    assert builder.build(messages) == (messages, None)
+
+
+def test_latest_catalog_context_is_pinned():
+    builder = ContextBuilder(token_budget=200, summary_budget=50)
+    catalog = _message("results: select * from metadata where lower(connection_name) = lower('SNOWFLAKE_PD')")
+    messages = [catalog] + _conversation(10)
+
+    kept, summary = builder.build(messages)
+
+    assert kept[0] is catalog
+    assert kept[1:] == messages[-(len(kept) - 1):]
+    assert sum(builder.count_tokens(m) for m in kept) <= 150
+
+
+def test_summary_collects_dropped_entities_within_its_budget():
+    builder = ContextBuilder(token_budget=120, summary_budget=60)
+    sql = [
+        _message(f"run_sql_statement select * from metadata where lower(schema_name) like lower('%SCHEMA_{n}%')")
+        for n in range(30)
+    ]
+    messages = sql + _conversation(5)
+
+    kept, summary = builder.build(messages)
+
+    assert "Referenced schemas:" in summary["content"]
+    # SCHEMA_29 is the pinned catalog message, the oldest items are trimmed to fit the budget
+    assert "SCHEMA_28" in summary["content"] and "SCHEMA_0," not in summary["content"]
+    assert builder._count_text(summary["content"]) <= 60
+
+
+def test_summary_is_reused_until_more_messages_drop():
+    builder = ContextBuilder(token_budget=200, summary_budget=50)
+    messages = _conversation(10)
+    kept, summary = builder.build(messages)
+
+    # The client sends the summary back with the kept messages
+    again, same = builder.build([summary] + kept)
+    assert again == kept and same is summary
+
+    _, newer = builder.build(kept + _conversation(12)[-4:])
+    assert newer is not summary
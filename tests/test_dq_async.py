@@ -0,0 +1,147 @@
+import json
+import time
+import base64
+import asyncio
+import itertools
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("duckdb")
+pytest.importorskip("pandas")
+pytest.importorskip("requests")
+
+from app.tools import dq_async
+from app.tools.dq_async import AsyncDQClient
+
+_base_urls = (f"http://dq-test-{n}" for n in itertools.count())
+
+
+def _jwt(ttl: float) -> str:
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+    return f"{encode({'alg': 'none'})}.{encode({'exp': time.time() + ttl, 'n': time.monotonic_ns()})}.test"
+
+
+class FakeDQ:
+    """DQ API answering signin and run-job-json, counting the calls"""
+
+    def __init__(self, token_ttl: float = 600.0, signin_delay: float = 0.0):
+        self.token_ttl = token_ttl
+        self.signin_delay = signin_delay
+        self.sign_ins = 0
+        self.reject_all = False
+        self.rejected = set()
+        self.job_delays = {}
+        self.job_calls = []
+        self.jobs_answered = 0
+
+    async def __call__(self, request):
+        if request.url.path == "/v3/auth/signin":
+            self.sign_ins += 1
+            await asyncio.sleep(self.signin_delay)
+            token = _jwt(self.token_ttl)
+            if self.reject_all:
+                self.rejected.add(token)
+            return httpx.Response(200, json={"token": token})
+        token = request.headers.get("Authorization", "")[len("Bearer "):]
+        if request.url.path == "/v2/run-job-json":
+            body = json.loads(request.content)
+            self.job_calls.append((body["dataset"], token))
+            if token in self.rejected:
+                return httpx.Response(401, json={"error": "expired"})
+            await asyncio.sleep(self.job_delays.get(body["dataset"], 0))
+            self.jobs_answered += 1
+            return httpx.Response(200, json={"jobId": self.jobs_answered, "dataset": body["dataset"]})
+        return httpx.Response(404)
+
+    def client(self) -> AsyncDQClient:
+        return AsyncDQClient(next(_base_urls), "user", "secret", "tenant", transport=httpx.MockTransport(self))
+
+
+def test_get_token_refreshes_in_background_before_expiry():
+    async def run():
+        dq = FakeDQ(token_ttl=30)
+        client = dq.client()
+        client.refresh_margin = 60
+        first = await client.get_token()
+        # Inside the refresh margin the current token is handed out while a new one is fetched
+        assert await client.get_token() == first
+        await client._refresh_task
+        second = await client.get_token()
+        await client.aclose()
+        return dq, client, first, second
+
+    dq, client, first, second = asyncio.run(run())
+    assert second != first
+    assert dq.sign_ins == client.sign_ins == 2
+
+
+def test_concurrent_refresh_signs_in_once():
+    async def run():
+        dq = FakeDQ(signin_delay=0.05)
+        client = dq.client()
+        tokens = await asyncio.gather(*[client.get_token() for _ in range(10)])
+        await client.aclose()
+        return dq, client, tokens
+
+    dq, client, tokens = asyncio.run(run())
+    assert len(set(tokens)) == 1
+    assert dq.sign_ins == client.sign_ins == 1
+
+
+def test_rejected_token_signs_in_again_and_retries_once():
+    async def run():
+        dq = FakeDQ()
+        client = dq.client()
+        dq.rejected.add(await client.get_token())
+        response = await client.run_job({"dataset": "AI_ORDERS", "runId": "2024-01-01"})
+        await client.aclose()
+        return dq, response
+
+    dq, response = asyncio.run(run())
+    assert response.status_code == 200
+    assert dq.sign_ins == 2
+    assert [dataset for dataset, _ in dq.job_calls] == ["AI_ORDERS", "AI_ORDERS"]
+    assert dq.job_calls[0][1] != dq.job_calls[1][1]
+
+
+def test_rejected_new_token_is_not_retried_again():
+    async def run():
+        dq = FakeDQ()
+        dq.reject_all = True
+        client = dq.client()
+        response = await client.run_job({"dataset": "AI_ORDERS", "runId": "2024-01-01"})
+        await client.aclose()
+        return dq, response
+
+    dq, response = asyncio.run(run())
+    assert response.status_code == 401
+    assert len(dq.job_calls) == 2
+    assert dq.sign_ins == 2
+
+
+def test_batch_outcomes_keep_job_order(monkeypatch):
+    dq = FakeDQ()
+    # The first job answers last
+    dq.job_delays = {"AI_BATCH_A": 0.1, "AI_BATCH_B": 0.05}
+    client = dq.client()
+    batches = []
+    monkeypatch.setattr(dq_async, "get_async_dq_client", lambda: client)
+    monkeypatch.setattr(dq_async, "_validate_job_items", lambda items: [item.dataset != "BATCH_MISSING" for item in items])
+    monkeypatch.setattr(dq_async, "_track_job", lambda params, response: None)
+    monkeypatch.setattr(dq_async, "_format_batch", lambda items, outcomes: batches.append((items, outcomes)) or "")
+    jobs = [
+        {"dataset": name, "query": f"select * from SALES.{name}", "connection_name": "SNOWFLAKE", "schema_name": "SALES"}
+        for name in ["BATCH_A", "BATCH_MISSING", "BATCH_B", "BATCH_C"]
+    ]
+
+    async def run():
+        await dq_async.a_run_dq_jobs(jobs)
+        await client.aclose()
+
+    asyncio.run(run())
+    items, outcomes = batches[0]
+    assert [item.dataset for item in items] == ["BATCH_A", "BATCH_MISSING", "BATCH_B", "BATCH_C"]
+    assert [status for status, _ in outcomes] == ["submitted", "not found", "submitted", "submitted"]
+    # DQ answered C, B, A, the outcomes still follow the order the jobs were given in
+    assert [detail for _, detail in outcomes] == ["job 3", "table not in catalog", "job 2", "job 1"]
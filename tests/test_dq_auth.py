@@ -0,0 +1,84 @@
+import json
+import time
+import base64
+import threading
+import pytest
+
+from app.tools.dq_auth import DQTokenCache, decode_expiry
+
+
+def _jwt(ttl: float, n: int) -> str:
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+    return f"{encode({'alg': 'none'})}.{encode({'exp': time.time() + ttl, 'n': n})}.test"
+
+
+class SignIn:
+    """Sign-in stand-in issuing numbered tokens"""
+
+    def __init__(self, ttl: float = 600.0, delay: float = 0.0):
+        self.ttl = ttl
+        self.delay = delay
+        self.tokens = []
+
+    def __call__(self) -> str:
+        time.sleep(self.delay)
+        self.tokens.append(_jwt(self.ttl, len(self.tokens)))
+        return self.tokens[-1]
+
+
+def test_decode_expiry():
+    token = _jwt(60, 0)
+    assert decode_expiry(token) == pytest.approx(time.time() + 60, abs=1)
+    assert decode_expiry("not-a-jwt") is None
+
+
+def test_token_is_reused_until_the_refresh_margin():
+    sign_in = SignIn(ttl=600)
+    cache = DQTokenCache(sign_in, refresh_margin=60)
+
+    assert cache.get_token() == cache.get_token() == sign_in.tokens[0]
+    assert cache.get_stats()["sign_ins"] == 1 and cache.get_stats()["hits"] == 1
+
+
+def test_token_inside_the_margin_is_served_while_refreshing():
+    sign_in = SignIn(ttl=30)
+    cache = DQTokenCache(sign_in, refresh_margin=60)
+    first = cache.get_token()
+
+    assert cache.get_token() == first
+    deadline = time.time() + 2
+    while cache.get_stats()["sign_ins"] < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.get_token() == sign_in.tokens[-1] != first
+
+
+def test_concurrent_callers_sign_in_once():
+    sign_in = SignIn(delay=0.05)
+    cache = DQTokenCache(sign_in)
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(cache.get_token())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(sign_in.tokens) == 1
+    assert set(tokens) == {sign_in.tokens[0]}
+
+
+def test_rejected_token_is_replaced_once():
+    sign_in = SignIn()
+    cache = DQTokenCache(sign_in)
+    rejected = cache.get_token()
+
+    # Two callers with the same rejected token, the second gets the first one's new token
+    renewed = cache.invalidate(rejected)
+    assert cache.invalidate(rejected) == renewed != rejected
+    assert len(sign_in.tokens) == 2
+
+
+def test_opaque_token_uses_the_default_ttl():
+    cache = DQTokenCache(lambda: "opaque", default_ttl=600)
+    assert cache.get_token() == "opaque"
+    assert cache.get_stats()["expires_in"] == pytest.approx(600, abs=1)
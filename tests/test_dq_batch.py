@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip("duckdb")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("requests")
+pytest.importorskip("httpx")
+pytest.importorskip("tabulate")
+
+from app.tools import dq_client, dq_tools
+from app.tools.dq_client import DQClient
+from app.tools.dq_dedup import JobSubmissionDeduper
+from app.tools.dq_simulator import DQSimulator
+from app.tools.dq_watcher import DQJobWatcher
+
+CATALOG = [
+    ("SIM_SNOWFLAKE_PUSHDOWN", "SALES", "ORDERS"),
+    ("SIM_SNOWFLAKE_PUSHDOWN", "SALES", "CUSTOMERS"),
+    ("SIM_SNOWFLAKE_PUSHDOWN", "FINANCE", "INVOICES"),
+]
+
+
+@pytest.fixture
+def dq(monkeypatch, tmp_path):
+    metadata_path = tmp_path / "connection_schema.csv"
+    pd.DataFrame(CATALOG, columns=["connection_name", "schema_name", "table_name"]).to_csv(metadata_path, index=False)
+    monkeypatch.setattr(dq_tools, "get_metadata_path", lambda: str(metadata_path))
+    monkeypatch.setattr(dq_tools, "_catalog_connection", None)
+
+    simulator, watcher = DQSimulator(latency_ms=20, jitter_ms=0, job_failure_rate=0, seed=1), DQJobWatcher()
+    monkeypatch.setattr(dq_client, "get_dq_simulator", lambda: simulator)
+    client = DQClient("sim://", "user", "secret", "tenant")
+    monkeypatch.setattr(dq_tools, "get_dq_client", lambda: client)
+    monkeypatch.setattr(dq_tools, "get_job_deduper", lambda: JobSubmissionDeduper())
+    monkeypatch.setattr(dq_tools, "get_job_watcher", lambda: watcher)
+    yield simulator, client, watcher
+    client.close()
+
+
+def _job(name, schema="SALES"):
+    return {"dataset": name, "query": f"select * from {schema}.{name}", "connection_name": "SNOWFLAKE", "schema_name": schema}
+
+
+def test_batch_submits_catalog_tables_in_order(dq):
+    simulator, client, watcher = dq
+
+    result = dq_tools.run_dq_jobs([_job("ORDERS"), _job("MISSING"), _job("INVOICES", "FINANCE"), _job("CUSTOMERS")])
+
+    assert result.startswith("dq jobs: 3 of 4 submitted")
+    table = result.split("~~~")[1].splitlines()[2:]
+    assert [line.split("|")[0].strip() for line in table] == ["ORDERS", "MISSING", "INVOICES", "CUSTOMERS"]
+    assert "table not in catalog" in table[1]
+    assert simulator.get_stats()["jobs"] == 3
+    # One sign-in for the whole batch, every submission is followed by the watcher
+    assert client.tokens.get_stats()["sign_ins"] == 1
+    assert sorted(job["dataset"] for job in watcher.tracked_jobs()) == ["AI_CUSTOMERS", "AI_INVOICES", "AI_ORDERS"]
+
+
+def test_batch_without_catalog_tables_makes_no_dq_calls(dq):
+    simulator, client, watcher = dq
+
+    assert dq_tools.run_dq_jobs([_job("MISSING")]).startswith("dq jobs: 0 of 1 submitted")
+    assert simulator.get_stats()["calls"] == 0
+
+
+@pytest.mark.parametrize("jobs, error", [
+    ([], "no jobs given"),
+    ([{"dataset": "ORDERS"}], "invalid job list"),
+    ([_job(f"T{n}") for n in range(26)], "at most 25 jobs per call"),
+])
+def test_invalid_batches_are_explained(dq, jobs, error):
+    result = dq_tools.run_dq_jobs(jobs)
+    assert result.startswith("Error running DQ jobs:") and error in result
+    assert dq[0].get_stats()["calls"] == 0
@@ -0,0 +1,91 @@
+import pytest
+
+pytest.importorskip("duckdb")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("requests")
+pytest.importorskip("tabulate")
+
+from app.tools import dq_tools
+
+CATALOG = [
+    ("APPROVED_SNOWFLAKE_PUSHDOWN", "SALES", "ORDERS"),
+    ("APPROVED_SNOWFLAKE_PUSHDOWN", "SALES", "CUSTOMERS"),
+    ("APPROVED_BIGQUERY_PUSHDOWN", "MARKETING", "CAMPAIGNS"),
+]
+COLUMNS = ["connection_name", "schema_name", "table_name"]
+
+
+@pytest.fixture
+def metadata_path(monkeypatch, tmp_path):
+    path = tmp_path / "connection_schema.csv"
+    pd.DataFrame(CATALOG, columns=COLUMNS).to_csv(path, index=False)
+    monkeypatch.setattr(dq_tools, "get_metadata_path", lambda: str(path))
+    monkeypatch.setattr(dq_tools, "_catalog_connection", None)
+    return path
+
+
+def test_sql_statement_reads_the_catalog_once(metadata_path, monkeypatch):
+    first = dq_tools.run_sql_statement("select table_name from metadata where schema_name = 'SALES' order by 1")
+    assert "CUSTOMERS" in first and "ORDERS" in first and "CAMPAIGNS" not in first
+
+    # Later statements use the loaded table, not the file
+    metadata_path.unlink()
+    second = dq_tools.run_sql_statement("```sql\nselect count(*) as tables from metadata\n```")
+    assert "Error" not in second and "3" in second
+
+
+def test_sql_statement_cannot_change_the_shared_catalog(metadata_path):
+    assert dq_tools.run_sql_statement("drop table metadata").startswith("Error executing SQL")
+    assert dq_tools.run_sql_statement("delete from metadata").startswith("Error executing SQL")
+    assert "ORDERS" in dq_tools.run_sql_statement("select * from metadata")
+
+
+def test_sql_errors_are_returned_to_the_agent(metadata_path):
+    assert dq_tools.run_sql_statement("select missing_column from metadata").startswith("Error executing SQL")
+
+
+@pytest.fixture
+def simulated_client(monkeypatch):
+    from app.tools import dq_client
+    from app.tools.dq_client import DQClient
+    from app.tools.dq_simulator import DQSimulator
+
+    simulator = DQSimulator(latency_ms=0, jitter_ms=0, seed=1)
+    monkeypatch.setattr(dq_client, "get_dq_simulator", lambda: simulator)
+    client = DQClient("sim://", "user", "secret", "tenant")
+    monkeypatch.setattr(dq_tools, "get_dq_client", lambda: client)
+    yield client
+    client.close()
+
+
+def test_refresh_rebuilds_the_catalog_from_dq(metadata_path, simulated_client, monkeypatch):
+    monkeypatch.delenv("DQ_CATALOG_CONNECTIONS", raising=False)
+    old_cursor = dq_tools.get_catalog_cursor()
+    version = dq_tools.get_catalog_version()
+
+    # Every JDBC pushdown connection of the tenant, file connections are skipped
+    assert dq_tools.refresh_catalog() == 13
+    assert dq_tools.get_catalog_version() == version + 1
+    connections = dq_tools.run_sql_statement("select distinct connection_name from metadata")
+    assert "SIM_SQL_SERVER_PD" in connections and "SIM_LOCAL_FILES" not in connections
+    assert "APPROVED_SNOWFLAKE_PUSHDOWN" not in connections
+    # A cursor opened before the refresh still answers from the old catalog
+    assert old_cursor.execute("select count(*) from metadata").fetchone() == (3,)
+    assert pd.read_csv(metadata_path)["connection_name"].nunique() == 2
+
+
+def test_refresh_of_named_connections(metadata_path, simulated_client, monkeypatch):
+    monkeypatch.setenv("DQ_CATALOG_CONNECTIONS", "SIM_SQL_SERVER_PD")
+    assert dq_tools.refresh_catalog() == 6
+    assert "SIM_SNOWFLAKE_PUSHDOWN" not in dq_tools.run_sql_statement("select * from metadata")
+
+
+def test_failed_refresh_keeps_the_catalog(metadata_path, simulated_client):
+    version = dq_tools.get_catalog_version()
+
+    with pytest.raises(Exception):
+        dq_tools.refresh_catalog(["UNKNOWN_CONNECTION"])
+
+    assert dq_tools.get_catalog_version() == version
+    assert "ORDERS" in dq_tools.run_sql_statement("select * from metadata")
+    assert len(pd.read_csv(metadata_path)) == 3
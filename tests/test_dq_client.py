@@ -0,0 +1,64 @@
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("pandas")
+
+from app.tools import dq_client
+from app.tools.dq_client import DQClient
+from app.tools.dq_resilience import CircuitBreaker, DQUnavailableError
+from app.tools.dq_simulator import DQSimulator
+
+
+def test_sign_in_with_open_circuit_raises_unavailable():
+    client = DQClient("http://dq-test-open-circuit", "user", "secret", "tenant")
+    for _ in range(client.breaker.failure_threshold):
+        client.breaker.record_failure()
+
+    with pytest.raises(DQUnavailableError):
+        client.sign_in()
+    with pytest.raises(DQUnavailableError):
+        client.tokens.get_token()
+    client.close()
+
+
+@pytest.fixture
+def simulated(monkeypatch):
+    monkeypatch.setenv("DQ_BACKOFF_BASE", "0")
+    simulator = DQSimulator(latency_ms=0, jitter_ms=0, seed=1)
+    monkeypatch.setattr(dq_client, "get_dq_simulator", lambda: simulator)
+    client = DQClient("sim://", "user", "secret", "tenant")
+    client.breaker = CircuitBreaker("sim-test", failure_threshold=10)
+    yield simulator, client
+    client.close()
+
+
+def test_requests_share_one_sign_in(simulated):
+    simulator, client = simulated
+    for _ in range(3):
+        assert client.request("GET", "/v2/getowlcheckq", "getowlcheckq", params={"limit": 5}).status_code == 200
+
+    assert client.tokens.get_stats()["sign_ins"] == 1
+    assert simulator.get_stats()["calls"] == 4
+
+
+def test_rejected_token_signs_in_again(simulated):
+    simulator, client = simulated
+    client.tokens.get_token()
+    # A token the tenant no longer accepts, though it hasn't expired locally
+    client.tokens._token = client.tokens._token[:-len(".sim")] + ".old"
+
+    assert client.request("GET", "/v2/getowlcheckq", "getowlcheckq").status_code == 200
+    assert client.tokens.get_stats()["sign_ins"] == 2
+
+
+def test_only_idempotent_calls_are_retried(simulated):
+    simulator, client = simulated
+    client.tokens.get_token()
+    simulator.error_rate = 1.0
+
+    assert client.request("GET", "/v2/getowlcheckq", "getowlcheckq").status_code == 503
+    assert simulator.get_stats()["errors"] == 3
+    job = {"dataset": "AI_ORDERS", "runId": "2024-01-01"}
+    assert client.request("POST", "/v2/run-job-json", "run-job-json", json=job).status_code == 503
+    assert simulator.get_stats()["errors"] == 4
+    assert client.breaker.get_stats()["consecutive_failures"] == 4
@@ -0,0 +1,88 @@
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pandas")
+pytest.importorskip("requests")
+
+from app.tools import dq_tools
+from app.tools.dq_dedup import JobSubmissionDeduper
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+
+    def json(self):
+        return {"jobId": self.job_id}
+
+
+class FakeClient:
+    def __init__(self):
+        self.submitted = []
+
+    def request(self, method, path, endpoint, json=None):
+        self.submitted.append(json["dataset"])
+        return FakeResponse(len(self.submitted))
+
+
+@pytest.fixture
+def dq(monkeypatch):
+    client, deduper = FakeClient(), JobSubmissionDeduper(window=600)
+    monkeypatch.setattr(dq_tools, "get_dq_client", lambda: client)
+    monkeypatch.setattr(dq_tools, "get_job_deduper", lambda: deduper)
+    monkeypatch.setattr(dq_tools, "_validate_job", lambda dataset, connection_name, schema_name: (None, schema_name))
+    monkeypatch.setattr(dq_tools, "_track_job", lambda params, response: None)
+    return client
+
+
+def _run(**kwargs):
+    return dq_tools.run_dq_job("ORDERS", "select * from SALES.ORDERS limit 10000", "SNOWFLAKE", "SALES", **kwargs)
+
+
+def test_repeated_job_within_the_window_is_not_resubmitted(dq):
+    first, second = _run(), _run()
+
+    assert dq.submitted == ["AI_ORDERS"]
+    assert "Job triggered successfully" in first
+    assert "already triggered" in second and "'jobId': 1" in second
+
+
+def test_rerun_submits_again(dq):
+    _run()
+    rerun = _run(rerun=True)
+
+    assert dq.submitted == ["AI_ORDERS", "AI_ORDERS"]
+    assert "Job triggered successfully" in rerun and "'jobId': 2" in rerun
+    # Later duplicates are collapsed into the rerun
+    assert "'jobId': 2" in _run()
+
+
+def test_batch_rerun_per_job(dq, monkeypatch):
+    monkeypatch.setattr(dq_tools, "_validate_job_items", lambda items: [True] * len(items))
+    monkeypatch.setattr(dq_tools, "get_api_token", lambda: "token")
+    monkeypatch.setattr(dq_tools, "_format_batch", lambda items, results: results)
+    jobs = [
+        {"dataset": name, "query": f"select * from SALES.{name}", "connection_name": "SNOWFLAKE", "schema_name": "SALES"}
+        for name in ["ORDERS", "CUSTOMERS"]
+    ]
+    dq_tools.run_dq_jobs(jobs)
+    results = dq_tools.run_dq_jobs([dict(jobs[0], rerun=True), jobs[1]])
+
+    assert sorted(dq.submitted) == ["AI_CUSTOMERS", "AI_ORDERS", "AI_ORDERS"]
+    assert results[0][0] == "submitted" and "already submitted" not in results[0][1]
+    assert "already submitted" in results[1][1]
+
+
+def test_failed_submissions_are_retried():
+    deduper = JobSubmissionDeduper(window=600)
+    params = {"dataset": "AI_ORDERS", "runId": "2024-01-01", "pushdown": {"sourceQuery": "select 1"}}
+
+    class Failed:
+        status_code = 500
+
+    response, age = deduper.submit(params, lambda: Failed())
+    assert response.status_code == 500 and age is None
+    response, age = deduper.submit(params, lambda: FakeResponse(7))
+    assert response.job_id == 7 and age is None
@@ -0,0 +1,122 @@
+import time
+import asyncio
+import threading
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pandas")
+pytest.importorskip("requests")
+
+from app.tools import dq_tools, dq_async
+from app.tools.dq_history import JobHistory
+from app.tools.dq_watcher import DQJobWatcher
+
+
+def _row(job_id, dataset, status="FINISHED", run_id="2024-01-01"):
+    return {"jobId": job_id, "dataset": dataset, "runId": run_id, "status": status, "activity": "PUSHDOWN"}
+
+
+class FakeQueue:
+    """getowlcheckq over a list of rows, newest first"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.pages = 0
+
+    def page(self, offset, limit):
+        self.pages += 1
+        return [dict(row) for row in self.rows[offset:offset + limit]]
+
+    async def a_page(self, offset, limit):
+        return self.page(offset, limit)
+
+
+@pytest.fixture
+def dq(monkeypatch):
+    queue, history, watcher = FakeQueue([_row(2, "AI_ORDERS"), _row(1, "AI_CUSTOMERS")]), JobHistory("t"), DQJobWatcher()
+    monkeypatch.setattr(dq_tools, "current_job_history", lambda: history)
+    monkeypatch.setattr(dq_tools, "get_job_watcher", lambda: watcher)
+    monkeypatch.setattr(dq_tools, "fetch_job_page", queue.page)
+    monkeypatch.setattr(dq_async, "a_fetch_job_page", queue.a_page)
+    return queue, history, watcher
+
+
+def test_job_status_shows_submitted_jobs_dq_does_not_list_yet(dq):
+    queue, history, watcher = dq
+    watcher.track("AI_INVOICES", "2024-01-01")
+
+    status = dq_tools.get_job_status(limit=5)
+    assert "newest 3 of 3 jobs" in status
+    assert status.index("AI_INVOICES") < status.index("AI_ORDERS")
+    assert "not listed by DQ yet" in status
+
+    queue.rows.insert(0, _row(3, "AI_INVOICES", status="RUNNING"))
+    status = dq_tools.get_job_status(limit=5)
+    assert status.count("AI_INVOICES") == 1
+    assert "not listed by DQ yet" not in status and "RUNNING" in status
+
+
+def test_job_status_prefix_applies_to_submitted_jobs(dq):
+    queue, history, watcher = dq
+    watcher.track("AI_INVOICES", "2024-01-01")
+
+    status = dq_tools.get_job_status(dataset_prefix="AI_ORD")
+    assert "AI_INVOICES" not in status and "AI_ORDERS" in status
+
+
+def test_sync_and_async_sync_do_not_overlap():
+    history, running, overlaps = JobHistory("t", page_size=1, max_pages=3), [0], []
+
+    def fetch(offset, limit):
+        running[0] += 1
+        overlaps.append(running[0])
+        time.sleep(0.02)
+        running[0] -= 1
+        return [_row(10 - offset, f"AI_{offset}")]
+
+    async def a_fetch(offset, limit):
+        running[0] += 1
+        overlaps.append(running[0])
+        await asyncio.sleep(0.02)
+        running[0] -= 1
+        return [_row(10 - offset, f"AI_{offset}")]
+
+    thread = threading.Thread(target=history.sync, args=(fetch,))
+    thread.start()
+    asyncio.run(history.a_sync(a_fetch))
+    thread.join()
+    assert max(overlaps) == 1
+    assert history.count() == 3
+
+
+def test_watcher_publishes_status_changes(dq):
+    queue, history, watcher = dq
+
+    async def run():
+        events = watcher.subscribe()
+        await watcher.poll()
+        queue.rows[0]["status"] = "FAILED"
+        queue.rows.insert(0, _row(3, "AI_INVOICES", status="RUNNING"))
+        changes = await watcher.poll()
+        return changes, [events.get_nowait() for _ in range(events.qsize())]
+
+    changes, events = asyncio.run(run())
+    assert events == changes
+    assert {(c["dataset"], c["status"], c["previous"]) for c in changes} == {
+        ("AI_ORDERS", "FAILED", "FINISHED"), ("AI_INVOICES", "RUNNING", None)
+    }
+
+
+def test_watcher_keeps_tracked_jobs_on_top_until_listed(dq):
+    queue, history, watcher = dq
+    watcher.track("AI_INVOICES", "2024-01-01")
+
+    asyncio.run(watcher.poll())
+    assert [job["dataset"] for job in watcher.snapshot()["jobs"]] == ["AI_INVOICES", "AI_ORDERS", "AI_CUSTOMERS"]
+    assert watcher._active()
+
+    queue.rows.insert(0, _row(3, "AI_INVOICES"))
+    asyncio.run(watcher.poll())
+    assert watcher.snapshot(1)["jobs"][0]["status"] == "FINISHED"
+    # Finished, the watcher drops back to the normal interval
+    assert not watcher._active()
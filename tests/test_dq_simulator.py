@@ -0,0 +1,108 @@
+import time
+import asyncio
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("requests")
+pytest.importorskip("pandas")
+pytest.importorskip("duckdb")
+
+from app.tools import dq_async, dq_client
+from app.tools.dq_async import AsyncDQClient
+from app.tools.dq_client import DQClient
+from app.tools.dq_resilience import CircuitBreaker
+from app.tools.dq_simulator import DQSimulator, is_simulated
+
+
+def _sign_in(simulator):
+    status, payload = simulator.handle("POST", "/v3/auth/signin", {}, {"username": "user", "password": "secret"}, {})
+    assert status == 200
+    return {"Authorization": f"Bearer {payload['token']}"}
+
+
+def _submit(simulator, headers, dataset):
+    return simulator.handle("POST", "/v2/run-job-json", {}, {"dataset": dataset, "runId": "2024-01-01"}, headers)
+
+
+def test_sim_url_selects_the_simulator():
+    assert is_simulated("sim://") and is_simulated("SIM://tenant")
+    assert not is_simulated("https://dq.example.com") and not is_simulated(None)
+
+
+def test_jobs_move_through_their_statuses():
+    simulator = DQSimulator(job_seconds=0.2, job_failure_rate=0, seed=1)
+    headers = _sign_in(simulator)
+    status, job = _submit(simulator, headers, "AI_ORDERS")
+    assert (status, job["status"]) == (200, "SUBMITTED")
+
+    seen = []
+    deadline = time.time() + 2
+    while (not seen or seen[-1] != "FINISHED") and time.time() < deadline:
+        _, page = simulator.handle("GET", "/v2/getowlcheckq", {"limit": "5"}, None, headers)
+        if not seen or seen[-1] != page["data"][0]["status"]:
+            seen.append(page["data"][0]["status"])
+        time.sleep(0.005)
+    assert seen == ["SUBMITTED", "RUNNING", "FINISHED"]
+
+
+def test_job_queue_pages_newest_first_and_filters_by_status():
+    simulator = DQSimulator(job_seconds=60, seed=1)
+    headers = _sign_in(simulator)
+    for n in range(7):
+        _submit(simulator, headers, f"AI_T{n}")
+
+    _, page = simulator.handle("GET", "/v2/getowlcheckq", {"limit": "3", "offset": "2"}, None, headers)
+    assert [row["dataset"] for row in page["data"]] == ["AI_T4", "AI_T3", "AI_T2"]
+    _, finished = simulator.handle("GET", "/v2/getowlcheckq", {"jobStatus": "FINISHED"}, None, headers)
+    assert finished["data"] == []
+
+
+def test_calls_need_a_valid_token():
+    simulator = DQSimulator(token_ttl=-1, seed=1)
+    assert simulator.handle("GET", "/v2/getowlcheckq", {}, None, {})[0] == 401
+    assert simulator.handle("GET", "/v2/getowlcheckq", {}, None, _sign_in(simulator))[0] == 401
+    assert simulator.handle("POST", "/v3/auth/signin", {}, {"username": "user"}, {})[0] == 401
+
+
+def test_unknown_calls_are_not_found():
+    simulator = DQSimulator(seed=1)
+    headers = _sign_in(simulator)
+    assert simulator.handle("GET", "/v2/unknown", {}, None, headers)[0] == 404
+    params = {"aliasname": "UNKNOWN"}
+    assert simulator.handle("GET", "/v2/getconnectionschematreebyaliasname", params, None, headers)[0] == 404
+
+
+def test_slow_call_times_out_the_sync_client(monkeypatch):
+    simulator = DQSimulator(latency_ms=0, jitter_ms=0, slow_rate=1.0, slow_ms=200, seed=1)
+    monkeypatch.setattr(dq_client, "get_dq_simulator", lambda: simulator)
+    monkeypatch.setenv("DQ_RETRIES", "0")
+    client = DQClient("sim://", "user", "secret", "tenant", read_timeout=0.05)
+    client.breaker = CircuitBreaker("sim-timeout-test")
+
+    started = time.monotonic()
+    with pytest.raises(ValueError, match="timed out"):
+        client.sign_in()
+    assert time.monotonic() - started < 0.15
+    client.close()
+
+
+def test_async_client_talks_to_the_same_simulator(monkeypatch):
+    simulator = DQSimulator(latency_ms=20, jitter_ms=0, job_seconds=60, seed=1)
+    monkeypatch.setattr(dq_async, "get_dq_simulator", lambda: simulator)
+
+    async def run():
+        client = AsyncDQClient("sim://", "user", "secret", "tenant")
+        client.breaker = CircuitBreaker("sim-async-test")
+        started = time.monotonic()
+        responses = await asyncio.gather(*[
+            client.run_job({"dataset": f"AI_T{n}", "runId": "2024-01-01"}) for n in range(10)
+        ])
+        elapsed = time.monotonic() - started
+        await client.aclose()
+        return responses, elapsed
+
+    responses, elapsed = asyncio.run(run())
+    assert [response.status_code for response in responses] == [200] * 10
+    assert simulator.get_stats()["jobs"] == 10
+    # The simulated latency is awaited, so the submissions overlap
+    assert elapsed < 0.15
@@ -0,0 +1,95 @@
+import time
+import asyncio
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pandas")
+pytest.importorskip("requests")
+
+from app.tools import dq_tools, dq_async
+from app.tools.dq_history import JobHistory
+from app.tools.dq_watcher import DQJobWatcher
+
+
+class FakeQueue:
+    """getowlcheckq over a list of rows, newest first, counting the fetches"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.fetches = 0
+        self.error = None
+
+    async def page(self, offset, limit):
+        self.fetches += 1
+        if self.error:
+            raise self.error
+        return [dict(row) for row in self.rows[offset:offset + limit]]
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    queue, history = FakeQueue([{"jobId": 1, "dataset": "AI_ORDERS", "runId": "2024-01-01", "status": "FINISHED"}]), JobHistory("t")
+    monkeypatch.setattr(dq_async, "a_fetch_job_page", queue.page)
+    monkeypatch.setattr(dq_tools, "current_job_history", lambda: history)
+    return queue
+
+
+def test_watcher_polls_faster_while_tracked_jobs_run(queue):
+    watcher = DQJobWatcher(interval=10, active_interval=0.05)
+
+    async def run():
+        watcher.start()
+        await asyncio.sleep(0.05)
+        idle_fetches = queue.fetches
+        # A submission wakes the watcher, then it polls on the active interval
+        watcher.track("AI_INVOICES", "2024-01-01")
+        await asyncio.sleep(0.3)
+        active_fetches = queue.fetches
+        queue.rows.insert(0, {"jobId": 2, "dataset": "AI_INVOICES", "runId": "2024-01-01", "status": "FINISHED"})
+        await asyncio.sleep(0.15)
+        settled = queue.fetches
+        await asyncio.sleep(0.3)
+        fresh = watcher.fresh()
+        await watcher.stop()
+        return idle_fetches, active_fetches, settled, queue.fetches, fresh
+
+    idle_fetches, active_fetches, settled, final, fresh = asyncio.run(run())
+    assert idle_fetches == 1
+    assert active_fetches >= 4
+    # Once the tracked job finished, the watcher is back on the 10s interval
+    assert final == settled
+    assert fresh and not watcher.running
+
+
+def test_failed_poll_is_reported_and_the_watcher_keeps_running(queue):
+    watcher = DQJobWatcher(interval=0.05, active_interval=0.05)
+    queue.error = RuntimeError("DQ is down")
+
+    async def run():
+        watcher.start()
+        await asyncio.sleep(0.12)
+        failed = watcher.snapshot()
+        queue.error = None
+        await asyncio.sleep(0.12)
+        recovered = watcher.snapshot()
+        await watcher.stop()
+        return failed, recovered
+
+    failed, recovered = asyncio.run(run())
+    assert failed["error"] == "DQ is down" and failed["fetched_at"] is None
+    assert recovered["error"] is None and recovered["jobs"][0]["dataset"] == "AI_ORDERS"
+
+
+def test_stale_status_table_is_not_fresh(queue):
+    watcher = DQJobWatcher(interval=10, max_age=0.05)
+
+    async def run():
+        watcher.start()
+        await asyncio.sleep(0.02)
+        fresh = watcher.fresh()
+        await asyncio.sleep(0.1)
+        stale = watcher.fresh()
+        await watcher.stop()
+        return fresh, stale
+
+    assert asyncio.run(run()) == (True, False)
@@ -0,0 +1,103 @@
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+pytest.importorskip("pandas")
+
+from app.chat import fast_path
+from app.chat.fast_path import CatalogFastPath
+
+CATALOG = [
+    ("APPROVED_SNOWFLAKE_PUSHDOWN", "SALES", "ORDERS"),
+    ("APPROVED_SNOWFLAKE_PUSHDOWN", "SALES", "CUSTOMERS"),
+    ("APPROVED_SNOWFLAKE_PUSHDOWN", "FINANCE", "INVOICES"),
+    ("APPROVED_BIGQUERY_PUSHDOWN", "MARKETING", "CAMPAIGNS"),
+    ("APPROVED_BIGQUERY_PUSHDOWN", "MARKETING", "LEADS"),
+]
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    conn = duckdb.connect(database=":memory:")
+    conn.execute("create table metadata (connection_name varchar, schema_name varchar, table_name varchar)")
+    conn.executemany("insert into metadata values (?, ?, ?)", CATALOG)
+    monkeypatch.setattr(fast_path, "get_catalog_cursor", conn.cursor)
+    return conn
+
+
+def _agent_turn(content):
+    return [
+        {"content": "which connection has the campaigns?", "role": "user", "name": "Admin_User"},
+        {"content": content, "role": "user", "name": "Reviewer_Assistant"},
+    ]
+
+
+def test_reference_resolves_to_connection_named_by_the_agents(catalog):
+    path = CatalogFastPath()
+    history = path.answer("list the schemas in the snowflake connection").to_messages("...")
+    history += _agent_turn("CAMPAIGNS is in APPROVED_BIGQUERY_PUSHDOWN.")
+
+    result = path.answer("what schemas are in that connection?", history)
+
+    assert result is not None
+    assert [row[0] for row in result.rows] == ["MARKETING"]
+
+
+def test_reference_to_several_connections_falls_back(catalog):
+    history = _agent_turn("Both APPROVED_BIGQUERY_PUSHDOWN and APPROVED_SNOWFLAKE_PUSHDOWN have tables.")
+
+    assert CatalogFastPath().answer("what schemas are in that connection?", history) is None
+
+
+def test_reference_without_history_falls_back(catalog):
+    assert CatalogFastPath().answer("what schemas are in that connection?") is None
+
+
+def test_same_schema_resolves_from_history(catalog):
+    history = _agent_turn("The FINANCE schema of APPROVED_SNOWFLAKE_PUSHDOWN has 1 table.")
+
+    result = CatalogFastPath().answer("in the snowflake connection in the same schema list tables", history)
+
+    assert result is not None
+    assert [row[0] for row in result.rows] == ["INVOICES"]
+
+
+@pytest.mark.parametrize("message", [
+    "what connections do i have?",
+    "list my connections, list all",
+    "what connections are available ",
+    "show all connections, please",
+])
+def test_list_all_connections(catalog, message):
+    result = CatalogFastPath().answer(message)
+
+    assert result is not None and result.intent == "list_connections"
+    assert [row[0] for row in result.rows] == ["APPROVED_BIGQUERY_PUSHDOWN", "APPROVED_SNOWFLAKE_PUSHDOWN"]
+
+
+def test_filtered_connection_list_falls_back(catalog):
+    assert CatalogFastPath().answer("list connections with snowflake in the name") is None
+
+
+def test_catalog_refresh_reloads_connection_names(monkeypatch, tmp_path):
+    import pandas as pd
+    from app.tools import dq_tools
+
+    class FakeClient:
+        def __init__(self, rows):
+            self.rows = rows
+
+        def fetch_catalog(self, connection_names=None):
+            return pd.DataFrame(self.rows, columns=["connection_name", "schema_name", "table_name"])
+
+    metadata_path = tmp_path / "connection_schema.csv"
+    pd.DataFrame(CATALOG, columns=["connection_name", "schema_name", "table_name"]).to_csv(metadata_path, index=False)
+    monkeypatch.setattr(dq_tools, "get_metadata_path", lambda: str(metadata_path))
+    monkeypatch.setattr(dq_tools, "_catalog_connection", None)
+    path = CatalogFastPath()
+    assert len(path.answer("what connections do i have?").rows) == 2
+
+    monkeypatch.setattr(dq_tools, "get_dq_client", lambda: FakeClient(CATALOG + [("APPROVED_SAPHANA_PD", "HR", "EMPLOYEES")]))
+    assert dq_tools.refresh_catalog(["ignored"]) == 6
+
+    assert "APPROVED_SAPHANA_PD" in [row[0] for row in path.answer("what connections do i have?").rows]
+    assert path.answer("what schemas are in the saphana connection?").rows == [("HR",)]
@@ -0,0 +1,63 @@
+import json
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("autogen")
+
+from app.agents.llm_cache import ResponseCache
+
+
+def _key(text, temperature=0, history=()):
+    messages = list(history) + [{"role": "user", "content": text}]
+    return json.dumps({"model": "gpt-test", "temperature": temperature, "messages": messages})
+
+
+def _completion(tool=None):
+    calls = [SimpleNamespace(function=SimpleNamespace(name=tool))] if tool else None
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=calls))])
+
+
+def test_exact_hit_and_miss():
+    cache = ResponseCache()
+    completion = _completion()
+    cache.set(_key("list connections"), completion)
+
+    assert cache.get(_key("list connections")) is completion
+    assert cache.get(_key("list schemas")) is None
+    assert cache.get_stats() == {"hits": 1, "semantic_hits": 0, "misses": 1, "bypassed": 0, "entries": 1}
+
+
+def test_non_deterministic_requests_are_not_cached():
+    cache = ResponseCache()
+    cache.set(_key("list connections", temperature=0.7), _completion())
+    cache.set(_key("how are my jobs"), _completion(tool="get_job_status"))
+    status_call = {"role": "assistant", "tool_calls": [{"function": {"name": "get_job_status"}}]}
+    cache.set(_key("summarize", history=[status_call]), _completion())
+
+    assert cache.get_stats()["entries"] == 0
+    assert cache.get(_key("summarize", history=[status_call])) is None
+    assert cache.get_stats()["bypassed"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    for text in ["a", "b"]:
+        cache.set(_key(text), _completion())
+    cache.get(_key("a"))
+    cache.set(_key("c"), _completion())
+
+    assert cache.get(_key("a")) is not None
+    assert cache.get(_key("b")) is None
+
+
+def test_semantic_hit_needs_the_same_context():
+    vectors = {"list my connections": [1.0, 0.0], "list all my connections": [0.99, 0.05], "run a job": [0.0, 1.0]}
+    cache = ResponseCache(embed_fn=vectors.__getitem__, similarity_threshold=0.95)
+    completion = _completion()
+    cache.set(_key("list my connections"), completion)
+
+    assert cache.get(_key("list all my connections")) is completion
+    assert cache.get(_key("run a job")) is None
+    earlier = {"role": "user", "content": "hello"}
+    assert cache.get(_key("list all my connections", history=[earlier])) is None
+    assert cache.get_stats()["semantic_hits"] == 1
@@ -0,0 +1,54 @@
+import time
+import itertools
+import pytest
+
+pytest.importorskip("autogen")
+
+from app.agents.llm_router import LLMRouter, _Endpoint
+
+_models = (f"router-test-{n}" for n in itertools.count())
+
+
+def _endpoints(calls, behaviours):
+    """One endpoint per behaviour: a result to return, an exception to raise or (delay, result)"""
+    endpoints = []
+    for name, behaviour in behaviours.items():
+        def create(params, name=name, behaviour=behaviour):
+            calls.append(name)
+            if isinstance(behaviour, Exception):
+                raise behaviour
+            if isinstance(behaviour, tuple):
+                time.sleep(behaviour[0])
+                return behaviour[1]
+            return behaviour
+        endpoints.append(_Endpoint(create, {"model": next(_models)}))
+    return endpoints
+
+
+@pytest.mark.parametrize("hedge", [False, True])
+def test_fast_primary_failure_fails_over_to_backup(hedge):
+    calls = []
+    router = LLMRouter(_endpoints(calls, {"a": RuntimeError("boom"), "b": "ok"}), hedge=hedge, hedge_delay=5.0)
+
+    assert router.create({"messages": []}) == "ok"
+    assert calls == ["a", "b"]
+
+
+def test_slow_primary_is_hedged():
+    calls = []
+    endpoints = _endpoints(calls, {"a": (0.5, "slow"), "b": "fast"})
+    router = LLMRouter(endpoints, hedge=True, hedge_delay=0.05, hedge_min_delay=0.01)
+
+    assert router.create({"messages": []}) == "fast"
+    assert endpoints[1].stats.hedges_won == 1
+
+
+def test_all_endpoints_failing_raises():
+    calls = []
+    router = LLMRouter(
+        _endpoints(calls, {"a": RuntimeError("a down"), "b": RuntimeError("b down")}), hedge=True, hedge_delay=5.0
+    )
+
+    with pytest.raises(RuntimeError, match="b down"):
+        router.create({"messages": []})
+    assert calls == ["a", "b"]
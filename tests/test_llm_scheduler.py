@@ -0,0 +1,107 @@
+import time
+import threading
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("autogen")
+
+from app.agents import llm_scheduler
+from app.agents.llm_scheduler import LLMScheduler, Priority, schedule_client
+from app.agents.llm_transport import _LimitedTransport
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = LLMScheduler()
+    monkeypatch.setattr(llm_scheduler, "_scheduler", scheduler)
+    return scheduler
+
+
+class RateLimitError(Exception):
+    """SDK error carrying the provider response, like openai.RateLimitError"""
+
+    def __init__(self, response):
+        super().__init__("rate limited")
+        self.response = response
+        self.status_code = response.status_code
+
+
+class FakeModelClient:
+    """Provider client sending every create through the shared LLM transport"""
+
+    def __init__(self, handler):
+        semaphore = threading.BoundedSemaphore(4)
+        transport = _LimitedTransport(httpx.MockTransport(handler), semaphore, semaphore, "openai", "gpt-test")
+        self.http = httpx.Client(transport=transport, base_url="http://llm-test")
+
+    def create(self, params):
+        response = self.http.post("/v1/chat/completions", json=params)
+        if response.status_code == 429:
+            raise RateLimitError(response)
+        return response
+
+
+class FakeWrapper:
+    def __init__(self, model_client):
+        self._clients = [model_client]
+        self._config_list = [{"model": "gpt-test", "api_type": "openai"}]
+
+
+def test_throttled_call_is_counted_and_paused_once(scheduler, monkeypatch):
+    monkeypatch.setenv("OPENAI_REQUESTS_PER_SECOND", "100")
+    model_client = FakeModelClient(lambda request: httpx.Response(429, headers={"retry-after": "0.3"}))
+    schedule_client(FakeWrapper(model_client))
+
+    with pytest.raises(RateLimitError):
+        model_client.create({"messages": [{"role": "user", "content": "hi"}]})
+
+    assert scheduler.get_stats()["openai/gpt-test"]["throttled"] == 1
+    started = time.monotonic()
+    scheduler.acquire("openai", "gpt-test", 10)
+    assert 0.2 < time.monotonic() - started < 0.6
+
+
+def test_rate_limit_headers_tighten_the_lane(scheduler, monkeypatch):
+    monkeypatch.setenv("OPENAI_TOKENS_PER_MINUTE", "100000")
+    headers = {"x-ratelimit-limit-tokens": "6000", "x-ratelimit-remaining-tokens": "0"}
+    model_client = FakeModelClient(lambda request: httpx.Response(200, headers=headers, json={}))
+    schedule_client(FakeWrapper(model_client))
+
+    model_client.create({"messages": []})
+
+    lane = scheduler._get_lane("openai", "gpt-test")
+    assert lane.tokens.capacity == 6000
+    assert scheduler.get_stats()["openai/gpt-test"]["throttled"] == 0
+    # 100 tokens per second once the bucket is empty
+    assert lane.wait_time(50) == pytest.approx(0.5, abs=0.05)
+
+
+def test_requests_wait_for_the_request_bucket(scheduler, monkeypatch):
+    monkeypatch.setenv("OPENAI_REQUESTS_PER_SECOND", "10")
+    waits = [scheduler.acquire("openai", "gpt-test", 1) for _ in range(12)]
+
+    # The bucket holds 10 requests, then admits one every 0.1s
+    assert max(waits[:10]) < 0.05
+    assert waits[10] == pytest.approx(0.1, abs=0.05)
+    assert scheduler.get_stats()["openai/gpt-test"]["admitted"] == 12
+
+
+def test_interactive_calls_go_ahead_of_batch_calls(scheduler, monkeypatch):
+    monkeypatch.setenv("OPENAI_REQUESTS_PER_SECOND", "1")
+    scheduler.acquire("openai", "gpt-test", 1)
+    admitted = []
+
+    def call(name, priority):
+        scheduler.acquire("openai", "gpt-test", 1, priority)
+        admitted.append(name)
+
+    batch = threading.Thread(target=call, args=("batch", Priority.BATCH))
+    batch.start()
+    time.sleep(0.05)
+    interactive = [threading.Thread(target=call, args=(f"chat-{n}", Priority.INTERACTIVE)) for n in range(2)]
+    for thread in interactive:
+        thread.start()
+    for thread in [batch, *interactive]:
+        thread.join(timeout=5)
+
+    assert admitted[-1] == "batch"
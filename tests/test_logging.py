@@ -0,0 +1,39 @@
+import queue
+import logging
+
+from app.core.logging import LazyQueueHandler, log_payload, truncate
+
+
+def _queued_logger(name):
+    records = queue.Queue()
+    logger = logging.getLogger(name)
+    logger.handlers = [LazyQueueHandler(records)]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger, records
+
+
+def test_payloads_are_rendered_before_the_caller_changes_them():
+    logger, records = _queued_logger("tests.logging.payload")
+    messages = [{"content": "first"}]
+    log_payload(logger, "Raw chat messages", messages)
+    logger.info("history %s", messages)
+    messages.append({"content": "second"})
+
+    rendered = [records.get_nowait().getMessage() for _ in range(2)]
+    assert all("second" not in message for message in rendered)
+    assert rendered[1] == "history [{'content': 'first'}]"
+
+
+def test_immutable_arguments_are_formatted_by_the_listener():
+    logger, records = _queued_logger("tests.logging.lazy")
+    logger.info("%s calls to %s took %.1f s", 3, "signin", 1.25)
+
+    record = records.get_nowait()
+    assert record.args == (3, "signin", 1.25)
+    assert record.getMessage() == "3 calls to signin took 1.2 s"
+
+
+def test_truncate_limits_long_payloads():
+    assert str(truncate("x" * 30, limit=10)) == "x" * 10 + "... [20 more chars]"
+    assert str(truncate("short", limit=10)) == "short"
@@ -0,0 +1,139 @@
+import asyncio
+import pytest
+
+pytest.importorskip("fastapi")
+
+from app.services.request_coalescer import RequestCoalescer
+from app.core.serialization import build_chat_payload, select_messages
+
+
+class FakeChat:
+    """process_chat stand-in with a growing transcript, one turn per call"""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.calls = 0
+        self.transcript = []
+
+    async def turn(self, message: str, error: bool = False):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        for name in ("Admin_User", "Reviewer_Assistant"):
+            self.transcript.append({"id": len(self.transcript) + 1, "name": name, "content": message})
+        transcript = list(self.transcript)
+        return {"session_id": "s", "chat_history": transcript[-11:], "transcript": transcript,
+                "metadata": {}, "error": error}
+
+
+def test_identical_in_flight_requests_share_one_turn():
+    chat, coalescer = FakeChat(), RequestCoalescer()
+
+    async def run():
+        return await asyncio.gather(*[
+            coalescer.run("s", message, lambda: chat.turn("list tables"))
+            for message in ["list tables", "List  tables", "list tables"]
+        ])
+
+    results = asyncio.run(run())
+    assert chat.calls == 1
+    assert results[0] is results[1] is results[2]
+    assert coalescer.get_stats()["coalesced"] == 2
+
+
+def test_different_sessions_are_not_coalesced():
+    chat, coalescer = FakeChat(), RequestCoalescer()
+
+    async def run():
+        await asyncio.gather(
+            coalescer.run("a", "list tables", lambda: chat.turn("list tables")),
+            coalescer.run("b", "list tables", lambda: chat.turn("list tables")),
+        )
+
+    asyncio.run(run())
+    assert chat.calls == 2
+
+
+def test_idempotent_retry_is_replayed_without_later_turns():
+    chat, coalescer = FakeChat(), RequestCoalescer()
+
+    async def run():
+        first = await coalescer.run("s", "first", lambda: chat.turn("first"), idempotency_key="k1")
+        await coalescer.run("s", "second", lambda: chat.turn("second"), idempotency_key="k2")
+        replayed = await coalescer.run("s", "first", lambda: chat.turn("first"), idempotency_key="k1")
+        return first, replayed
+
+    first, replayed = asyncio.run(run())
+    assert replayed is first
+    assert chat.calls == 2
+    assert coalescer.get_stats()["replayed"] == 1
+
+    # The client had nothing before the first turn, the second turn isn't part of this result
+    messages = select_messages(replayed, last_seen_id=0)
+    assert [m["content"] for m in messages] == ["first", "first"]
+    payload = build_chat_payload(replayed, messages, "lean", 0)
+    assert payload["last_id"] == 2
+    assert "transcript" not in build_chat_payload(replayed, messages, "full", 0)
+
+
+def test_error_results_are_not_replayed():
+    chat, coalescer = FakeChat(), RequestCoalescer()
+
+    async def run():
+        await coalescer.run("s", "hi", lambda: chat.turn("hi", error=True), idempotency_key="k")
+        await coalescer.run("s", "hi", lambda: chat.turn("hi"), idempotency_key="k")
+
+    asyncio.run(run())
+    assert chat.calls == 2
+
+
+def test_replay_expires_after_the_ttl():
+    chat, coalescer = FakeChat(delay=0), RequestCoalescer(idempotency_ttl=0)
+
+    async def run():
+        await coalescer.run("s", "hi", lambda: chat.turn("hi"), idempotency_key="k")
+        await coalescer.run("s", "hi", lambda: chat.turn("hi"), idempotency_key="k")
+
+    asyncio.run(run())
+    assert chat.calls == 2
+
+
+def test_cancelled_client_does_not_cancel_the_shared_turn():
+    chat, coalescer = FakeChat(delay=0.05), RequestCoalescer()
+
+    async def run():
+        first = asyncio.ensure_future(coalescer.run("s", "list tables", lambda: chat.turn("list tables")))
+        second = asyncio.ensure_future(coalescer.run("s", "list tables", lambda: chat.turn("list tables")))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    result = asyncio.run(run())
+    assert chat.calls == 1
+    assert result["chat_history"][-1]["content"] == "list tables"
+
+
+def test_in_flight_retry_attaches_by_idempotency_key():
+    chat, coalescer = FakeChat(delay=0.05), RequestCoalescer()
+
+    async def run():
+        return await asyncio.gather(
+            coalescer.run("s", "list tables", lambda: chat.turn("list tables"), idempotency_key="k1"),
+            # The retry's text differs (client-side edit), the key still identifies it
+            coalescer.run("s", "list tables please", lambda: chat.turn("list tables please"), idempotency_key="k1"),
+        )
+
+    first, retry = asyncio.run(run())
+    assert chat.calls == 1 and retry is first
+
+
+def test_completed_turn_is_not_reused_without_a_key():
+    chat, coalescer = FakeChat(), RequestCoalescer()
+
+    async def run():
+        first = await coalescer.run("s", "list tables", lambda: chat.turn("list tables"))
+        second = await coalescer.run("s", "list tables", lambda: chat.turn("list tables"))
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert chat.calls == 2 and second is not first
+    assert coalescer.get_stats() == {"in_flight": 0, "coalesced": 0, "replayed": 0}
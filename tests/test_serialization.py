@@ -0,0 +1,40 @@
+import json
+import pytest
+
+pytest.importorskip("fastapi")
+
+from app.core.serialization import build_chat_payload, dumps
+
+MESSAGES = [{"id": n, "role": "user", "name": "Admin_User", "content": "x" * 200} for n in (1, 2, 3)]
+RESULT = {"session_id": "s", "chat_history": MESSAGES, "transcript": MESSAGES, "metadata": {"a": 1}, "error": False,
+          "response": {"content": MESSAGES, "role": "assistant", "chat_history": MESSAGES}}
+
+
+def test_default_payload_lists_messages_once(monkeypatch):
+    monkeypatch.delenv("CHAT_RESPONSE_MODE", raising=False)
+    payload = build_chat_payload(RESULT, MESSAGES)
+
+    assert payload["version"] == 2
+    assert payload["messages"] == MESSAGES and payload["last_id"] == 3
+    assert dumps(payload).count(b"x" * 200) == 3
+
+
+def test_full_layout_is_an_opt_out(monkeypatch):
+    monkeypatch.delenv("CHAT_RESPONSE_MODE", raising=False)
+    payload = json.loads(dumps(build_chat_payload(RESULT, MESSAGES, "full")))
+
+    assert payload["response"]["content"] == payload["response"]["chat_history"] == payload["chat_history"] == MESSAGES
+    assert "version" not in payload and "transcript" not in payload
+
+
+def test_deployment_default_can_keep_the_full_layout(monkeypatch):
+    monkeypatch.setenv("CHAT_RESPONSE_MODE", "full")
+
+    assert "chat_history" in build_chat_payload(RESULT, MESSAGES)
+    assert build_chat_payload(RESULT, MESSAGES, "lean")["version"] == 2
+
+
+def test_nothing_new_echoes_last_seen_id(monkeypatch):
+    monkeypatch.delenv("CHAT_RESPONSE_MODE", raising=False)
+
+    assert build_chat_payload(RESULT, [], last_seen_id=3)["last_id"] == 3
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+import pytest
+
+from app.chat.speaker_selection import RuleBasedSpeakerSelector
+
+class Agent:
+    def __init__(self, name):
+        self.name = name
+
+
+USER, SQL, JOB, EXECUTOR, REVIEWER = (
+    Agent(name) for name in ["Admin_User", "SQL_Assistant", "Job_Assistant", "Executor_User", "Reviewer_Assistant"]
+)
+
+
+@pytest.fixture
+def selector():
+    # Same graph as ChatManager
+    return RuleBasedSpeakerSelector(
+        allowed_transitions={
+            USER: [SQL, JOB, REVIEWER],
+            SQL: [EXECUTOR, USER],
+            JOB: [EXECUTOR, USER],
+            EXECUTOR: [REVIEWER, USER],
+            REVIEWER: [USER],
+        },
+        executor=EXECUTOR,
+        reviewer=REVIEWER,
+    )
+
+
+def _chat(*messages):
+    return SimpleNamespace(messages=list(messages))
+
+
+@pytest.mark.parametrize("last_speaker, message, expected", [
+    (SQL, {"content": None, "tool_calls": [{"function": {"name": "run_sql_statement"}}]}, EXECUTOR),
+    (JOB, {"content": None, "function_call": {"name": "run_dq_job"}}, EXECUTOR),
+    (EXECUTOR, {"content": "", "tool_responses": [{"content": "results"}], "role": "tool"}, REVIEWER),
+    (SQL, {"content": "Which schema do you mean?"}, USER),
+    (REVIEWER, {"content": "Here are your tables. TERMINATE"}, USER),
+])
+def test_rules_pick_the_next_speaker(selector, last_speaker, message, expected):
+    assert selector(last_speaker, _chat(message)) is expected
+    assert (selector.rule_selections, selector.llm_selections) == (1, 0)
+
+
+def test_user_question_is_left_to_the_llm(selector):
+    assert selector(USER, _chat({"content": "list the tables in SALES"})) == "auto"
+    assert (selector.rule_selections, selector.llm_selections) == (0, 1)
+
+
+def test_executor_text_reply_is_left_to_the_llm(selector):
+    # Without tool responses the executor may hand back to the reviewer or the user
+    assert selector(EXECUTOR, _chat({"content": "no tool to run"})) == "auto"
+
+
+def test_tool_call_outside_the_graph_is_left_to_the_llm(selector):
+    message = {"content": None, "tool_calls": [{"function": {"name": "run_sql_statement"}}]}
+    assert selector(REVIEWER, _chat(message)) == "auto"
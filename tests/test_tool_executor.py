@@ -0,0 +1,33 @@
+import asyncio
+import pytest
+
+pytest.importorskip("autogen")
+
+from app.agents.tool_executor import _a_execute
+
+
+class SlowToolAgent:
+    """Agent whose async tool records how many calls overlap"""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    async def a_execute_function(self, function_call):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return True, {"name": function_call["name"], "content": "done"}
+
+
+def test_async_tool_calls_respect_the_tool_limit(monkeypatch):
+    monkeypatch.setenv("TOOL_SLOW_TOOL_MAX_CONCURRENCY", "2")
+    agent = SlowToolAgent()
+
+    async def run():
+        return await asyncio.gather(*[_a_execute(agent, {"name": "slow_tool", "arguments": "{}"}) for _ in range(6)])
+
+    results = asyncio.run(run())
+    assert [result["content"] for result in results] == ["done"] * 6
+    assert agent.max_running == 2